@@ -0,0 +1,142 @@
+"""
+Local stand-in for the Moira API speaking both HTTP/1.1 and cleartext HTTP/2
+(prior knowledge), used to compare the two transports on the same event loop.
+
+Every response is delayed by a fixed latency to model server-side work,
+and the number of accepted connections is counted.
+"""
+import asyncio
+import threading
+
+import h11
+import h2.config
+import h2.connection
+import h2.events
+
+
+DEFAULT_BODY = b'{"state": "OK", "trigger_id": "1"}'
+
+PREFACE = b'PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n'
+
+
+class _Http11:
+    def __init__(self, connection):
+        self._connection = connection
+        self._h11 = h11.Connection(h11.SERVER)
+
+    def data_received(self, data):
+        self._h11.receive_data(data)
+        self._process()
+
+    def _process(self):
+        while True:
+            event = self._h11.next_event()
+            if event is h11.NEED_DATA or event is h11.PAUSED:
+                return
+            if isinstance(event, h11.ConnectionClosed):
+                self._connection.close()
+                return
+            if isinstance(event, h11.EndOfMessage):
+                self._connection.later(self._respond)
+                return
+
+    def _respond(self):
+        body = self._connection.body
+        headers = [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))]
+        data = self._h11.send(h11.Response(status_code=200, headers=headers))
+        data += self._h11.send(h11.Data(data=body)) + self._h11.send(h11.EndOfMessage())
+        self._connection.write(data)
+        self._h11.start_next_cycle()
+        # requests pipelined behind the one just answered
+        self._process()
+
+
+class _Http2:
+    def __init__(self, connection):
+        self._connection = connection
+        self._h2 = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        self._h2.initiate_connection()
+        connection.write(self._h2.data_to_send())
+
+    def data_received(self, data):
+        for event in self._h2.receive_data(data):
+            if isinstance(event, h2.events.DataReceived):
+                self._h2.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+            elif isinstance(event, h2.events.StreamEnded):
+                self._connection.later(self._respond, event.stream_id)
+            elif isinstance(event, h2.events.ConnectionTerminated):
+                self._connection.close()
+        self._connection.write(self._h2.data_to_send())
+
+    def _respond(self, stream_id):
+        body = self._connection.body
+        self._h2.send_headers(stream_id, [
+            (':status', '200'), ('content-type', 'application/json'), ('content-length', str(len(body))),
+        ])
+        self._h2.send_data(stream_id, body, end_stream=True)
+        self._connection.write(self._h2.data_to_send())
+
+
+class _Connection(asyncio.Protocol):
+    def __init__(self, server):
+        self._server = server
+        self._buffer = b''
+        self._protocol = None
+        self._transport = None
+        self.body = server.body
+
+    def connection_made(self, transport):
+        self._transport = transport
+        self._server.connections += 1
+
+    def data_received(self, data):
+        if self._protocol is None:
+            self._buffer += data
+            if len(self._buffer) < len(PREFACE) and PREFACE.startswith(self._buffer):
+                return
+            self._protocol = (_Http2 if self._buffer.startswith(PREFACE) else _Http11)(self)
+            data, self._buffer = self._buffer, b''
+        self._protocol.data_received(data)
+
+    def later(self, callback, *args):
+        asyncio.get_running_loop().call_later(self._server.latency, callback, *args)
+
+    def write(self, data):
+        if data and not self._transport.is_closing():
+            self._transport.write(data)
+
+    def close(self):
+        self._transport.close()
+
+
+class DualProtocolServer:
+    def __init__(self, body=DEFAULT_BODY, latency=0.0, host='127.0.0.1'):
+        """
+
+        :param body: bytes response body
+        :param latency: float seconds every response is delayed by
+        :param host: str address to listen on
+        """
+        self.body = body
+        self.latency = latency
+        self.connections = 0
+        self._host = host
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._server = None
+
+    @property
+    def url(self):
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return 'http://{}:{}/api/'.format(host, port)
+
+    def __enter__(self):
+        self._thread.start()
+        self._server = asyncio.run_coroutine_threadsafe(
+            self._loop.create_server(lambda: _Connection(self), self._host, 0), self._loop).result()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.close()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
@@ -0,0 +1,65 @@
+"""
+Time decoding and encoding of a large trigger list with every installed JSON codec.
+
+Usage: python benchmarks/bench_codec.py [triggers]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client.codec import CODECS  # noqa: E402
+from moira_client.codec import StdlibJSONCodec  # noqa: E402
+
+
+def make_triggers(count):
+    return {'list': [
+        {
+            'id': 'trigger-{}'.format(i),
+            'name': 'Service {} latency'.format(i),
+            'tags': ['service-{}'.format(i % 50), 'latency'],
+            'targets': ['prefix.service-{}.*.latency.p99'.format(i)],
+            'warn_value': 300,
+            'error_value': 600,
+            'desc': 'latency of service {}'.format(i),
+            'ttl': 600,
+            'ttl_state': 'NODATA',
+            'sched': {'days': [{'enabled': True, 'name': day} for day in ('Mon', 'Tue', 'Wed', 'Thu', 'Fri')],
+                      'startOffset': 0, 'endOffset': 1439, 'tzOffset': 0},
+            'expression': '',
+            'is_remote': False,
+            'trigger_type': 'rising',
+        }
+        for i in range(count)
+    ]}
+
+
+def best_of(fn, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    document = make_triggers(count)
+    payload = StdlibJSONCodec().dumps(document)
+    print('triggers: {}, body: {:.1f} MB'.format(count, len(payload) / 1e6))
+
+    for name, codec_class in CODECS.items():
+        try:
+            codec = codec_class()
+        except ImportError:
+            print('{:8} not installed'.format(name))
+            continue
+        loads = best_of(lambda: codec.loads(payload))
+        dumps = best_of(lambda: codec.dumps(document))
+        print('{:8} loads {:7.1f} ms   dumps {:7.1f} ms'.format(name, loads * 1e3, dumps * 1e3))
+
+
+if __name__ == '__main__':
+    main()
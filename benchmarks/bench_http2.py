@@ -0,0 +1,65 @@
+"""
+Fan out concurrent GET requests over pooled HTTP/1.1 connections and over a
+single multiplexed HTTP/2 connection, with the threaded and the asyncio client,
+against a local server that answers both protocols with a fixed latency.
+
+Usage: python benchmarks/bench_http2.py [requests] [concurrency] [latency_ms]
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client.aio import AsyncClient  # noqa: E402
+from moira_client.client import Client  # noqa: E402
+from moira_client.client import HTTP2_PRIOR_KNOWLEDGE  # noqa: E402
+from _h2server import DualProtocolServer  # noqa: E402
+
+
+def bench_threads(url, count, concurrency, **kwargs):
+    with Client(url, **kwargs) as client, ThreadPoolExecutor(concurrency) as executor:
+        start = time.perf_counter()
+        list(executor.map(lambda _: client.get('trigger/1/state'), range(count)))
+        return time.perf_counter() - start
+
+
+def bench_async(url, count, concurrency, **kwargs):
+    async def run():
+        async with AsyncClient(url, **kwargs) as client:
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def call():
+                async with semaphore:
+                    await client.get('trigger/1/state')
+
+            start = time.perf_counter()
+            await asyncio.gather(*[call() for _ in range(count)])
+            return time.perf_counter() - start
+    return asyncio.run(run())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.005
+
+    cases = [
+        ('threads, HTTP/1.1 pool', bench_threads, {'pool_maxsize': concurrency}),
+        ('threads, HTTP/2 x1', bench_threads, {'pool_maxsize': 1, 'http2': HTTP2_PRIOR_KNOWLEDGE}),
+        ('asyncio, HTTP/1.1 pool', bench_async, {'pool_maxsize': concurrency}),
+        ('asyncio, HTTP/2 x1', bench_async, {'pool_maxsize': 1, 'http2': HTTP2_PRIOR_KNOWLEDGE}),
+    ]
+    print('requests: {}, concurrency: {}, server latency: {:.1f}ms'.format(count, concurrency, latency * 1000))
+    for name, bench, kwargs in cases:
+        with DualProtocolServer(latency=latency) as server:
+            elapsed = bench(server.url, count, concurrency, **kwargs)
+            connections = server.connections
+        print('{:<24} {:.3f}s {:>8.0f} req/s {:>4} connections'.format(
+            name, elapsed, count / elapsed, connections))
+
+
+if __name__ == '__main__':
+    main()
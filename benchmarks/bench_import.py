@@ -0,0 +1,52 @@
+"""
+Startup cost of `import moira_client`, measured with python -X importtime in fresh interpreters.
+
+Reports the median cumulative import time and the slowest modules it pulls in, and whether an
+HTTP library is loaded before the first request.
+
+Usage: python benchmarks/bench_import.py [runs] [module]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+HTTP_LIBRARIES = ('requests', 'urllib3', 'httpx')
+
+
+def import_times(module):
+    """
+    :return: dict of module name to cumulative import time in microseconds
+    """
+    stderr = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import {}'.format(module)], cwd=ROOT,
+                            stderr=subprocess.PIPE, check=True).stderr.decode()
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    module = sys.argv[2] if len(sys.argv) > 2 else 'moira_client'
+
+    samples = [import_times(module) for _ in range(runs)]
+    totals = [sample[module] for sample in samples]
+    last = samples[-1]
+    own = {name: time for name, time in last.items() if name.split('.')[0] == module.split('.')[0]}
+
+    print('import {}: median {:.1f}ms, min {:.1f}ms over {} runs'.format(
+        module, statistics.median(totals) / 1e3, min(totals) / 1e3, runs))
+    print('HTTP libraries loaded: {}'.format(', '.join(name for name in HTTP_LIBRARIES if name in last) or 'none'))
+    print('\nslowest {} modules, cumulative ms:'.format(module))
+    for name, time in sorted(own.items(), key=lambda item: -item[1])[:10]:
+        print('{:>8.1f}  {}'.format(time / 1e3, name))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Time a bulk trigger save workflow offline: record it once against the fake
+Moira server, then replay the cassette with simulated latency and bandwidth,
+sequentially and with Moira.map.
+
+Usage: python benchmarks/bench_replay.py [triggers] [latency_ms] [bandwidth_kib_s] [concurrency]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client import Moira  # noqa: E402
+from moira_client.transports.cassette import Cassette  # noqa: E402
+from moira_client.transports.cassette import RecordTransport  # noqa: E402
+from moira_client.transports.cassette import ReplayTransport  # noqa: E402
+from moira_client.testing import FakeMoiraServer  # noqa: E402
+
+
+def save_triggers(moira, count, concurrency=None):
+    triggers = [moira.trigger.create('trigger {}'.format(i), ['bench'], ['metric.{}'.format(i)]) for i in range(count)]
+    if concurrency is None:
+        for trigger in triggers:
+            trigger.save()
+    else:
+        for result in moira.map(lambda trigger: trigger.save(), triggers, concurrency=concurrency):
+            if result.error is not None:
+                raise result.error
+
+
+def replay(cassette, count, latency, bandwidth, concurrency=None):
+    moira = Moira('http://moira.invalid/api/', transport=ReplayTransport(cassette, latency, bandwidth))
+    start = time.perf_counter()
+    save_triggers(moira, count, concurrency)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.005
+    bandwidth = float(sys.argv[3]) * 1024 if len(sys.argv) > 3 else 1024 * 1024
+    concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 8
+
+    cassette = Cassette()
+    with FakeMoiraServer() as server:
+        moira = Moira(server.url, transport=RecordTransport(cassette))
+        save_triggers(moira, count)
+        moira.close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'triggers.cassette')
+        cassette.save(path)
+        size = os.path.getsize(path)
+        cassette = Cassette.load(path)
+
+    print('triggers: {}, latency: {:.1f}ms, bandwidth: {:.0f} KiB/s'.format(count, latency * 1000, bandwidth / 1024))
+    print('cassette: {} interactions, {} bytes'.format(len(cassette), size))
+    print('replay, no delays:        {:.3f}s'.format(replay(cassette, count, None, None)))
+    print('replay, sequential:       {:.3f}s'.format(replay(cassette, count, latency, bandwidth)))
+    print('replay, {:>2} threads:       {:.3f}s'.format(
+        concurrency, replay(cassette, count, latency, bandwidth, concurrency)))
+
+
+if __name__ == '__main__':
+    main()
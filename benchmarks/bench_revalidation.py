@@ -0,0 +1,46 @@
+"""
+Poll a large trigger list the way dashboards do, with and without the
+ETag revalidation cache, and report transfer and time per poll.
+
+Usage: python benchmarks/bench_revalidation.py [triggers] [polls]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client.cache import RevalidationCache  # noqa: E402
+from moira_client.moira import Moira  # noqa: E402
+from moira_client.testing import FakeMoiraServer  # noqa: E402
+from moira_client.testing import MoiraData  # noqa: E402
+
+
+def poll(url, polls, **kwargs):
+    moira = Moira(url, **kwargs)
+    start = time.perf_counter()
+    for _ in range(polls):
+        moira.trigger.fetch_all()
+    elapsed = time.perf_counter() - start
+    moira.close()
+    return elapsed, moira.client.transfer_stats.received_wire_bytes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    polls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    with FakeMoiraServer(MoiraData.generate(triggers=count)) as server:
+        cases = [
+            ('no cache', {}),
+            ('revalidation', {'revalidation_cache': RevalidationCache()}),
+            ('revalidation shared', {'revalidation_cache': RevalidationCache(shared=True)}),
+        ]
+        print('triggers: {}, polls: {}'.format(count, polls))
+        for name, kwargs in cases:
+            elapsed, received = poll(server.url, polls, **kwargs)
+            print('{:20} {:7.1f} ms/poll {:10.1f} KB received'.format(
+                name, elapsed / polls * 1e3, received / 1e3))
+
+
+if __name__ == '__main__':
+    main()
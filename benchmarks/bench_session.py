@@ -0,0 +1,47 @@
+"""
+Compare a fresh connection per call (module-level requests.get) with the
+pooled keep-alive session owned by Client.
+
+Usage: python benchmarks/bench_session.py [calls]
+"""
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client.client import Client  # noqa: E402
+from moira_client.testing import FakeMoiraServer  # noqa: E402
+
+
+def bench_per_call(url, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        requests.get(url + 'config').json()
+    return time.perf_counter() - start
+
+
+def bench_pooled(url, calls):
+    with Client(url) as client:
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.get('config')
+        return time.perf_counter() - start
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    with FakeMoiraServer() as server:
+        per_call = bench_per_call(server.url, calls)
+        pooled = bench_pooled(server.url, calls)
+
+    print('calls:            {}'.format(calls))
+    print('per-call connect: {:.3f}s ({:.1f} us/call)'.format(per_call, per_call / calls * 1e6))
+    print('pooled session:   {:.3f}s ({:.1f} us/call)'.format(pooled, pooled / calls * 1e6))
+    print('speedup:          {:.2f}x'.format(per_call / pooled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Compare peak Python heap of TriggerManager.fetch_all, which decodes the whole
+response before building triggers, with the streaming TriggerManager.iter_all.
+
+Usage: python benchmarks/bench_streaming.py [triggers]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client.moira import Moira  # noqa: E402
+from moira_client.testing import FakeMoiraServer  # noqa: E402
+from moira_client.testing import MoiraData  # noqa: E402
+
+
+def fetch_all(moira):
+    return sum(1 for _ in moira.trigger.fetch_all())
+
+
+def iter_all(moira):
+    return sum(1 for _ in moira.trigger.iter_all())
+
+
+def measure(url, fn):
+    moira = Moira(url)
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn(moira)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    moira.close()
+    return count, elapsed, peak, moira.client.transfer_stats.received_bytes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print('triggers: {}'.format(count))
+    with FakeMoiraServer(MoiraData.generate(triggers=count)) as server:
+        for name, fn in (('fetch_all', fetch_all), ('iter_all', iter_all)):
+            seen, elapsed, peak, received = measure(server.url, fn)
+            assert seen == count
+            print('{:<10} {:.2f}s  peak heap {:>8.1f} MiB  response {:>8.1f} MiB'.format(
+                name, elapsed, peak / 2 ** 20, received / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
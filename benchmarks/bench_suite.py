@@ -0,0 +1,271 @@
+"""
+Benchmark suite of model parsing, manager operations and bulk workflows at growing dataset sizes.
+
+Every size gets a fake Moira with that many triggers and subscriptions. Read operations are
+recorded against it once and timed replayed from memory, so only the client side cost of
+decoding responses and building models is measured. Save and update loops run end to end
+against the fake server. --latency adds a delay to every request, e.g. to see fetch_many
+overlap requests that a fetch_by_id loop sends one after another. Results are written as JSON;
+pass a previous result file with --compare to see the change of every benchmark.
+
+Usage: python benchmarks/bench_suite.py [--sizes 1000,10000,100000] [--repeat 3] [--writes 20]
+                                         [--latency 0] [--only trigger.] [--output FILE] [--compare FILE]
+"""
+import argparse
+import datetime
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client.moira import Moira  # noqa: E402
+from moira_client.testing import FakeMoiraServer  # noqa: E402
+from moira_client.testing import MoiraData  # noqa: E402
+from moira_client.transports.cassette import Cassette  # noqa: E402
+from moira_client.transports.cassette import RecordTransport  # noqa: E402
+from moira_client.transports.cassette import ReplayTransport  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# triggers passed to get_non_existent and diff, trigger ids passed to fetch_many, half of the triggers exist
+PROBES = 100
+
+READ_BENCHMARKS = []
+WRITE_BENCHMARKS = []
+
+
+def benchmark(name, write=False):
+    def decorator(fn):
+        (WRITE_BENCHMARKS if write else READ_BENCHMARKS).append((name, fn))
+        return fn
+    return decorator
+
+
+class Context:
+    def __init__(self, moira, data, writes):
+        """
+
+        :param moira: Moira benchmarks call
+        :param data: MoiraData served
+        :param writes: int number of triggers saved by write benchmarks
+        """
+        self.moira = moira
+        self.data = data
+        self.writes = writes
+        self.saved = []
+        self._names = itertools.count()
+
+    def copy_of(self, trigger):
+        return self.moira.trigger.create(trigger['name'], trigger['tags'], trigger['targets'])
+
+    def new_trigger(self):
+        i = next(self._names)
+        return self.moira.trigger.create('bench trigger {}'.format(i), ['bench'], ['bench.metric.{}'.format(i)])
+
+    def probes(self):
+        existing = list(itertools.islice(self.data.triggers.values(), PROBES // 2))
+        triggers = [self.copy_of(trigger) for trigger in existing]
+        triggers.extend(self.new_trigger() for _ in range(PROBES - len(triggers)))
+        return triggers
+
+    def trigger_ids(self):
+        return list(itertools.islice(self.data.triggers, PROBES))
+
+
+@benchmark('trigger.fetch_all')
+def _fetch_all_triggers(context):
+    context.moira.trigger.fetch_all()
+
+
+@benchmark('trigger.get_non_existent')
+def _get_non_existent(context):
+    context.moira.trigger.get_non_existent(context.probes())
+
+
+@benchmark('trigger.diff')
+def _diff(context):
+    context.moira.trigger.diff(context.probes())
+
+
+@benchmark('trigger.fetch_by_id')
+def _fetch_by_id(context):
+    for trigger_id in context.trigger_ids():
+        context.moira.trigger.fetch_by_id(trigger_id)
+
+
+@benchmark('trigger.fetch_many')
+def _fetch_many(context):
+    context.moira.trigger.fetch_many(context.trigger_ids(), check_state=True)
+
+
+@benchmark('trigger.is_exist')
+def _is_exist_trigger(context):
+    # a missing trigger is the worst case, every trigger is compared
+    context.moira.trigger.is_exist(context.new_trigger())
+
+
+@benchmark('subscription.is_exist')
+def _is_exist_subscription(context):
+    context.moira.subscription.is_exist(tags=['missing'])
+
+
+@benchmark('tag.stats')
+def _tag_stats(context):
+    context.moira.tag.stats()
+
+
+@benchmark('pattern.fetch_all')
+def _fetch_all_patterns(context):
+    context.moira.pattern.fetch_all()
+
+
+@benchmark('trigger.save', write=True)
+def _save_triggers(context):
+    context.saved = [context.new_trigger() for _ in range(context.writes)]
+    for trigger in context.saved:
+        trigger.save()
+
+
+@benchmark('trigger.save_indexed', write=True)
+def _save_triggers_indexed(context):
+    context.moira.trigger.build_index()
+    context.saved = [context.new_trigger() for _ in range(context.writes)]
+    for trigger in context.saved:
+        trigger.save()
+    context.moira.trigger.drop_index()
+
+
+@benchmark('trigger.bulk_save', write=True)
+def _bulk_save_triggers(context):
+    triggers = [context.new_trigger() for _ in range(context.writes)]
+    report = context.moira.trigger.bulk_save(triggers)
+    assert not report.failed
+
+
+@benchmark('trigger.update', write=True)
+def _update_triggers(context):
+    for trigger in context.saved:
+        trigger.desc = 'updated at {}'.format(time.time())
+        trigger.update()
+
+
+@benchmark('trigger.update_upsert', write=True)
+def _upsert_triggers(context):
+    for trigger in context.saved:
+        trigger.desc = 'updated at {}'.format(time.time())
+        trigger.update(upsert=True)
+
+
+def measure(fn, context, repeat):
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(context)
+        runs.append(time.perf_counter() - start)
+    return runs
+
+
+def run_size(size, repeat, writes, latency, only):
+    data = MoiraData.generate(triggers=size, subscriptions=size, contacts=10, seed=size)
+    reads = [(name, fn) for name, fn in READ_BENCHMARKS if name.startswith(only)]
+    results = []
+    with FakeMoiraServer(data, latency=latency) as server:
+        cassette = Cassette()
+        recorder = Moira(server.url, transport=RecordTransport(cassette))
+        for name, fn in reads:
+            fn(Context(recorder, data, writes))
+        recorder.close()
+
+        replay = Context(Moira(server.url, transport=ReplayTransport(cassette, latency=latency)), data, writes)
+        for name, fn in reads:
+            results.append(result(name, size, measure(fn, replay, repeat)))
+            report(results[-1])
+
+        live = Context(Moira(server.url), data, writes)
+        for name, fn in WRITE_BENCHMARKS:
+            if name.startswith(only):
+                results.append(result(name, size, measure(fn, live, repeat), calls=writes))
+                report(results[-1])
+        live.moira.close()
+    return results
+
+
+def result(name, size, runs, calls=1):
+    return {
+        'benchmark': name,
+        'size': size,
+        'calls': calls,
+        'runs': runs,
+        'min': min(runs),
+        'median': statistics.median(runs),
+    }
+
+
+def report(item):
+    print('{:<26} {:>8} {:>12.2f} {:>12.2f} {:>14.3f}'.format(
+        item['benchmark'], item['size'], item['min'] * 1e3, item['median'] * 1e3,
+        item['median'] / item['calls'] * 1e3))
+
+
+def compare(results, path):
+    with open(path) as f:
+        baseline = {(item['benchmark'], item['size']): item for item in json.load(f)['results']}
+    print('\ncompared with {}'.format(path))
+    print('{:<26} {:>8} {:>12} {:>12} {:>8}'.format('benchmark', 'size', 'before ms', 'after ms', 'change'))
+    for item in results:
+        before = baseline.get((item['benchmark'], item['size']))
+        if before is None:
+            continue
+        print('{:<26} {:>8} {:>12.2f} {:>12.2f} {:>+7.0f}%'.format(
+            item['benchmark'], item['size'], before['median'] * 1e3, item['median'] * 1e3,
+            (item['median'] / before['median'] - 1) * 100))
+
+
+def main():
+    with open(os.path.join(ROOT, 'VERSION.txt')) as f:
+        version = f.read().strip()
+
+    parser = argparse.ArgumentParser(description='Benchmark moira_client manager operations')
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='comma separated numbers of triggers and subscriptions')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of every benchmark, the median is compared')
+    parser.add_argument('--writes', type=int, default=20, help='triggers saved and updated by write benchmarks')
+    parser.add_argument('--latency', type=float, default=0.0, help='ms added to every request')
+    parser.add_argument('--only', default='', help='run benchmarks whose name starts with this prefix')
+    parser.add_argument('--output', default=os.path.join(ROOT, 'benchmarks', 'results', '{}.json'.format(version)))
+    parser.add_argument('--compare', help='result file of a previous run')
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print('{:<26} {:>8} {:>12} {:>12} {:>14}'.format('benchmark', 'size', 'min ms', 'median ms', 'ms per call'))
+    results = []
+    for size in sizes:
+        results.extend(run_size(size, args.repeat, args.writes, args.latency / 1e3, args.only))
+
+    document = {
+        'version': version,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'sizes': sizes,
+        'repeat': args.repeat,
+        'writes': args.writes,
+        'latency': args.latency,
+        'results': results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w') as f:
+        json.dump(document, f, indent=2)
+    print('\nresults saved to {}'.format(args.output))
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
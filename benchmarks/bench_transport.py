@@ -0,0 +1,75 @@
+"""
+Per-request overhead of each transport backend.
+
+Sends sequential keep-alive GETs to the fake Moira server through Client with
+every transport and compares them with a bare http.client loop, the cost of the
+server and the socket round trip. Also reports the import time of each HTTP library.
+
+Usage: python benchmarks/bench_transport.py [requests]
+"""
+import http.client
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from moira_client.client import Client  # noqa: E402
+from moira_client.testing import FakeMoiraServer  # noqa: E402
+from moira_client.transports import TRANSPORTS  # noqa: E402
+
+
+def bench_baseline(url, count):
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port)
+    path = parts.path + 'config'
+    start = time.perf_counter()
+    for _ in range(count):
+        connection.request('GET', path)
+        connection.getresponse().read()
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return elapsed
+
+
+def bench_transport(url, count, transport):
+    with Client(url, transport=transport, codec='json') as client:
+        client.get('config')
+        start = time.perf_counter()
+        for _ in range(count):
+            client.get('config')
+        return time.perf_counter() - start
+
+
+def import_time(library):
+    code = 'import time; start = time.perf_counter(); import {}; print(time.perf_counter() - start)'.format(library)
+    return float(subprocess.check_output([sys.executable, '-c', code]))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    transports = []
+    for name in TRANSPORTS:
+        try:
+            Client('http://localhost/', transport=name).close()
+        except ImportError:
+            print('{}: not installed, skipped'.format(name))
+            continue
+        transports.append(name)
+
+    with FakeMoiraServer() as server:
+        baseline = bench_baseline(server.url, count) / count
+        results = [(name, bench_transport(server.url, count, name) / count) for name in transports]
+
+    print('requests: {}'.format(count))
+    print('{:<12} {:>10} {:>12} {:>10}'.format('transport', 'us/req', 'overhead us', 'import ms'))
+    print('{:<12} {:>10.1f} {:>12} {:>10}'.format('http.client', baseline * 1e6, '-', '-'))
+    for name, per_request in sorted(results, key=lambda result: result[1]):
+        print('{:<12} {:>10.1f} {:>12.1f} {:>10.1f}'.format(
+            name, per_request * 1e6, (per_request - baseline) * 1e6, import_time(name) * 1e3))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,15 @@
+import sys
+
 from moira_client.moira import Moira
-from requests import HTTPError
\ No newline at end of file
+
+if sys.version_info < (3, 7):
+    # module __getattr__ (PEP 562) needs Python 3.7, import eagerly
+    from requests import HTTPError  # noqa: F401
+
+
+def __getattr__(name):
+    # importing requests is slow and only needed by code catching its HTTPError
+    if name == 'HTTPError':
+        from requests import HTTPError
+        return HTTPError
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
@@ -0,0 +1,7 @@
+from .client import AsyncClient
+from .moira import AsyncMoira
+
+__all__ = [
+    "AsyncClient",
+    "AsyncMoira",
+]
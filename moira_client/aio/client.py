@@ -0,0 +1,299 @@
+import asyncio
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from ..client import BaseClient
+from ..client import DEFAULT_POOL_MAXSIZE
+from ..client import HTTP2_PRIOR_KNOWLEDGE
+from ..client import InvalidJSONError
+from ..client import MoiraApiError
+from ..client import RETRY_EXCEPTIONS
+from ..client import ResponseStructureError
+from ..codec import copy_json
+from ..compression import ACCEPT_ENCODING
+from ..singleflight import AsyncSingleFlight
+from ..streaming import ListItemParser
+from ..transports.httpx import _translate
+
+
+class AsyncClient(BaseClient):
+    BODY_ARGUMENT = 'content'
+
+    def __init__(self, api_url, auth_custom=None, auth_user=None, auth_pass=None, login=None,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, idle_timeout=None, timeout=None,
+                 retry=None, circuit_breaker=None, codec='auto', compression=None, revalidation_cache=None,
+                 response_cache=None, coalesce=False, rate_limiter=None,
+                 hedging=None, hooks=None, http2=False):
+        """
+
+        :param api_url: str Moira API URL
+        :param auth_custom: dict auth custom headers
+        :param auth_user: str auth user
+        :param auth_pass: str auth password
+        :param login: str auth login
+        :param pool_maxsize: int max number of connections shared by all concurrent requests,
+            extra requests wait for a free connection
+        :param idle_timeout: float seconds after which idle keep-alive connections are dropped,
+            None to keep them until the client is closed
+        :param timeout: float request timeout in seconds, None to wait forever
+        :param retry: RetryPolicy retry policy for connection errors and overload statuses, None to never retry
+        :param circuit_breaker: CircuitBreaker fail fast with CircuitOpenError while the API is down
+        :param codec: 'auto' to use orjson or ujson when installed, 'json', 'orjson', 'ujson' or a codec object
+        :param compression: GzipCompression gzip PUT/POST/PATCH bodies above a size threshold,
+            the API has to accept Content-Encoding: gzip
+        :param revalidation_cache: RevalidationCache keep GET responses and revalidate them with
+            If-None-Match/If-Modified-Since, serving the cached body on 304 Not Modified
+        :param response_cache: ResponseCache keep GET responses for a TTL, writes invalidate related paths
+        :param coalesce: bool send identical concurrent GET requests once and share the response between tasks
+        :param rate_limiter: RateLimiter token buckets requests wait for, globally and per endpoint prefix
+        :param hedging: HedgePolicy send a second GET request when the first one has not answered within
+            a delay, the first response wins and the other one is cancelled
+        :param hooks: Hooks callbacks invoked before and after every HTTP request, retries included
+        :param http2: bool multiplex concurrent requests over a few HTTP/2 connections, negotiated over
+            https:// with a fallback to HTTP/1.1; HTTP2_PRIOR_KNOWLEDGE to use HTTP/2 over http://
+            with servers that support it. Requires the h2 package
+        """
+        if httpx is None:
+            raise ImportError('AsyncClient requires httpx, install moira-python-client[async]')
+
+        super().__init__(api_url, auth_custom, auth_user, auth_pass, login, retry=retry,
+                         circuit_breaker=circuit_breaker, codec=codec, compression=compression,
+                         revalidation_cache=revalidation_cache, response_cache=response_cache,
+                         rate_limiter=rate_limiter, hedging=hedging, hooks=hooks)
+        if coalesce:
+            self.single_flight = AsyncSingleFlight(copy=copy_json)
+
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+
+        limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=pool_maxsize,
+            keepalive_expiry=idle_timeout,
+        )
+        self.http2 = http2
+        self._session = httpx.AsyncClient(
+            http1=http2 != HTTP2_PRIOR_KNOWLEDGE, http2=bool(http2), limits=limits, timeout=timeout,
+            headers={'Accept-Encoding': ACCEPT_ENCODING},
+        )
+
+    async def get(self, path='', **kwargs):
+        """
+
+        :param path: str api path
+        :param kwargs: additional parameters for request
+        :return: dict response
+
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        """
+        return await self._request('GET', path, **kwargs)
+
+    async def delete(self, path='', **kwargs):
+        """
+
+        :param path: str api path
+        :param kwargs: additional parameters for request
+        :return: dict response
+
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        """
+        return await self._request('DELETE', path, **kwargs)
+
+    async def put(self, path='', **kwargs):
+        """
+
+        :param path: str api path
+        :param kwargs: additional parameters for request
+        :return: dict response
+
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        """
+        return await self._request('PUT', path, **kwargs)
+
+    async def patch(self, path='', **kwargs):
+        """
+
+        :param path: str api path
+        :param kwargs: additional parameters for request
+        :return: dict response
+
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        """
+        return await self._request('PATCH', path, **kwargs)
+
+    async def post(self, path='', **kwargs):
+        """
+
+        :param path: str api path
+        :param kwargs: additional parameters for request
+        :return: dict response
+
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        """
+        return await self._request('POST', path, **kwargs)
+
+    async def iter_list(self, path='', key='list', **kwargs):
+        """
+        Stream a GET response and yield items of its list member one by one as they arrive,
+        memory use doesn't grow with the size of the list. Response caches, coalescing and
+        hedging are not used.
+
+        :param path: str api path
+        :param key: str name of the list member of the response object
+        :param kwargs: additional parameters for request
+        :return: async generator of decoded items
+
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        :raises: ResponseStructureError
+        """
+        r = await self._send_with_retry('GET', path, self.headers, 0, stream=True, **kwargs)
+        received = 0
+        try:
+            if r.status_code >= 400:
+                raise MoiraApiError(await r.aread(), r.status_code)
+            parser = ListItemParser(key)
+            try:
+                async for chunk in r.aiter_bytes():
+                    received += len(chunk)
+                    for item in parser.feed(chunk):
+                        yield item
+                for item in parser.close():
+                    yield item
+            except KeyError:
+                raise ResponseStructureError("{} doesn't exist in response".format(key), None)
+            except ValueError:
+                raise InvalidJSONError(b'')
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+        finally:
+            self.transfer_stats.record(0, 0, received, r.num_bytes_downloaded)
+            await r.aclose()
+
+    async def close(self):
+        """
+        Close all pooled connections
+
+        :return: None
+        """
+        await self._session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _request(self, method, path, **kwargs):
+        key, hit, result = self._cache_lookup(method, path, kwargs)
+        if hit:
+            return result
+        flight_key = self._flight_key(method, path, kwargs)
+        try:
+            if flight_key is None:
+                result = await self._perform(method, path, **kwargs)
+            else:
+                result = await self.single_flight.do(flight_key, lambda: self._perform(method, path, **kwargs))
+        finally:
+            self._cache_invalidate(method, path)
+        if key is not None:
+            self.response_cache.store(key, result)
+        return result
+
+    async def _perform(self, method, path, **kwargs):
+        kwargs, headers, sent_bytes = self._encode_body(kwargs)
+        key, entry, headers = self._revalidation_lookup(method, path, kwargs, headers)
+        r = await self._send_with_retry(method, path, headers, sent_bytes, **kwargs)
+        return self._handle_response(key, entry, r.status_code, r.headers, r.content)
+
+    async def _send_with_retry(self, method, path, headers, sent_bytes, **kwargs):
+        retry = 0
+        while True:
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve(path)
+                if delay:
+                    await asyncio.sleep(delay)
+            self._check_circuit()
+            request, started = self._hooks_started(method, path)
+            try:
+                if self._should_hedge(method, kwargs):
+                    r = await self._send_hedged(method, path, headers, **kwargs)
+                else:
+                    r = await self._send(method, path, headers, **kwargs)
+            except httpx.HTTPError as e:
+                # raise the same errors as the blocking client
+                error = _translate(e)
+                self._hooks_failed(request, started, kwargs, error)
+                self._record_failure()
+                if not isinstance(error, RETRY_EXCEPTIONS) or not self._can_retry(method, path, retry):
+                    raise error from e
+                await asyncio.sleep(self.retry.delay(retry))
+                retry += 1
+                continue
+
+            self._record_status(r.status_code)
+            if kwargs.get('stream'):
+                # the body is read and accounted by the caller, see iter_list
+                transferred = (self._body_size(kwargs), 0)
+            else:
+                transferred = self._record_transfer(kwargs, sent_bytes, r.content, r.num_bytes_downloaded)
+            self._hooks_finished(request, started, r.status_code, transferred)
+            if not self._can_retry_status(method, path, retry, r.status_code):
+                return r
+            await r.aclose()
+            await asyncio.sleep(self.retry.delay(retry, r.headers.get('Retry-After')))
+            retry += 1
+
+    async def _send_hedged(self, method, path, headers, **kwargs):
+        primary = asyncio.ensure_future(self._send_timed(method, path, headers, **kwargs))
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=self.hedging.delay())
+            if done:
+                self.hedging.record(hedged=False)
+                return primary.result()
+
+            hedge = asyncio.ensure_future(self._send_timed(method, path, headers, **kwargs))
+            attempts.append(hedge)
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in attempts:
+                    if attempt in done and attempt.exception() is None:
+                        self.hedging.record(hedged=True, hedge_won=attempt is hedge)
+                        return attempt.result()
+            self.hedging.record(hedged=True)
+            return primary.result()
+        finally:
+            for attempt in attempts:
+                if attempt.done():
+                    if not attempt.cancelled():
+                        attempt.exception()
+                else:
+                    attempt.cancel()
+
+    async def _send_timed(self, method, path, headers, **kwargs):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        r = await self._send(method, path, headers, **kwargs)
+        self.hedging.record_latency(loop.time() - started)
+        return r
+
+    async def _send(self, method, path, headers, stream=False, **kwargs):
+        # unlike requests, httpx rejects None header values (e.g. X-Webauth-User without login)
+        headers = {name: value for name, value in headers.items() if value is not None}
+        if stream:
+            request = self._session.build_request(method, self._path_join(path), headers=headers, **kwargs)
+            return await self._session.send(request, auth=self.auth, stream=True)
+        return await self._session.request(method, self._path_join(path), headers=headers, auth=self.auth, **kwargs)
+
+    def _create_auth(self, auth_user, auth_pass):
+        return httpx.BasicAuth(auth_user, auth_pass)
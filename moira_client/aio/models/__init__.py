@@ -0,0 +1,12 @@
+from .config import AsyncConfigManager
+from .contact import AsyncContactManager
+from .event import AsyncEventManager
+from .health import AsyncHealthManager
+from .notification import AsyncNotificationManager
+from .pattern import AsyncPatternManager
+from .subscription import AsyncSubscriptionManager
+from .system_tag import AsyncSystemTagManager
+from .tag import AsyncTagManager
+from .team import AsyncTeamManager
+from .trigger import AsyncTriggerManager
+from .user import AsyncUserManager
@@ -0,0 +1,14 @@
+from ...models.config import ConfigManager
+
+
+class AsyncConfigManager(ConfigManager):
+    async def fetch(self):
+        """
+        Returns config, see https://moira.readthedocs.io/en/latest/installation/configuration.html
+
+        :return: config
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path())
+        return self._to_config(result)
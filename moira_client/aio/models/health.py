@@ -0,0 +1,56 @@
+from ...client import ResponseStructureError
+from ...models.health import STATE_DISABLED
+from ...models.health import STATE_ENABLED
+
+
+class AsyncHealthManager:
+    def __init__(self, client):
+        self._client = client
+
+    async def get_notifier_state(self):
+        """
+        Returns current Moira Notifier state
+        :return: str
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path("notifier"))
+        if 'state' not in result:
+            raise ResponseStructureError("state doesn't exist in response", result)
+
+        return result['state']
+
+    async def disable_notifications(self):
+        """
+        Manage Moira Notifier to stop sending notifications
+        Returns current Moira Notifier state
+        :return: str
+
+        :raises: ResponseStructureError
+        """
+        return await self._set_notifier_state(STATE_DISABLED)
+
+    async def enable_notifications(self):
+        """
+        Manage Moira Notifier to start sending notifications
+        Returns current Moira Notifier state
+        :return: str
+
+        :raises: ResponseStructureError
+        """
+        return await self._set_notifier_state(STATE_ENABLED)
+
+    async def _set_notifier_state(self, state):
+        data = {
+            'state': state
+        }
+        result = await self._client.put(self._full_path("notifier"), json=data)
+        if 'state' not in result:
+            raise ResponseStructureError("state doesn't exist in response", result)
+
+        return result['state']
+
+    def _full_path(self, path=''):
+        if path:
+            return 'health/{}'.format(path)
+        return 'health'
@@ -0,0 +1,83 @@
+from ...client import InvalidJSONError
+from ...client import ResponseStructureError
+
+
+class AsyncNotificationManager:
+    def __init__(self, client):
+        self._client = client
+
+    async def fetch_all(self):
+        """
+        Returns all notifications
+        :return: list of dict
+
+        :raises: ResponseStructureError
+        """
+        return await self.fetch(start=0, end=-1)
+
+    def iter_all(self):
+        """
+        Yields all notifications one by one while the response is being downloaded
+        :return: async generator of dict
+
+        :raises: ResponseStructureError
+        """
+        return self._client.iter_list(self._full_path(), params={'start': 0, 'end': -1})
+
+    async def fetch(self, start, end):
+        """
+        Gets a paginated list of notifications
+        :return: list of dict
+
+        :param start
+        :param end
+
+        :raises: ResponseStructureError
+        """
+        params = {
+            'start': start,
+            'end': end
+        }
+        result = await self._client.get(self._full_path(), params=params)
+        if 'list' not in result:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+        return result['list']
+
+    async def delete_all(self):
+        """
+        Remove all notifications
+
+        :return: True on success, False otherwise
+        """
+        try:
+            await self._client.delete(self._full_path("all"))
+            return False
+        except InvalidJSONError as e:
+            if e.content == b'':  # successfully if response is blank
+                return True
+            return False
+
+    async def delete(self, notification_id):
+        """
+        Remove notification by id
+
+        :param notification_id: str notification id
+
+        :return: True on success, False otherwise
+        """
+
+        params = {
+            'id': notification_id,
+        }
+        try:
+            result = await self._client.delete(self._full_path(), params=params)
+            if 'result' in result and result['result'] == 0:
+                return True
+        except InvalidJSONError:
+            return False
+
+    def _full_path(self, path=''):
+        if path:
+            return 'notification/{}'.format(path)
+        return 'notification'
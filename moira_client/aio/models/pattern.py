@@ -0,0 +1,60 @@
+from ...client import InvalidJSONError
+from ...client import ResponseStructureError
+from ...models.pattern import Pattern
+from ...models.trigger import Trigger
+
+
+class AsyncPatternManager:
+    def __init__(self, client):
+        self._client = client
+
+    async def fetch_all(self):
+        """
+        Returns all existing patterns in all triggers
+
+        :return: list of Pattern
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path())
+        if 'list' in result:
+            patterns = []
+            for pattern in result['list']:
+                if 'triggers' in pattern:
+                    pattern['triggers'] = [Trigger(self._client, **trigger) for trigger in pattern['triggers']]
+                patterns.append(Pattern(**pattern))
+            return patterns
+        else:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+    async def iter_all(self):
+        """
+        Yields all existing patterns one by one while the response is being downloaded
+
+        :return: async generator of Pattern
+
+        :raises: ResponseStructureError
+        """
+        async for pattern in self._client.iter_list(self._full_path()):
+            if 'triggers' in pattern:
+                pattern['triggers'] = [Trigger(self._client, **trigger) for trigger in pattern['triggers']]
+            yield Pattern(**pattern)
+
+    async def delete(self, pattern):
+        """
+        Delete pattern
+        Returns True even if pattern doesn't exist
+
+        :param pattern: str pattern
+        :return: True if deleted, False otherwise
+        """
+        try:
+            await self._client.delete(self._full_path(pattern))
+            return False
+        except InvalidJSONError:
+            return True
+
+    def _full_path(self, path=''):
+        if path:
+            return 'pattern/{}'.format(path)
+        return 'pattern'
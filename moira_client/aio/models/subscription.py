@@ -0,0 +1,134 @@
+from ...client import InvalidJSONError
+from ...client import ResponseStructureError
+from ...models.subscription import Subscription
+
+
+class AsyncSubscriptionManager:
+    def __init__(self, client):
+        self._client = client
+
+    async def fetch_all(self):
+        """
+        Returns all existing subscriptions
+
+        :return: list of Subscription
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path())
+        if 'list' in result:
+            subscriptions = []
+            for subscription in result['list']:
+                subscriptions.append(Subscription(self._client, **subscription))
+            return subscriptions
+        else:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+    async def is_exist(self, **kwargs):
+        """
+        Check whether subscription exists or not by any attributes
+
+        :param kwargs: attributes
+        :return: bool
+
+        :raises: ValueError
+        """
+        for subscription in await self.fetch_all():
+            equal = True
+            for attr, value in kwargs.items():
+                try:
+                    if getattr(subscription, attr) != value:
+                        equal = False
+                        break
+                except Exception:
+                    raise ValueError('Wrong attribute "{}"'.format(attr))
+            if equal:
+                return True
+        return False
+
+    def create(self, tags, contacts=None, enabled=True, throttling=True, sched=None,
+               ignore_warnings=False, ignore_recoverings=False, plotting=None, any_tags=False, **kwargs):
+        """
+        Create new subscription. To save it call save() method of AsyncSubscriptionManager.
+
+        :param tags: list of str tags
+        :param contacts: list of contact id's
+        :param enabled: bool is enabled
+        :param throttling: bool throttling
+        :param sched: dict schedule
+        :param ignore_warnings: bool ignore warnings
+        :param ignore_recoverings: bool ignore recoverings
+        :param kwargs: additional parameters
+        :param plotting: dict plotting settings
+        :param any_tags: bool any tags
+        :return: Subscription
+        """
+
+        return Subscription(
+            self._client,
+            tags,
+            contacts,
+            enabled,
+            throttling,
+            sched,
+            ignore_warnings,
+            ignore_recoverings,
+            plotting,
+            any_tags,
+            **kwargs
+        )
+
+    async def save(self, subscription):
+        """
+        Save subscription, async counterpart of Subscription.save()
+
+        :param subscription: Subscription subscription to save
+        :return: subscription id
+
+        :raises: ResponseStructureError
+        """
+        data = subscription._payload()
+
+        if subscription.id:
+            data['id'] = subscription.id
+            result = await self._client.put(self._full_path(subscription.id), json=data)
+        else:
+            result = await self._client.put(self._full_path(), json=data)
+        if 'id' not in result:
+            raise ResponseStructureError("id doesn't exist in response", result)
+
+        subscription._id = result['id']
+        return subscription.id
+
+    async def delete(self, subscription_id):
+        """
+        Remove subscription by given id
+
+        :return: True on success, False otherwise
+        """
+        try:
+            await self._client.delete(self._full_path(subscription_id))
+            return False
+        except InvalidJSONError as e:
+            if e.content == b'':  # successfully if response is blank
+                return True
+            return False
+
+    async def test(self, subscription_id):
+        """
+        Send test notification to subscription contact
+
+        :return: True on success, False otherwise
+        """
+        try:
+            await self._client.put(self._full_path('{id}/test'.format(id=subscription_id)))
+            return False
+        except InvalidJSONError as e:
+            if e.content == b'':  # successfully if response is blank
+                return True
+            return False
+
+    def _full_path(self, path=''):
+        if path:
+            return 'subscription/{}'.format(path)
+        return 'subscription'
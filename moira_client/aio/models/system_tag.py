@@ -0,0 +1,23 @@
+from ...client import ResponseStructureError
+
+
+class AsyncSystemTagManager:
+    def __init__(self, client):
+        self._client = client
+
+    async def fetch_all(self):
+        """
+        Returns all existing system tags
+
+        :return: list of str
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path())
+        if 'list' not in result:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+        return result['list']
+
+    def _full_path(self):
+        return 'system-tag'
@@ -0,0 +1,118 @@
+from ...client import InvalidJSONError
+from ...client import ResponseStructureError
+from ...models.subscription import Subscription
+from ...models.tag import TagStats
+
+
+class AsyncTagManager:
+    def __init__(self, client):
+        self._client = client
+
+    async def fetch_all(self):
+        """
+        Returns all existing tags
+
+        :return: list of str
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path())
+        if 'list' not in result:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+        return result['list']
+
+    async def delete(self, tag):
+        """
+        Delete tag.
+        In case if tag doesn't exist returns True.
+
+        :param tag: str tag name
+        :return: True if deleted, False otherwise
+        """
+        try:
+            await self._client.delete(self._full_path(tag))
+        except InvalidJSONError:
+            return False
+
+        return True
+
+    async def stats(self):
+        """
+        Returns stats by all triggers
+
+        :return: list of TagStats
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path('stats'))
+        if 'list' in result:
+            for stat in result['list']:
+                if 'subscriptions' in stat:
+                    stat['subscriptions'] = [
+                        Subscription(self._client, **subscription) for subscription in stat['subscriptions']
+                        ]
+            return [TagStats(**stat) for stat in result['list']]
+        else:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+    async def fetch_assigned_triggers(self, tag):
+        """
+        Returns triggers assigned to tag
+
+        :param tag: str tag name
+        :return: list of trigger id's
+
+        :raises: ResponseStructureError
+        """
+        return await self.fetch_assigned_triggers_by_tags([tag])
+
+    async def fetch_assigned_triggers_by_tags(self, tags):
+        """
+        Returns triggers assigned to at least one tag of tags
+
+        :param tags: Iterable of tags
+        :return: list of trigger id's
+
+        :raises: ResponseStructureError
+        """
+
+        tags = set(tags)
+        result = await self._client.get(self._full_path('stats'))
+        if 'list' in result:
+            trigger_ids = set()
+            for stat in result['list']:
+                if 'triggers' in stat and 'name' in stat:
+                    if stat['name'] in tags:
+                        for trigger_id in stat['triggers']:
+                            trigger_ids.add(trigger_id)
+
+            return list(trigger_ids)
+        else:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+    async def fetch_assigned_subscriptions(self, tag):
+        """
+        Returns subscriptions assigned to tag
+
+        :param tag: str tag name
+        :return: list of Subscription
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path('stats'))
+        if 'list' in result:
+            for stat in result['list']:
+                if 'subscriptions' in stat and 'name' in stat:
+                    if stat['name'] == tag:
+                        return [
+                            Subscription(self._client, **subscription) for subscription in stat['subscriptions']
+                            ]
+            return []
+        else:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+    def _full_path(self, path=''):
+        if path:
+            return 'tag/{}'.format(path)
+        return 'tag'
@@ -0,0 +1,193 @@
+from typing import Optional
+
+from ...models.contact import Contact
+from ...models.subscription import Subscription, SubscriptionModel
+from ...models.team import TeamManager, TeamModel
+from ...models.team._models import UserTeams, SaveTeamResponse
+from ...models.team.contact import TeamContactManager
+from ...models.team.settings import TeamSettings, TeamSettingsManager
+from ...models.team.subscription import TeamSubscriptionManager
+from ...models.team.user import TeamMembers, TeamUserManager
+from ..client import AsyncClient
+
+
+class AsyncTeamUserManager:
+    def __init__(self, client: AsyncClient) -> None:
+        self._client = client
+
+    async def get(self, team_id: str) -> TeamMembers:
+        """Get users of a team"""
+        response = await self._client.get(self._full_path(team_id))
+
+        return TeamMembers(**response)
+
+    async def add(self, team_id: str, members: TeamMembers) -> TeamMembers:
+        """Add users to a team"""
+        payload = {"usernames": members.usernames}
+
+        response = await self._client.post(self._full_path(team_id), json=payload)
+
+        return TeamMembers(**response)
+
+    async def set(self, team_id: str, members: TeamMembers) -> TeamMembers:
+        """Set users of a team"""
+        payload = {"usernames": members.usernames}
+
+        response = await self._client.put(self._full_path(team_id), json=payload)
+
+        return TeamMembers(**response)
+
+    async def delete(self, team_id: str, team_user_id: str) -> TeamMembers:
+        """Delete a user from a team"""
+        response = await self._client.delete(self._full_path(team_id, team_user_id))
+
+        return TeamMembers(**response)
+
+    _full_path = staticmethod(TeamUserManager._full_path)
+
+
+class AsyncTeamSettingsManager:
+    def __init__(self, client: AsyncClient) -> None:
+        self._client = client
+
+    async def get(self, team_id: str) -> TeamSettings:
+        """Get team settings"""
+        response = await self._client.get(self._full_path(team_id))
+
+        return TeamSettings(
+            contacts=[Contact(**contact) for contact in response["contacts"]],
+            subscriptions=[Subscription(self._client, **subscription) for subscription in response["subscriptions"]],
+            team_id=response["team_id"],
+        )
+
+    _full_path = staticmethod(TeamSettingsManager._full_path)
+
+
+class AsyncTeamSubscriptionManager:
+    def __init__(self, client: AsyncClient) -> None:
+        self._client = client
+
+    async def create(self, team_id: str, subscription: SubscriptionModel) -> Subscription:
+        """Create a new team subscription"""
+        payload = {
+            "team_id": team_id,
+            "contacts": subscription.contacts,
+            "tags": subscription.tags,
+            "enabled": subscription.enabled,
+            "any_tags": subscription.any_tags,
+            "throttling": subscription.throttling,
+            "sched": subscription.sched,
+            "ignore_warnings": subscription.ignore_warnings,
+            "ignore_recoverings": subscription.ignore_recoverings,
+            "plotting": subscription.plotting,
+        }
+
+        response = await self._client.post(self._full_path(team_id), json=payload)
+
+        return Subscription(self._client, **response)
+
+    _full_path = staticmethod(TeamSubscriptionManager._full_path)
+
+
+class AsyncTeamContactManager:
+    def __init__(self, client: AsyncClient) -> None:
+        self._client = client
+
+    async def create(self, team_id: str, contact: Contact) -> Contact:
+        """Create a new team contact"""
+        payload = {
+            "team_id": team_id,
+            "name": contact.name,
+            "type": contact.type,
+            "value": contact.value,
+            "extra_message": contact.extra_message,
+        }
+
+        response = await self._client.post(self._full_path(team_id), json=payload)
+
+        return Contact(**response)
+
+    _full_path = staticmethod(TeamContactManager._full_path)
+
+
+class AsyncTeamManager:
+    def __init__(self, client: AsyncClient) -> None:
+        self._client = client
+        self._user = None  # type: Optional[AsyncTeamUserManager]
+        self._settings = None  # type: Optional[AsyncTeamSettingsManager]
+        self._subscription = None  # type: Optional[AsyncTeamSubscriptionManager]
+        self._contact = None  # type: Optional[AsyncTeamContactManager]
+
+    async def get_all(self) -> UserTeams:
+        """Get all teams"""
+        response = await self._client.get(self._full_path())
+
+        return UserTeams(teams=[TeamModel(**team) for team in response["teams"]])
+
+    async def create(self, team: TeamModel) -> SaveTeamResponse:
+        """Create a new team"""
+        payload = {
+            "name": team.name,
+            "description": team.description,
+        }
+
+        response = await self._client.post(self._full_path(), json=payload)
+
+        return SaveTeamResponse(**response)
+
+    async def delete(self, team_id: str) -> SaveTeamResponse:
+        """Delete a team"""
+        response = await self._client.delete(self._full_path(team_id))
+
+        return SaveTeamResponse(**response)
+
+    async def get(self, team_id: str) -> TeamModel:
+        """Get a team by ID"""
+        response = await self._client.get(self._full_path(team_id))
+
+        return TeamModel(**response)
+
+    async def update(self, team_id: str, team: TeamModel) -> SaveTeamResponse:
+        """Update existing team"""
+        payload = {
+            "name": team.name,
+            "description": team.description,
+        }
+
+        response = await self._client.patch(self._full_path(team_id), json=payload)
+
+        return SaveTeamResponse(**response)
+
+    @property
+    def user(self) -> AsyncTeamUserManager:
+        """Get team user manager"""
+        if self._user is None:
+            self._user = AsyncTeamUserManager(self._client)
+
+        return self._user
+
+    @property
+    def settings(self) -> AsyncTeamSettingsManager:
+        """Get team settings manager"""
+        if self._settings is None:
+            self._settings = AsyncTeamSettingsManager(self._client)
+
+        return self._settings
+
+    @property
+    def subscription(self) -> AsyncTeamSubscriptionManager:
+        """Get team subscription manager"""
+        if self._subscription is None:
+            self._subscription = AsyncTeamSubscriptionManager(self._client)
+
+        return self._subscription
+
+    @property
+    def contact(self) -> AsyncTeamContactManager:
+        """Get team contact manager"""
+        if self._contact is None:
+            self._contact = AsyncTeamContactManager(self._client)
+
+        return self._contact
+
+    _full_path = staticmethod(TeamManager._full_path)
@@ -0,0 +1,419 @@
+import asyncio
+
+from ...client import InvalidJSONError
+from ...client import MoiraApiError
+from ...client import ResponseStructureError
+from ...models.trigger import STATE_NODATA
+from ...models.trigger import Trigger
+from ...models.trigger import TriggerIndex
+from ...models.trigger import trigger_key
+from ...profiler import caller_context
+
+
+class AsyncTriggerManager:
+    def __init__(self, client):
+        self._client = client
+
+    @property
+    def trigger_client(self):
+        return self._client
+
+    async def fetch_all(self):
+        """
+        Returns all existing triggers
+
+        :return: list of Trigger
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path())
+        if 'list' in result:
+            triggers = []
+            for trigger in result['list']:
+                triggers.append(Trigger(self._client, **trigger))
+            return triggers
+        else:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+    async def iter_all(self):
+        """
+        Yields all existing triggers one by one while the response is being downloaded,
+        memory use doesn't grow with the number of triggers
+
+        :return: async generator of Trigger
+
+        :raises: ResponseStructureError
+        """
+        async for trigger in self._client.iter_list(self._full_path()):
+            yield Trigger(self._client, **trigger)
+
+    async def fetch_by_id(self, trigger_id):
+        """
+        Returns Trigger by trigger id
+
+        :param trigger_id: str trigger id
+        :return: Trigger
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path('{id}/state'.format(id=trigger_id)))
+        if 'state' in result:
+            trigger = await self._client.get(self._full_path(trigger_id))
+            return Trigger(self._client, **trigger)
+        elif not 'trigger_id' in result:
+            raise ResponseStructureError("invalid api response", result)
+
+    async def fetch_many(self, trigger_ids, concurrency=None, check_state=False, progress=None):
+        """
+        Returns triggers by trigger ids, async counterpart of TriggerManager.fetch_many()
+
+        :param trigger_ids: iterable of str trigger ids, duplicates are fetched once
+        :param concurrency: int max number of simultaneous requests, defaults to the client pool size
+        :param check_state: bool request trigger state first like fetch_by_id(), two requests per trigger
+        :param progress: callable(done, total) called after every trigger
+        :return: dict of trigger id to Trigger, None for triggers that don't exist
+
+        :raises: MoiraApiError
+        :raises: ResponseStructureError
+        """
+        trigger_ids = list(dict.fromkeys(trigger_ids))
+        semaphore = asyncio.Semaphore(concurrency or self._client.pool_maxsize)
+        done = 0
+
+        async def fetch(trigger_id):
+            nonlocal done
+            async with semaphore:
+                try:
+                    if check_state:
+                        return await self.fetch_by_id(trigger_id)
+                    return Trigger(self._client, **await self._client.get(self._full_path(trigger_id)))
+                except MoiraApiError as e:
+                    if e.status_code != 404:
+                        raise
+                    return None
+                finally:
+                    done += 1
+                    if progress is not None:
+                        progress(done, len(trigger_ids))
+
+        # tasks copy the context they are created in
+        context = caller_context()
+        tasks = [context.run(asyncio.ensure_future, fetch(trigger_id)) for trigger_id in trigger_ids]
+        try:
+            triggers = await asyncio.gather(*tasks)
+        except BaseException:
+            # gather doesn't cancel the other fetches when one of them fails
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return dict(zip(trigger_ids, triggers))
+
+    async def search(self, only_problems, page, text):
+        """
+        Search triggers
+
+        :param only_problems: Restricts the result to errors only. Example: false
+        :param page: Defines the number of the displayed page. E.g, page=2 would display the 2nd page. Example: 1
+        :param text: Query to perform a search for. Example: cpu
+
+        :return: matching triggers list
+
+        :raises: ResponseStructureError
+        """
+        params = {
+            'onlyProblems': only_problems,
+            'page': page,
+            'text': text,
+        }
+        result = await self._client.get(self._full_path(), params=params)
+        if 'list' not in result:
+            raise ResponseStructureError("list doesn't exist in response", result)
+
+        return result['list']
+
+    async def save(self, trigger, upsert=False):
+        """
+        Save trigger, async counterpart of Trigger.save()
+
+        :param trigger: Trigger trigger to save
+        :param upsert: bool update an existing trigger with a single request, see update()
+        :return: response object
+        """
+        if not trigger.id:
+            existing = await self.check_exists(trigger)
+            if existing:
+                trigger._id = existing.id
+        return await self.update(trigger, upsert)
+
+    async def update(self, trigger, upsert=False):
+        """
+        Update trigger, async counterpart of Trigger.update()
+
+        :param trigger: Trigger trigger to update
+        :param upsert: bool put the trigger by id without fetching it first,
+            the trigger is created if the API answers 404 Not Found
+        :return: response object
+
+        :raises: MoiraApiError
+        :raises: ResponseStructureError
+        """
+        data = trigger._payload()
+
+        api_response = None
+        if trigger.id:
+            data['id'] = trigger.id
+            if upsert:
+                try:
+                    res = await self._client.put(
+                        self._full_path('{}?{}'.format(trigger.id, Trigger.QUERY_PARAM_VALIDATE_FLAG)), json=data)
+                except MoiraApiError as e:
+                    if e.status_code != 404:
+                        raise
+                    res = await self._client.put('trigger?{}'.format(Trigger.QUERY_PARAM_VALIDATE_FLAG), json=data)
+                return self._saved(trigger, res)
+            api_response = await self.fetch_by_id(trigger.id)
+
+        if api_response:
+            res = await self._client.put(
+                self._full_path('{}?{}'.format(trigger.id, Trigger.QUERY_PARAM_VALIDATE_FLAG)), json=data)
+        else:
+            res = await self._client.put('trigger?{}'.format(Trigger.QUERY_PARAM_VALIDATE_FLAG), json=data)
+
+        return self._saved(trigger, res)
+
+    def _saved(self, trigger, res):
+        if 'id' not in res:
+            raise ResponseStructureError('id not in response', res)
+
+        trigger._id = res['id']
+        return res
+
+    async def check_exists(self, trigger):
+        """
+        Check if trigger exists, async counterpart of Trigger.check_exists()
+
+        :param trigger: Trigger trigger to check
+        :return: existing Trigger if exists, None otherwise
+        """
+        key = trigger_key(trigger)
+        for moira_trigger in await self.fetch_all():
+            if trigger_key(moira_trigger) == key:
+                return moira_trigger
+
+    async def delete(self, trigger_id):
+        """
+        Delete trigger by trigger id
+
+        :param trigger_id: str trigger id
+        :return: True if deleted, False otherwise
+        """
+        try:
+            await self._client.delete(self._full_path(trigger_id))
+            return False
+        except InvalidJSONError:
+            return True
+
+    async def get_throttling(self, trigger_id):
+        """
+        Get a trigger with its throttling i.e its next allowed message time
+
+        :param trigger_id: str trigger id
+        :return: trigger throttle value or None
+        """
+        try:
+            result = await self._client.get(self._full_path('{id}/throttling'.format(id=trigger_id)))
+            if 'throttling' in result:
+                return result['throttling']
+            return None
+        except InvalidJSONError:
+            return None
+
+    async def reset_throttling(self, trigger_id):
+        """
+        Resets throttling by trigger id
+
+        :param trigger_id: str trigger id
+        :return: True if reset, False otherwise
+        """
+        try:
+            await self._client.delete(self._full_path('{id}/throttling'.format(id=trigger_id)))
+            return True
+        except InvalidJSONError:
+            return False
+
+    async def get_state(self, trigger_id):
+        """
+        Get state of trigger by trigger id
+
+        :param trigger_id: str trigger id
+        :return: state of trigger
+        """
+        return await self._client.get(self._full_path('{id}/state'.format(id=trigger_id)))
+
+    async def get_metrics(self, trigger_id, _from, to):
+        """
+        Get metrics associated with certain trigger
+
+        :param trigger_id: str trigger id
+        :param _from: The start period of metrics to get. Example : -1hour
+        :param to: The end period of metrics to get. Example : now
+
+        :return: Metrics for trigger
+        """
+        try:
+            params = {
+                'from': _from,
+                'to': to,
+            }
+            result = await self._client.get(self._full_path('{id}/metrics'.format(id=trigger_id)), params=params)
+            return result
+        except InvalidJSONError:
+            return []
+
+    async def remove_metric(self, trigger_id, metric):
+        """
+        Remove metric by trigger id
+
+        :param trigger_id: str trigger id
+        :param metric: str metric name
+        :return: True if removed, False otherwise
+        """
+        try:
+            params = {
+                'name': metric
+            }
+            await self._client.delete(self._full_path('{id}/metrics'.format(id=trigger_id)), params=params)
+            return True
+        except InvalidJSONError:
+            return False
+
+    async def remove_nodata_metrics(self, trigger_id):
+        """
+        Remove metric by trigger id
+
+        :param trigger_id: str trigger id
+        :return: True if removed, False otherwise
+        """
+        try:
+            await self._client.delete(self._full_path('{id}/metrics/nodata'.format(id=trigger_id)))
+            return True
+        except InvalidJSONError:
+            return False
+
+    async def is_exist(self, trigger):
+        """
+        Check whether trigger exists or not
+
+        :param trigger: Trigger trigger to check
+        :return: bool
+        """
+        return await self.check_exists(trigger) is not None
+
+    async def get_non_existent(self, triggers):
+        """
+        Returns triggers which are not exist yet
+
+        :param triggers: list of Trigger
+        :return: list of Trigger
+        """
+        return (await self.diff(triggers)).missing
+
+    async def diff(self, triggers):
+        """
+        Compare triggers with the ones on the server by name, targets and tags,
+        async counterpart of TriggerManager.diff()
+
+        :param triggers: list of Trigger
+        :return: TriggerDiff
+
+        :raises: ResponseStructureError
+        """
+        return TriggerIndex(await self.fetch_all()).diff(triggers)
+
+    async def set_maintenance(self, trigger_id, end_time, metrics=None):
+        """
+        Set maintenance trigger id or metric name
+
+        :param trigger_id: str trigger id
+        :param metrics: "metric name" - "end-time" map, end-time like param end_time
+        :param end_time: unix time to end the scheduled maintenance
+        :return: True if success, False otherwise
+        """
+        try:
+            data = {
+                'trigger': end_time,
+            }
+            if metrics is not None:
+                data['metrics'] = metrics
+            await self._client.put(self._full_path('{id}/setMaintenance'.format(id=trigger_id)), json=data)
+            return True
+        except InvalidJSONError:
+            return False
+
+    def create(
+            self,
+            name,
+            tags,
+            targets,
+            warn_value=None,
+            error_value=None,
+            desc='',
+            ttl=600,
+            ttl_state=STATE_NODATA,
+            sched=None,
+            expression='',
+            trigger_type=None,
+            is_remote=False,
+            mute_new_metrics=False,
+            alone_metrics=None,
+            trigger_source=None,
+            cluster_id=None,
+            **kwargs
+    ):
+        """
+        Creates new trigger. To save it call save() method of AsyncTriggerManager.
+        :param name: str trigger name
+        :param tags: list of str tags for trigger
+        :param targets: list of str targets
+        :param warn_value: float warning value (if T1 <= warn_value)
+        :param error_value: float error value (if T1 <= error_value)
+        :param desc: str trigger description
+        :param ttl: int set ttl_state if has no value for ttl seconds
+        :param ttl_state: str state after ttl seconds without data (one of STATE_* constants)
+        :param sched: dict schedule for trigger
+        :param expression: str c-like expression
+        :param trigger_type: str trigger type
+        :param is_remote: bool use remote storage
+        :param mute_new_metrics: bool mute new metrics
+        :param alone_metrics: dict with targets of alone metrics
+        :param kwargs: additional trigger params
+        :param trigger_source: str specify trigger source, overrides is_remote
+        :param cluster_id: str specify cluster id
+        :return: Trigger
+        """
+        return Trigger(
+            client=self._client,
+            name=name,
+            tags=tags,
+            targets=targets,
+            warn_value=warn_value,
+            error_value=error_value,
+            desc=desc,
+            ttl=ttl,
+            ttl_state=ttl_state,
+            sched=sched,
+            expression=expression,
+            trigger_type=trigger_type,
+            is_remote=is_remote,
+            mute_new_metrics=mute_new_metrics,
+            alone_metrics=alone_metrics,
+            trigger_source=trigger_source,
+            cluster_id=cluster_id,
+            **kwargs
+        )
+
+    def _full_path(self, path=''):
+        if path:
+            return 'trigger/{}'.format(path)
+        return 'trigger'
@@ -0,0 +1,46 @@
+from ...client import ResponseStructureError
+from ...models.contact import Contact
+from ...models.subscription import Subscription
+from ...models.user import UserSettings
+
+
+class AsyncUserManager:
+    def __init__(self, client):
+        self._client = client
+
+    async def get_username(self):
+        """
+        Gets the username of the authenticated user if it is available.
+
+        :return: login
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path())
+        if 'login' not in result:
+            raise ResponseStructureError("'login' field doesn't exist in response", result)
+        return result['login']
+
+    async def get_user_settings(self):
+        """
+        Get the user's contacts and subscriptions.
+
+        :return: user settings
+
+        :raises: ResponseStructureError
+        """
+        result = await self._client.get(self._full_path('settings'))
+        required = ['login', 'contacts', 'subscriptions']
+        for field in required:
+            if field not in result:
+                raise ResponseStructureError("'{}' field doesn't exist in response".format(field), result)
+
+        contacts = [Contact(**contact) for contact in result['contacts']]
+        subscriptions = [Subscription(self._client, **subscription) for subscription in result['subscriptions']]
+
+        return UserSettings(**dict(result, contacts=contacts, subscriptions=subscriptions))
+
+    def _full_path(self, path=''):
+        if path:
+            return 'user/{}'.format(path)
+        return 'user'
@@ -0,0 +1,207 @@
+from .client import AsyncClient
+from .models.contact import AsyncContactManager
+from .models.event import AsyncEventManager
+from .models.notification import AsyncNotificationManager
+from .models.pattern import AsyncPatternManager
+from .models.subscription import AsyncSubscriptionManager
+from .models.tag import AsyncTagManager
+from .models.system_tag import AsyncSystemTagManager
+from .models.trigger import AsyncTriggerManager
+from .models.health import AsyncHealthManager
+from .models.config import AsyncConfigManager
+from .models.user import AsyncUserManager
+from .models.team import AsyncTeamManager
+from ..profiler import Profiler
+
+
+class AsyncMoira:
+    def __init__(self, api_url, auth_custom=None,
+                 auth_user=None, auth_pass=None, login=None, **kwargs):
+        """
+        :param api_url: str API URL
+        :param auth_custom: dict auth custom headers
+        :param auth_user: str auth user
+        :param auth_pass: str auth password
+        :param login: str auth login
+        :param kwargs: additional AsyncClient options (connection pool settings etc.)
+        """
+        self._client = AsyncClient(api_url, auth_custom,
+                                   auth_user, auth_pass, login, **kwargs)
+
+        self._trigger = None
+        self._tag = None
+        self._system_tag = None
+        self._event = None
+        self._notification = None
+        self._contact = None
+        self._pattern = None
+        self._subscription = None
+        self._health = None
+        self._config = None
+        self._user = None
+        self._team = None
+
+    @property
+    def client(self):
+        """
+        Get API client
+
+        :return: AsyncClient
+        """
+        return self._client
+
+    @property
+    def trigger(self):
+        """
+        Get trigger manager
+
+        :return: AsyncTriggerManager
+        """
+        if not self._trigger:
+            self._trigger = AsyncTriggerManager(self._client)
+        return self._trigger
+
+    @property
+    def system_tag(self):
+        """
+        Get system tag manager
+
+        :return: AsyncSystemTagManager
+        """
+        if not self._system_tag:
+            self._system_tag = AsyncSystemTagManager(self._client)
+        return self._system_tag
+
+    @property
+    def tag(self):
+        """
+        Get tag manager
+
+        :return: AsyncTagManager
+        """
+        if not self._tag:
+            self._tag = AsyncTagManager(self._client)
+        return self._tag
+
+    @property
+    def event(self):
+        """
+        Get event manager
+
+        :return: AsyncEventManager
+        """
+        if not self._event:
+            self._event = AsyncEventManager(self._client)
+        return self._event
+
+    @property
+    def notification(self):
+        """
+        Get notification manager
+
+        :return: AsyncNotificationManager
+        """
+        if not self._notification:
+            self._notification = AsyncNotificationManager(self._client)
+        return self._notification
+
+    @property
+    def contact(self):
+        """
+        Get contact manager
+
+        :return: AsyncContactManager
+        """
+        if not self._contact:
+            self._contact = AsyncContactManager(self._client)
+        return self._contact
+
+    @property
+    def pattern(self):
+        """
+        Get pattern manager
+
+        :return: AsyncPatternManager
+        """
+        if not self._pattern:
+            self._pattern = AsyncPatternManager(self._client)
+        return self._pattern
+
+    @property
+    def subscription(self):
+        """
+        Get subscription manager
+
+        :return: AsyncSubscriptionManager
+        """
+        if not self._subscription:
+            self._subscription = AsyncSubscriptionManager(self._client)
+        return self._subscription
+
+    @property
+    def health(self):
+        """
+        Get health manager
+
+        :return: AsyncHealthManager
+        """
+        if not self._health:
+            self._health = AsyncHealthManager(self._client)
+        return self._health
+
+    @property
+    def config(self):
+        """
+        Get config manager
+
+        :return: AsyncConfigManager
+        """
+        if not self._config:
+            self._config = AsyncConfigManager(self._client)
+        return self._config
+
+    @property
+    def user(self):
+        """
+        Get user manager
+
+        :return: AsyncUserManager
+        """
+        if not self._user:
+            self._user = AsyncUserManager(self._client)
+        return self._user
+
+    @property
+    def team(self) -> AsyncTeamManager:
+        """Get team manager
+        """
+        if not self._team:
+            self._team = AsyncTeamManager(self._client)
+
+        return self._team
+
+    def profile(self):
+        """
+        Record HTTP calls made inside the with block and attribute them to manager and model methods:
+
+            with moira.profile() as profiler:
+                trigger.save()
+            print(profiler.format())
+
+        :return: Profiler
+        """
+        return Profiler(self._client)
+
+    async def close(self):
+        """
+        Close pooled connections of the underlying client
+
+        :return: None
+        """
+        await self._client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
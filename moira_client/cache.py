@@ -0,0 +1,232 @@
+from collections import OrderedDict
+import threading
+import time
+
+from .codec import copy_json
+
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def cache_key(path, params=None):
+    """
+    Returns cache key of a GET request
+
+    :param path: str api path
+    :param params: dict or list of pairs query parameters
+    :return: hashable key
+    """
+    if not params:
+        return path, ()
+    items = params.items() if isinstance(params, dict) else params
+    return path, tuple(sorted((str(name), str(value)) for name, value in items))
+
+
+class _RevalidationEntry:
+    __slots__ = ('etag', 'last_modified', 'content', 'value')
+
+    def __init__(self, etag, last_modified, content, value):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.content = content
+        self.value = value
+
+
+class RevalidationCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, shared=False):
+        """
+
+        :param max_entries: int max number of cached responses, least recently used are evicted
+        :param shared: bool on 304 return the very object decoded from the first response instead
+            of decoding the stored body again; skips parsing, but callers must not modify results
+        """
+        self.max_entries = max_entries
+        self.shared = shared
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key):
+        """
+        :param key: cache key
+        :return: entry or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    @staticmethod
+    def conditional_headers(entry, headers):
+        """
+        Returns request headers with validators of the cached response
+
+        :param entry: cached entry or None
+        :param headers: dict request headers
+        :return: dict
+        """
+        if entry is None:
+            return headers
+        headers = dict(headers)
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, key, response_headers, content, value):
+        """
+        Remember response if it has validators
+
+        :param key: cache key
+        :param response_headers: response headers
+        :param content: bytes response body
+        :param value: decoded response body
+        :return: None
+        """
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                self._entries.pop(key, None)
+                return
+            entry = _RevalidationEntry(etag, last_modified, None if self.shared else content,
+                                       value if self.shared else None)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revalidated(self, entry, decode):
+        """
+        Returns body of a cached response confirmed by 304 Not Modified
+
+        :param entry: cached entry
+        :param decode: callable decoding stored body
+        :return: decoded body
+        """
+        with self._lock:
+            self.hits += 1
+        if self.shared:
+            return entry.value
+        return decode(entry.content)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+DEFAULT_TTL = 5
+
+# cached paths which may change after a write under the key prefix
+DEFAULT_INVALIDATION = {
+    'trigger': ('trigger', 'tag', 'pattern', 'event', 'notification'),
+    'subscription': ('subscription', 'tag', 'user', 'teams'),
+    'contact': ('contact', 'user', 'teams'),
+    'tag': ('tag', 'trigger', 'subscription', 'pattern'),
+    'pattern': ('pattern', 'trigger'),
+    'teams': ('teams', 'contact', 'subscription', 'user'),
+}
+
+
+def _first_segment(path):
+    return path.split('?', 1)[0].split('/', 1)[0]
+
+
+class ResponseCache:
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES, path_ttls=None, invalidation=None):
+        """
+
+        :param ttl: float seconds to keep GET responses
+        :param max_entries: int max number of cached responses, least recently used are evicted
+        :param path_ttls: dict path prefix to ttl overriding the default one, the longest matching
+            prefix wins, 0 disables caching of the prefix. Example: {'trigger/': 2, 'config': 600}
+        :param invalidation: dict first path segment of a write to the first path segments of cached
+            responses it invalidates, defaults to DEFAULT_INVALIDATION, other writes invalidate their own segment
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path_ttls = sorted((path_ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.invalidation = DEFAULT_INVALIDATION if invalidation is None else invalidation
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def ttl_for(self, path):
+        """
+        :param path: str api path
+        :return: float seconds to keep response
+        """
+        for prefix, ttl in self.path_ttls:
+            if path.startswith(prefix):
+                return ttl
+        return self.ttl
+
+    def get(self, key):
+        """
+        :param key: cache key
+        :return: (bool hit, copy of the cached value), callers may modify it
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, copy_json(entry[1])
+
+    def store(self, key, value):
+        """
+        :param key: cache key made by cache_key()
+        :param value: decoded response body
+        :return: None
+        """
+        ttl = self.ttl_for(key[0])
+        if ttl <= 0:
+            return
+        # the caller keeps value and may modify it
+        value = copy_json(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path):
+        """
+        Drop cached responses which may be affected by a write to path
+
+        :param path: str api path of PUT/POST/PATCH/DELETE request
+        :return: int number of dropped responses
+        """
+        segment = _first_segment(path)
+        segments = self.invalidation.get(segment, (segment,))
+        with self._lock:
+            stale = [key for key in self._entries if _first_segment(key[0]) in segments]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -1,5 +1,31 @@
-from requests.auth import HTTPBasicAuth
-import requests
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+import threading
+import time
+
+from .cache import cache_key
+from .codec import copy_json
+from .codec import get_codec
+from .compression import ACCEPT_ENCODING
+from .compression import TransferStats
+from .retry import UNAVAILABLE_STATUSES
+from .singleflight import SingleFlight
+from .streaming import DEFAULT_CHUNK_SIZE
+from .streaming import ListItemParser
+from .transports import DEFAULT_POOL_CONNECTIONS
+from .transports import DEFAULT_POOL_MAXSIZE
+from .transports import HTTP2_PRIOR_KNOWLEDGE  # noqa: F401, re-exported
+from .transports import TransportConnectionError
+from .transports import TransportError
+from .transports import TransportTimeout
+from .transports import check_transport
+from .transports import get_transport
+
+
+DEFAULT_TRANSPORT = 'requests'
+
+RETRY_EXCEPTIONS = (TransportConnectionError, TransportTimeout)
 
 
 class ResponseStructureError(Exception):
@@ -22,16 +48,33 @@ class InvalidJSONError(Exception):
         self.content = content
 
 class MoiraApiError(Exception):
-    def __init__(self, body):
+    def __init__(self, body, status_code=None):
         """
 
         :param body: response body
+        :param status_code: int HTTP status of the response, None if there was no response
         """
         self.body = body
+        self.status_code = status_code
 
 
-class Client:
-    def __init__(self, api_url, auth_custom=None, auth_user=None, auth_pass=None, login=None):
+class CircuitOpenError(MoiraApiError):
+    def __init__(self, retry_in):
+        """
+
+        :param retry_in: float seconds until the circuit breaker lets a probe request through
+        """
+        super().__init__(b'')
+        self.retry_in = retry_in
+
+
+class BaseClient:
+    # keyword argument the HTTP library takes raw request bodies in
+    BODY_ARGUMENT = 'data'
+
+    def __init__(self, api_url, auth_custom=None, auth_user=None, auth_pass=None, login=None,
+                 retry=None, circuit_breaker=None, codec='auto', compression=None, revalidation_cache=None,
+                 response_cache=None, rate_limiter=None, hedging=None, hooks=None):
         """
 
         :param api_url: str Moira API URL
@@ -39,6 +82,15 @@ class Client:
         :param auth_user: str auth user
         :param auth_pass: str auth password
         :param login: str auth login
+        :param retry: RetryPolicy retry policy, None to never retry
+        :param circuit_breaker: CircuitBreaker circuit breaker, None to always send requests
+        :param codec: JSON codec for request and response bodies, see moira_client.codec.get_codec
+        :param compression: GzipCompression compression of large request bodies, None to send them as is
+        :param revalidation_cache: RevalidationCache cache of GET responses revalidated with ETag/Last-Modified
+        :param response_cache: ResponseCache cache of GET responses invalidated by writes
+        :param rate_limiter: RateLimiter client-side request rate limit, None to send requests right away
+        :param hedging: HedgePolicy send a second GET request when the first one is slow, None to never hedge
+        :param hooks: Hooks callbacks invoked around every HTTP request
         """
         if not api_url.endswith('/'):
             self.api_url = api_url + '/'
@@ -56,11 +108,245 @@ class Client:
             }
 
         if auth_user and auth_pass:
-            self.auth = HTTPBasicAuth(auth_user, auth_pass)
+            self.auth = self._create_auth(auth_user, auth_pass)
 
         if auth_custom:
             self.headers.update(auth_custom)
 
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.codec = get_codec(codec)
+        self.compression = compression
+        self.revalidation_cache = revalidation_cache
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter
+        self.hedging = hedging
+        self.hooks = hooks
+        self.transfer_stats = TransferStats()
+        self.single_flight = None
+        # TriggerIndex of this client, see TriggerManager.build_index
+        self.trigger_index = None
+
+    def _encode_body(self, kwargs):
+        """
+        Encode json payload with the codec and compress it
+
+        :return: (kwargs, headers, int body size before compression)
+        """
+        headers = self.headers
+        if kwargs.get('json') is None:
+            body = kwargs.get(self.BODY_ARGUMENT)
+            return kwargs, headers, len(body) if isinstance(body, bytes) else 0
+
+        body = self.codec.dumps(kwargs.pop('json'))
+        size = len(body)
+        if self.compression is not None:
+            body, encoding = self.compression.compress(body)
+            if encoding:
+                headers = dict(headers, **{'Content-Encoding': encoding})
+        kwargs[self.BODY_ARGUMENT] = body
+        return kwargs, headers, size
+
+    def _cache_lookup(self, method, path, kwargs):
+        """
+        :return: (cache key or None, bool hit, cached response)
+        """
+        if method != 'GET' or self.response_cache is None:
+            return None, False, None
+        key = cache_key(path, kwargs.get('params'))
+        hit, value = self.response_cache.get(key)
+        return key, hit, value
+
+    def _flight_key(self, method, path, kwargs):
+        """
+        :return: key identical concurrent GET requests are coalesced by, None to send the request on its own
+        """
+        if method != 'GET' or self.single_flight is None:
+            return None
+        return cache_key(path, kwargs.get('params'))
+
+    def _should_hedge(self, method, kwargs):
+        # streamed responses are read by the caller after the winner is picked, there is nothing to race
+        return method == 'GET' and self.hedging is not None and not kwargs.get('stream')
+
+    def _cache_invalidate(self, method, path):
+        if method != 'GET' and self.response_cache is not None:
+            self.response_cache.invalidate(path)
+
+    def _revalidation_lookup(self, method, path, kwargs, headers):
+        """
+        :return: (cache key or None, cached entry or None, request headers)
+        """
+        if method != 'GET' or self.revalidation_cache is None:
+            return None, None, headers
+        key = cache_key(path, kwargs.get('params'))
+        entry = self.revalidation_cache.lookup(key)
+        return key, entry, self.revalidation_cache.conditional_headers(entry, headers)
+
+    def _handle_response(self, key, entry, status_code, response_headers, content):
+        """
+        Decode response, serving cached body on 304 Not Modified
+
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        """
+        if entry is not None and status_code == 304:
+            return self.revalidation_cache.revalidated(entry, self._decode_body)
+        result = self._handle_status(status_code, content)
+        if key is not None:
+            self.revalidation_cache.store(key, response_headers, content, result)
+        return result
+
+    def _handle_status(self, status_code, content):
+        if status_code >= 400:
+            raise MoiraApiError(content, status_code)
+        return self._decode_body(content)
+
+    def _record_transfer(self, kwargs, sent_bytes, content, received_wire_bytes):
+        """
+        :return: (int request body size on the wire, int response body size on the wire)
+        """
+        sent_wire_bytes = self._body_size(kwargs)
+        received_bytes = len(content) if content else 0
+        if received_wire_bytes is None:
+            received_wire_bytes = received_bytes
+        self.transfer_stats.record(sent_bytes, sent_wire_bytes, received_bytes, received_wire_bytes)
+        return sent_wire_bytes, received_wire_bytes
+
+    def _body_size(self, kwargs):
+        body = kwargs.get(self.BODY_ARGUMENT)
+        return len(body) if isinstance(body, bytes) else 0
+
+    def _hooks_started(self, method, path):
+        if self.hooks is None:
+            return None, None
+        return self.hooks.request_started(method, path)
+
+    def _hooks_finished(self, request, started, status, transferred):
+        if request is not None:
+            self.hooks.request_finished(request, started, status, *transferred)
+
+    def _hooks_failed(self, request, started, kwargs, error):
+        if request is not None:
+            self.hooks.request_failed(request, started, self._body_size(kwargs), error)
+
+    def _decode_body(self, content):
+        try:
+            return self.codec.loads(content)
+        except ValueError:
+            raise InvalidJSONError(content)
+
+    def _check_circuit(self):
+        if self.circuit_breaker is not None and not self.circuit_breaker.allow_request():
+            raise CircuitOpenError(self.circuit_breaker.retry_in())
+
+    def _record_failure(self):
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.record_failure()
+
+    def _record_status(self, status_code):
+        if self.circuit_breaker is None:
+            return
+        if status_code in UNAVAILABLE_STATUSES:
+            self.circuit_breaker.record_failure()
+        else:
+            self.circuit_breaker.record_success()
+
+    def _can_retry(self, method, path, retry):
+        return self.retry is not None and self.retry.can_retry(method, retry, path)
+
+    def _can_retry_status(self, method, path, retry, status_code):
+        return self._can_retry(method, path, retry) and self.retry.is_retry_status(status_code)
+
+    def _create_auth(self, auth_user, auth_pass):
+        raise NotImplementedError
+
+    def _path_join(self, *args):
+        path = self.api_url
+        for part in args:
+            path += part
+        return path
+
+
+class Client(BaseClient):
+    def __init__(self, api_url, auth_custom=None, auth_user=None, auth_pass=None, login=None,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 idle_timeout=None, retry=None, circuit_breaker=None, codec='auto', compression=None,
+                 revalidation_cache=None, response_cache=None, coalesce=False, rate_limiter=None,
+                 hedging=None, hooks=None, http2=False, transport=DEFAULT_TRANSPORT):
+        """
+
+        :param api_url: str Moira API URL
+        :param auth_custom: dict auth custom headers
+        :param auth_user: str auth user
+        :param auth_pass: str auth password
+        :param login: str auth login
+        :param pool_connections: int number of per-host connection pools to keep
+        :param pool_maxsize: int max number of keep-alive connections per host
+        :param idle_timeout: float seconds of inactivity after which pooled connections are dropped,
+            None to keep them until the client is closed
+        :param retry: RetryPolicy retry policy for connection errors and overload statuses, None to never retry
+        :param circuit_breaker: CircuitBreaker fail fast with CircuitOpenError while the API is down
+        :param codec: 'auto' to use orjson or ujson when installed, 'json', 'orjson', 'ujson' or a codec object
+        :param compression: GzipCompression gzip PUT/POST/PATCH bodies above a size threshold,
+            the API has to accept Content-Encoding: gzip
+        :param revalidation_cache: RevalidationCache keep GET responses and revalidate them with
+            If-None-Match/If-Modified-Since, serving the cached body on 304 Not Modified
+        :param response_cache: ResponseCache keep GET responses for a TTL, writes invalidate related paths
+        :param coalesce: bool send identical concurrent GET requests once and share the response between threads
+        :param rate_limiter: RateLimiter token buckets requests wait for, globally and per endpoint prefix
+        :param hedging: HedgePolicy send a second GET request when the first one has not answered within
+            a delay, the first response wins. Attempts run on 2 * pool_maxsize threads, GET requests
+            beyond that are sent without hedging
+        :param hooks: Hooks callbacks invoked before and after every HTTP request, retries included
+        :param http2: bool multiplex concurrent requests over a few HTTP/2 connections using httpx,
+            negotiated over https:// with a fallback to HTTP/1.1; HTTP2_PRIOR_KNOWLEDGE to use HTTP/2
+            over http:// with servers that support it. Implies the httpx transport
+        :param transport: HTTP stack requests are sent with: 'requests', 'urllib3' (lowest overhead),
+            'httpx' or a moira_client.transports.Transport object
+        """
+        if http2 and transport == DEFAULT_TRANSPORT:
+            transport = 'httpx'
+        check_transport(transport, http2)
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._transport = None
+        self._transport_options = (transport, http2)
+        self._credentials = None
+
+        super().__init__(api_url, auth_custom, auth_user, auth_pass, login, retry=retry,
+                         circuit_breaker=circuit_breaker, codec=codec, compression=compression,
+                         revalidation_cache=revalidation_cache, response_cache=response_cache,
+                         rate_limiter=rate_limiter, hedging=hedging, hooks=hooks)
+        if coalesce:
+            self.single_flight = SingleFlight(copy=copy_json)
+
+        self._hedge_executor = None
+        # free workers of the hedge executor, requests never queue for one
+        self._hedge_slots = threading.BoundedSemaphore(2 * self.pool_maxsize)
+
+    @property
+    def transport(self):
+        """
+        Transport requests are sent with, created on first use so that the HTTP library
+        is only imported once it is needed
+
+        :return: Transport
+        """
+        if self._transport is None:
+            with self._lock:
+                if self._transport is None:
+                    transport, http2 = self._transport_options
+                    transport = get_transport(transport, self.pool_connections, self.pool_maxsize,
+                                              self.idle_timeout, headers={'Accept-Encoding': ACCEPT_ENCODING},
+                                              http2=http2)
+                    if self._credentials is not None:
+                        self.auth = transport.create_auth(*self._credentials)
+                    self._transport = transport
+        return self._transport
+
     def get(self, path='', **kwargs):
         """
 
@@ -71,17 +357,7 @@ class Client:
         :raises: MoiraApiError
         :raises: InvalidJSONError
         """
-        r = requests.get(self._path_join(path), headers=self.headers, auth=self.auth, **kwargs)
-        
-        try:
-            r.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            raise MoiraApiError(r.content)
-
-        try:
-            return r.json()
-        except ValueError:
-            raise InvalidJSONError(r.content)
+        return self._request('GET', path, **kwargs)
 
     def delete(self, path='', **kwargs):
         """
@@ -93,17 +369,7 @@ class Client:
         :raises: MoiraApiError
         :raises: InvalidJSONError
         """
-        r = requests.delete(self._path_join(path), headers=self.headers, auth=self.auth, **kwargs)
-        
-        try:
-            r.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            raise MoiraApiError(r.content)
-
-        try:
-            return r.json()
-        except ValueError:
-            raise InvalidJSONError(r.content)
+        return self._request('DELETE', path, **kwargs)
 
     def put(self, path='', **kwargs):
         """
@@ -115,17 +381,7 @@ class Client:
         :raises: MoiraApiError
         :raises: InvalidJSONError
         """
-        r = requests.put(self._path_join(path), headers=self.headers, auth=self.auth, **kwargs)
-
-        try:
-            r.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            raise MoiraApiError(r.content)
-
-        try:
-            return r.json()
-        except ValueError:
-            raise InvalidJSONError(r.content)
+        return self._request('PUT', path, **kwargs)
 
     def patch(self, path='', **kwargs):
         """
@@ -137,17 +393,7 @@ class Client:
         :raises: MoiraApiError
         :raises: InvalidJSONError
         """
-        r = requests.patch(self._path_join(path), headers=self.headers, auth=self.auth, **kwargs)
-
-        try:
-            r.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            raise MoiraApiError(r.content)
-
-        try:
-            return r.json()
-        except ValueError:
-            raise InvalidJSONError(r.content)
+        return self._request('PATCH', path, **kwargs)
 
     def post(self, path='', **kwargs):
         """
@@ -159,20 +405,174 @@ class Client:
         :raises: MoiraApiError
         :raises: InvalidJSONError
         """
-        r = requests.post(self._path_join(path), headers=self.headers, auth=self.auth, **kwargs)
-        
-        try:
-            r.raise_for_status()
-        except requests.exceptions.HTTPError as err:
-            raise MoiraApiError(r.content)
+        return self._request('POST', path, **kwargs)
+
+    def iter_list(self, path='', key='list', chunk_size=DEFAULT_CHUNK_SIZE, **kwargs):
+        """
+        Stream a GET response and yield items of its list member one by one as they arrive,
+        memory use doesn't grow with the size of the list. Response caches, coalescing and
+        hedging are not used; HTTP/2 responses are read as a whole.
+
+        :param path: str api path
+        :param key: str name of the list member of the response object
+        :param chunk_size: int bytes to read from the socket at a time
+        :param kwargs: additional parameters for request
+        :return: generator of decoded items
 
+        :raises: MoiraApiError
+        :raises: InvalidJSONError
+        :raises: ResponseStructureError
+        """
+        r = self._send_with_retry('GET', path, self.headers, 0, stream=True, **kwargs)
+        received = 0
         try:
-            return r.json()
-        except ValueError:
-            raise InvalidJSONError(r.content)
+            if r.status_code >= 400:
+                raise MoiraApiError(r.content, r.status_code)
+            parser = ListItemParser(key)
+            try:
+                for chunk in r.iter_content(chunk_size):
+                    received += len(chunk)
+                    yield from parser.feed(chunk)
+                yield from parser.close()
+            except KeyError:
+                raise ResponseStructureError("{} doesn't exist in response".format(key), None)
+            except ValueError:
+                raise InvalidJSONError(b'')
+        finally:
+            self.transfer_stats.record(0, 0, received, r.wire_bytes or received)
+            r.close()
+
+    def close(self):
+        """
+        Close all pooled connections
 
-    def _path_join(self, *args):
-        path = self.api_url
-        for part in args:
-            path += part
-        return path
+        :return: None
+        """
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        if self._transport is not None:
+            self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _request(self, method, path, **kwargs):
+        key, hit, result = self._cache_lookup(method, path, kwargs)
+        if hit:
+            return result
+        flight_key = self._flight_key(method, path, kwargs)
+        try:
+            if flight_key is None:
+                result = self._perform(method, path, **kwargs)
+            else:
+                result = self.single_flight.do(flight_key, lambda: self._perform(method, path, **kwargs))
+        finally:
+            self._cache_invalidate(method, path)
+        if key is not None:
+            self.response_cache.store(key, result)
+        return result
+
+    def _perform(self, method, path, **kwargs):
+        kwargs, headers, sent_bytes = self._encode_body(kwargs)
+        key, entry, headers = self._revalidation_lookup(method, path, kwargs, headers)
+        r = self._send_with_retry(method, path, headers, sent_bytes, **kwargs)
+        return self._handle_response(key, entry, r.status_code, r.headers, r.content)
+
+    def _send_with_retry(self, method, path, headers, sent_bytes, **kwargs):
+        retry = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(path)
+            self._check_circuit()
+            request, started = self._hooks_started(method, path)
+            try:
+                if self._should_hedge(method, kwargs):
+                    r = self._send_hedged(method, path, headers, **kwargs)
+                else:
+                    r = self._send(method, path, headers, **kwargs)
+            except TransportError as e:
+                self._hooks_failed(request, started, kwargs, e)
+                self._record_failure()
+                if not isinstance(e, RETRY_EXCEPTIONS) or not self._can_retry(method, path, retry):
+                    raise
+                time.sleep(self.retry.delay(retry))
+                retry += 1
+                continue
+
+            self._record_status(r.status_code)
+            if kwargs.get('stream'):
+                # the body is read and accounted by the caller, see iter_list
+                transferred = (self._body_size(kwargs), 0)
+            else:
+                transferred = self._record_transfer(kwargs, sent_bytes, r.content, r.wire_bytes)
+            self._hooks_finished(request, started, r.status_code, transferred)
+            if not self._can_retry_status(method, path, retry, r.status_code):
+                return r
+            r.close()
+            time.sleep(self.retry.delay(retry, r.headers.get('Retry-After')))
+            retry += 1
+
+    def _send(self, method, path, headers, **kwargs):
+        # creating the transport sets auth
+        transport = self.transport
+        return transport.request(method, self._path_join(path), headers=headers, auth=self.auth, **kwargs)
+
+    def _send_hedged(self, method, path, headers, **kwargs):
+        if not self._hedge_slots.acquire(blocking=False):
+            # all workers are busy: send in the calling thread, a queued attempt would be hedged
+            # for the time spent waiting and double the load when the API is already busy
+            self.hedging.record(hedged=False)
+            return self._send_timed(method, path, headers, **kwargs)
+
+        executor = self._get_hedge_executor()
+        started = threading.Event()
+        primary = executor.submit(self._send_attempt, started, method, path, headers, **kwargs)
+        # the delay counts from the moment the request is sent, not from the submit
+        started.wait()
+        if wait([primary], timeout=self.hedging.delay()).done:
+            self.hedging.record(hedged=False)
+            return primary.result()
+
+        if not self._hedge_slots.acquire(blocking=False):
+            self.hedging.record(hedged=False)
+            return primary.result()
+        hedge = executor.submit(self._send_attempt, None, method, path, headers, **kwargs)
+        attempts = [primary, hedge]
+        for attempt in as_completed(attempts):
+            if attempt.exception() is None:
+                # a blocking request can't be aborted in flight, the loser finishes in the background
+                self.hedging.record(hedged=True, hedge_won=attempt is hedge)
+                return attempt.result()
+        self.hedging.record(hedged=True)
+        return primary.result()
+
+    def _send_attempt(self, started, method, path, headers, **kwargs):
+        # runs on the hedge executor holding a slot
+        try:
+            if started is not None:
+                started.set()
+            return self._send_timed(method, path, headers, **kwargs)
+        finally:
+            self._hedge_slots.release()
+
+    def _send_timed(self, method, path, headers, **kwargs):
+        started = time.monotonic()
+        r = self._send(method, path, headers, **kwargs)
+        self.hedging.record_latency(time.monotonic() - started)
+        return r
+
+    def _get_hedge_executor(self):
+        with self._lock:
+            if self._hedge_executor is None:
+                # each hedged request may hold two workers
+                self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.pool_maxsize)
+            return self._hedge_executor
+
+    def _create_auth(self, auth_user, auth_pass):
+        # auth objects come from the transport library, they are created along with the transport
+        self._credentials = (auth_user, auth_pass)
+        return None
@@ -0,0 +1,103 @@
+from importlib import import_module
+import json
+
+
+def _import_optional(name):
+    # optional libraries are imported when a codec is created, not with moira_client
+    try:
+        return import_module(name)
+    except ImportError:
+        raise ImportError('{} is not installed'.format(name))
+
+
+def copy_json(value):
+    """
+    Copy a decoded JSON document, much faster than copy.deepcopy
+
+    :param value: decoded JSON document
+    :return: copy sharing only immutable values with value
+    """
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+class StdlibJSONCodec:
+    name = 'json'
+
+    def dumps(self, obj):
+        """
+        :param obj: object to encode
+        :return: bytes JSON document
+        """
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data):
+        """
+        :param data: bytes JSON document
+        :return: decoded object
+
+        :raises: ValueError
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec:
+    name = 'orjson'
+
+    def __init__(self):
+        self._orjson = _import_optional('orjson')
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj)
+
+    def loads(self, data):
+        # orjson.JSONDecodeError is a ValueError
+        return self._orjson.loads(data)
+
+
+class UjsonCodec:
+    name = 'ujson'
+
+    def __init__(self):
+        self._ujson = _import_optional('ujson')
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+CODECS = {
+    StdlibJSONCodec.name: StdlibJSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+}
+
+
+def get_codec(codec='auto'):
+    """
+    Resolve JSON codec
+
+    :param codec: 'auto' (fastest installed of orjson, ujson, json), codec name or
+        object with dumps(obj) -> bytes and loads(bytes) -> obj methods
+    :return: codec
+
+    :raises: ValueError
+    :raises: ImportError
+    """
+    if codec is None or codec == 'auto':
+        for fast_codec in (OrjsonCodec, UjsonCodec):
+            try:
+                return fast_codec()
+            except ImportError:
+                pass
+        return StdlibJSONCodec()
+    if isinstance(codec, str):
+        if codec not in CODECS:
+            raise ValueError('Unknown JSON codec "{}"'.format(codec))
+        return CODECS[codec]()
+    return codec
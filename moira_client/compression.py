@@ -0,0 +1,81 @@
+import gzip
+import threading
+
+
+ACCEPT_ENCODING = 'gzip, deflate'
+
+DEFAULT_COMPRESS_LEVEL = 6
+DEFAULT_COMPRESS_THRESHOLD = 16 * 1024
+
+
+class GzipCompression:
+    def __init__(self, level=DEFAULT_COMPRESS_LEVEL, threshold=DEFAULT_COMPRESS_THRESHOLD):
+        """
+
+        :param level: int gzip compression level from 1 (fastest) to 9 (smallest)
+        :param threshold: int min body size in bytes to compress, smaller bodies are sent as is
+        """
+        if not 1 <= level <= 9:
+            raise ValueError('gzip level must be between 1 and 9')
+        self.level = level
+        self.threshold = threshold
+
+    def compress(self, body):
+        """
+        Compress request body if it is large enough
+
+        :param body: bytes request body
+        :return: (bytes body, str content encoding or None)
+        """
+        if len(body) < self.threshold:
+            return body, None
+        return gzip.compress(body, compresslevel=self.level), 'gzip'
+
+
+class TransferStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.sent_bytes = 0
+        self.sent_wire_bytes = 0
+        self.received_bytes = 0
+        self.received_wire_bytes = 0
+
+    def record(self, sent_bytes, sent_wire_bytes, received_bytes, received_wire_bytes):
+        """
+        Account a single request
+
+        :param sent_bytes: int request body size before compression
+        :param sent_wire_bytes: int request body size on the wire
+        :param received_bytes: int response body size after decompression
+        :param received_wire_bytes: int response body size on the wire
+        :return: None
+        """
+        with self._lock:
+            self.requests += 1
+            self.sent_bytes += sent_bytes
+            self.sent_wire_bytes += sent_wire_bytes
+            self.received_bytes += received_bytes
+            self.received_wire_bytes += received_wire_bytes
+
+    @property
+    def saved_bytes(self):
+        """
+        Bytes that compression kept off the wire in both directions
+
+        :return: int
+        """
+        with self._lock:
+            return (self.sent_bytes - self.sent_wire_bytes) + (self.received_bytes - self.received_wire_bytes)
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.sent_bytes = 0
+            self.sent_wire_bytes = 0
+            self.received_bytes = 0
+            self.received_wire_bytes = 0
+
+    def __repr__(self):
+        return '(TransferStats requests={} sent={}/{} received={}/{})'.format(
+            self.requests, self.sent_wire_bytes, self.sent_bytes, self.received_wire_bytes, self.received_bytes)
@@ -0,0 +1,54 @@
+from collections import namedtuple
+from concurrent.futures import CancelledError
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from .profiler import caller_context
+
+
+MapResult = namedtuple('MapResult', ['item', 'value', 'error'])
+
+
+def map_concurrently(fn, items, concurrency, cancel=None, fail_fast=False):
+    """
+    Call fn for every item on a pool of threads
+
+    :param fn: callable taking a single item
+    :param items: iterable of items
+    :param concurrency: int max number of simultaneous calls
+    :param cancel: threading.Event, once set items that have not started yet are skipped
+    :param fail_fast: bool skip the remaining items after the first error
+    :return: list of MapResult in the order of items, skipped items have CancelledError as error
+    """
+    if concurrency < 1:
+        raise ValueError('concurrency must be positive')
+
+    items = list(items)
+    if cancel is None:
+        cancel = threading.Event()
+    context = caller_context()
+
+    def call(item):
+        if cancel.is_set():
+            return MapResult(item, None, CancelledError())
+        try:
+            return MapResult(item, fn(item), None)
+        except Exception as e:
+            if fail_fast:
+                cancel.set()
+            return MapResult(item, None, e)
+
+    executor = ThreadPoolExecutor(max_workers=min(concurrency, len(items) or 1))
+    futures = []
+    try:
+        for item in items:
+            futures.append(executor.submit(context.copy().run, call, item))
+        return [future.result() for future in futures]
+    except BaseException:
+        # e.g. KeyboardInterrupt while waiting: let running calls finish, drop the rest
+        cancel.set()
+        for future in futures:
+            future.cancel()
+        raise
+    finally:
+        executor.shutdown(wait=True)
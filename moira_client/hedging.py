@@ -0,0 +1,83 @@
+from collections import deque
+import threading
+
+
+DEFAULT_WINDOW = 256
+
+
+class HedgePolicy:
+    """
+    Sends a second GET request when the first one has not answered within a delay,
+    the first response wins
+    """
+    def __init__(self, delay=None, percentile=95, window=DEFAULT_WINDOW, min_samples=20,
+                 min_delay=0.005, max_delay=1.0):
+        """
+
+        :param delay: float fixed delay in seconds, None to use a percentile of recent latencies
+        :param percentile: float percentile of recent latencies to use as the delay
+        :param window: int number of recent latencies to keep
+        :param min_samples: int number of latencies to observe before the percentile is used,
+            max_delay is used until then
+        :param min_delay: float lower bound of the percentile delay in seconds
+        :param max_delay: float upper bound of the percentile delay in seconds
+        """
+        self.fixed_delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def delay(self):
+        """
+        :return: float seconds to wait for the first attempt before sending the hedged one
+        """
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_samples:
+            return self.max_delay
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return min(max(samples[index], self.min_delay), self.max_delay)
+
+    def record_latency(self, seconds):
+        """
+        Record latency of a successful attempt
+
+        :param seconds: float
+        :return: None
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def record(self, hedged, hedge_won=False):
+        """
+        Record outcome of a request
+
+        :param hedged: bool whether the hedged attempt was sent
+        :param hedge_won: bool whether the hedged attempt answered first
+        :return: None
+        """
+        with self._lock:
+            self.requests += 1
+            if hedged:
+                self.hedged += 1
+            if hedge_won:
+                self.hedge_wins += 1
+
+    @property
+    def hedge_rate(self):
+        """
+        :return: float share of requests that sent a hedged attempt
+        """
+        return self.hedged / self.requests if self.requests else 0.0
+
+    def __repr__(self):
+        return 'HedgePolicy(requests={}, hedged={}, hedge_wins={})'.format(
+            self.requests, self.hedged, self.hedge_wins)
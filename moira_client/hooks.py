@@ -0,0 +1,91 @@
+from collections import namedtuple
+import time
+
+
+# literal segments of API paths, any other segment is an identifier
+PATH_SEGMENTS = frozenset([
+    'all', 'config', 'contact', 'contacts', 'event', 'health', 'maintenance', 'metrics', 'nodata', 'notification',
+    'notifier', 'pattern', 'search', 'setMaintenance', 'settings', 'state', 'stats', 'subscription', 'subscriptions',
+    'system-tag', 'tag', 'teams', 'test', 'throttling', 'trigger', 'user', 'users',
+])
+
+RequestEvent = namedtuple('RequestEvent', ['method', 'path', 'template'])
+
+ResponseEvent = namedtuple('ResponseEvent', [
+    'method', 'path', 'template', 'status', 'bytes_out', 'bytes_in', 'duration', 'error',
+])
+
+
+def path_template(path):
+    """
+    Replace identifiers in an API path with placeholders, e.g. trigger/1/state becomes trigger/{id}/state
+
+    :param path: str api path
+    :return: str
+    """
+    path = path.split('?', 1)[0].strip('/')
+    if not path:
+        return path
+    segments = path.split('/')
+    return '/'.join(segments[:1] + [
+        segment if segment in PATH_SEGMENTS else '{id}' for segment in segments[1:]
+    ])
+
+
+class Hooks:
+    """
+    Callbacks invoked around every HTTP request the client sends, retries included
+    """
+    def __init__(self, before_request=(), after_response=(), on_exception=()):
+        """
+
+        :param before_request: iterable of callables taking a RequestEvent
+        :param after_response: iterable of callables taking a ResponseEvent, called for every status
+        :param on_exception: iterable of callables taking a ResponseEvent with error set,
+            called when no response was received
+        """
+        self.before_request = list(before_request)
+        self.after_response = list(after_response)
+        self.on_exception = list(on_exception)
+
+    def request_started(self, method, path):
+        """
+        :param method: str HTTP method
+        :param path: str api path
+        :return: (RequestEvent, float start time)
+        """
+        request = RequestEvent(method, path, path_template(path))
+        for hook in self.before_request:
+            hook(request)
+        return request, time.monotonic()
+
+    def request_finished(self, request, started, status, bytes_out, bytes_in):
+        """
+        :param request: RequestEvent returned by request_started
+        :param started: float start time returned by request_started
+        :param status: int HTTP status
+        :param bytes_out: int request body size on the wire
+        :param bytes_in: int response body size on the wire
+        :return: None
+        """
+        response = ResponseEvent(
+            request.method, request.path, request.template, status, bytes_out, bytes_in,
+            time.monotonic() - started, None,
+        )
+        for hook in self.after_response:
+            hook(response)
+
+    def request_failed(self, request, started, bytes_out, error):
+        """
+        :param request: RequestEvent returned by request_started
+        :param started: float start time returned by request_started
+        :param bytes_out: int request body size on the wire
+        :param error: Exception raised by the HTTP library
+        :return: None
+        """
+        response = ResponseEvent(
+            request.method, request.path, request.template, None, bytes_out, 0,
+            time.monotonic() - started, error,
+        )
+        for hook in self.on_exception:
+            hook(response)
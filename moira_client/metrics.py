@@ -0,0 +1,93 @@
+from bisect import bisect_left
+from collections import namedtuple
+import threading
+
+from .hooks import Hooks
+
+
+# bucket upper bounds in seconds from 0.5ms to ~2 minutes, 4 buckets per doubling (~19% apart)
+BUCKET_BOUNDS = tuple(0.0005 * 2 ** (i / 4.0) for i in range(73))
+
+EndpointStats = namedtuple('EndpointStats', ['count', 'errors', 'mean', 'p50', 'p90', 'p99', 'max'])
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'count', 'errors', 'total', 'max')
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def percentile(self, q):
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                if index == len(BUCKET_BOUNDS):
+                    return self.max
+                return min(BUCKET_BOUNDS[index], self.max)
+        return self.max
+
+
+class LatencyHistogram:
+    """
+    Collects request latencies per endpoint template in fixed log-spaced buckets,
+    percentiles are accurate to a bucket width
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, event):
+        """
+        Record a request, may be used as after_response and on_exception hook
+
+        :param event: ResponseEvent
+        :return: None
+        """
+        key = (event.method, event.template)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = _Histogram()
+            histogram.buckets[bisect_left(BUCKET_BOUNDS, event.duration)] += 1
+            histogram.count += 1
+            histogram.total += event.duration
+            histogram.max = max(histogram.max, event.duration)
+            if event.error is not None or (event.status is not None and event.status >= 500):
+                histogram.errors += 1
+
+    def stats(self):
+        """
+        :return: dict (method, endpoint template) to EndpointStats, durations in seconds
+        """
+        with self._lock:
+            return {
+                key: EndpointStats(
+                    count=histogram.count,
+                    errors=histogram.errors,
+                    mean=histogram.total / histogram.count,
+                    p50=histogram.percentile(0.5),
+                    p90=histogram.percentile(0.9),
+                    p99=histogram.percentile(0.99),
+                    max=histogram.max,
+                )
+                for key, histogram in self._histograms.items()
+            }
+
+    def reset(self):
+        """
+        :return: None
+        """
+        with self._lock:
+            self._histograms.clear()
+
+    def hooks(self):
+        """
+        :return: Hooks recording every request into this histogram
+        """
+        return Hooks(after_response=[self.observe], on_exception=[self.observe])
@@ -30,7 +30,9 @@ class ConfigManager:
         :raises: ResponseStructureError
         """
         result = self._client.get(self._full_path())
+        return self._to_config(result)
 
+    def _to_config(self, result):
         if 'contacts' not in result:
             raise ResponseStructureError("'contacts' field doesn't exist in response", result)
         if 'remoteAllowed' not in result:
@@ -16,6 +16,15 @@ class NotificationManager:
         result = self.fetch(start=0, end=-1)
         return result
 
+    def iter_all(self):
+        """
+        Yields all notifications one by one while the response is being downloaded
+        :return: generator of dict
+
+        :raises: ResponseStructureError
+        """
+        return self._client.iter_list(self._full_path(), params={'start': 0, 'end': -1})
+
     def fetch(self, start, end):
         """
         Gets a paginated list of notifications
@@ -34,6 +34,19 @@ class PatternManager:
         else:
             raise ResponseStructureError("list doesn't exist in response", result)
 
+    def iter_all(self):
+        """
+        Yields all existing patterns one by one while the response is being downloaded
+
+        :return: generator of Pattern
+
+        :raises: ResponseStructureError
+        """
+        for pattern in self._client.iter_list(self._full_path()):
+            if 'triggers' in pattern:
+                pattern['triggers'] = [Trigger(self._client, **trigger) for trigger in pattern['triggers']]
+            yield Pattern(**pattern)
+
     def delete(self, pattern):
         """
         Delete pattern
@@ -167,8 +167,8 @@ class Subscription(SubscriptionModel):
             **kwargs,
         )
 
-    def _send_request(self, subscription_id=None):
-        data = {
+    def _payload(self):
+        return {
             'contacts': self.contacts,
             'tags': self.tags,
             'enabled': self.enabled,
@@ -181,6 +181,9 @@ class Subscription(SubscriptionModel):
             'team_id': self.team_id,
         }
 
+    def _send_request(self, subscription_id=None):
+        data = self._payload()
+
         if subscription_id:
             data['id'] = subscription_id
 
@@ -1,7 +1,5 @@
 from collections import namedtuple
 
-from requests.exceptions import HTTPError
-
 from ..client import InvalidJSONError
 from ..client import ResponseStructureError
 from .subscription import Subscription
@@ -39,7 +37,7 @@ class TagManager:
         """
         try:
             self._client.delete(self._full_path(tag))
-        except (InvalidJSONError, HTTPError):
+        except InvalidJSONError:
             return False
 
         return True
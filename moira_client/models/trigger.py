@@ -1,3 +1,10 @@
+from collections import namedtuple
+from concurrent.futures import CancelledError
+import copy
+import threading
+
+from ..client import MoiraApiError
+from ..executor import map_concurrently
 from ..client import ResponseStructureError
 from ..client import InvalidJSONError
 from .base import Base
@@ -16,6 +23,156 @@ GRAPHITE_LOCAL = 'graphite_local'
 GRAPHITE_REMOTE = 'graphite_remote'
 PROMETHEUS_REMOTE = 'prometheus_remote'
 
+# missing: list of Trigger not on the server, matched: list of (Trigger, server Trigger),
+# server_only: list of server Trigger matching none of the compared triggers
+TriggerDiff = namedtuple('TriggerDiff', ['missing', 'matched', 'server_only'])
+
+# created, updated, unchanged: list of Trigger, deleted: list of str trigger ids,
+# failed: list of (Trigger or trigger id, Exception), skipped: list of duplicate inputs, Trigger or trigger id
+BulkReport = namedtuple('BulkReport', ['created', 'updated', 'unchanged', 'deleted', 'failed', 'skipped'])
+
+
+def trigger_key(trigger):
+    """
+    Identity triggers are compared by: name, targets and tags regardless of order
+
+    :param trigger: Trigger
+    :return: (str name, frozenset targets, frozenset tags)
+    """
+    return trigger.name, frozenset(trigger.targets or ()), frozenset(trigger.tags or ())
+
+
+class TriggerIndex:
+    """
+    Existing triggers by their identity for O(1) existence checks.
+
+    Built from a single trigger list download, it follows saves and deletes made through
+    the same client but not changes made by others.
+    """
+    def __init__(self, triggers=()):
+        """
+
+        :param triggers: iterable of Trigger with ids
+        """
+        # first trigger of every identity, later ones with the same identity are rare and kept apart
+        self._by_key = {}
+        self._duplicates = {}
+        self._keys = {}
+        self._lock = threading.Lock()
+        for trigger in triggers:
+            self._add(trigger_key(trigger), trigger)
+
+    def find(self, trigger):
+        """
+        :param trigger: Trigger to look up, its id doesn't matter
+        :return: the first indexed Trigger with the same name, targets and tags or None
+        """
+        return self.find_key(trigger_key(trigger))
+
+    def find_key(self, key):
+        """
+        :param key: identity returned by trigger_key()
+        :return: the first indexed Trigger with this identity or None
+        """
+        with self._lock:
+            return self._by_key.get(key)
+
+    def add(self, trigger):
+        """
+        Index a copy of a trigger, replacing the previous version with the same id.
+        Later changes of the trigger are not seen by the index until it is added again.
+
+        :param trigger: Trigger with id
+        :return: None
+        """
+        snapshot = Trigger(trigger._client, id=trigger.id, **copy.deepcopy(trigger._payload()))
+        key = trigger_key(snapshot)
+        with self._lock:
+            self._add(key, snapshot)
+
+    def get(self, trigger_id):
+        """
+        :param trigger_id: str trigger id
+        :return: indexed Trigger with this id or None
+        """
+        with self._lock:
+            key = self._keys.get(trigger_id)
+            if key is None:
+                return None
+            for trigger in [self._by_key[key]] + self._duplicates.get(key, []):
+                if trigger.id == trigger_id:
+                    return trigger
+
+    def remove(self, trigger_id):
+        """
+        :param trigger_id: str trigger id
+        :return: None
+        """
+        with self._lock:
+            self._discard(trigger_id)
+
+    def exclude(self, keys):
+        """
+        :param keys: set of identities returned by trigger_key()
+        :return: list of indexed Trigger whose identity is not in keys
+        """
+        with self._lock:
+            triggers = [trigger for key, trigger in self._by_key.items() if key not in keys]
+            for key, duplicates in self._duplicates.items():
+                if key not in keys:
+                    triggers.extend(duplicates)
+            return triggers
+
+    def diff(self, triggers):
+        """
+        :param triggers: iterable of Trigger to compare with the indexed ones by name, targets and tags
+        :return: TriggerDiff
+        """
+        missing = []
+        matched = []
+        keys = set()
+        for trigger in triggers:
+            key = trigger_key(trigger)
+            keys.add(key)
+            moira_trigger = self.find_key(key)
+            if moira_trigger is None:
+                missing.append(trigger)
+            else:
+                matched.append((trigger, moira_trigger))
+        return TriggerDiff(missing, matched, self.exclude(keys))
+
+    def _add(self, key, trigger):
+        if trigger.id in self._keys:
+            self._discard(trigger.id)
+        if key in self._by_key:
+            self._duplicates.setdefault(key, []).append(trigger)
+        else:
+            self._by_key[key] = trigger
+        self._keys[trigger.id] = key
+
+    def _discard(self, trigger_id):
+        key = self._keys.pop(trigger_id, None)
+        if key is None:
+            return
+        duplicates = self._duplicates.pop(key, [])
+        if self._by_key[key].id == trigger_id:
+            if duplicates:
+                self._by_key[key] = duplicates.pop(0)
+            else:
+                del self._by_key[key]
+        else:
+            duplicates = [trigger for trigger in duplicates if trigger.id != trigger_id]
+        if duplicates:
+            self._duplicates[key] = duplicates
+
+    def __contains__(self, trigger):
+        return self.find(trigger) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._keys)
+
+
 class Trigger(Base):
     QUERY_PARAM_VALIDATE_FLAG = 'validate'
 
@@ -136,7 +293,7 @@ class Trigger(Base):
     def id(self):
         return self._id
 
-    def _send_request(self, trigger_id=None):
+    def _payload(self):
         data = {
             'name': self.name,
             'tags': self.tags,
@@ -158,45 +315,66 @@ class Trigger(Base):
             data['trigger_source'] = self.trigger_source
         if self.cluster_id:
             data['cluster_id'] = self.cluster_id
+        return data
 
-        if trigger_id:
-            data['id'] = trigger_id
-            api_response = TriggerManager(self._client).fetch_by_id(trigger_id)
+    def _send_request(self, trigger_id=None, upsert=False):
+        data = self._payload()
 
-        if trigger_id and api_response:
-            res = self._client.put('trigger/{}?{}'.format(trigger_id, self.QUERY_PARAM_VALIDATE_FLAG), json=data)
+        if trigger_id and upsert:
+            data['id'] = trigger_id
+            try:
+                res = self._client.put('trigger/{}?{}'.format(trigger_id, self.QUERY_PARAM_VALIDATE_FLAG), json=data)
+            except MoiraApiError as e:
+                if e.status_code != 404:
+                    raise
+                res = self._client.put('trigger?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), json=data)
         else:
-            res = self._client.put('trigger?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), json=data)
+            if trigger_id:
+                data['id'] = trigger_id
+                api_response = TriggerManager(self._client).fetch_by_id(trigger_id)
+
+            if trigger_id and api_response:
+                res = self._client.put('trigger/{}?{}'.format(trigger_id, self.QUERY_PARAM_VALIDATE_FLAG), json=data)
+            else:
+                res = self._client.put('trigger?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), json=data)
 
         if 'id' not in res:
             raise ResponseStructureError('id not in response', res)
 
         self._id = res['id']
+        index = self._client.trigger_index
+        if index is not None:
+            index.add(self)
         return res
 
-    def save(self):
+    def save(self, upsert=False):
         """
         Save trigger
 
+        :param upsert: bool update an existing trigger with a single request, see update()
         :return: response object
         """
         if self._id:
-            return self.update()
+            return self.update(upsert)
         trigger = self.check_exists()
 
         if trigger:
             self._id = trigger.id
-            return self.update()
+            return self.update(upsert)
 
         return self._send_request()
 
-    def update(self):
+    def update(self, upsert=False):
         """
         Update trigger
 
+        :param upsert: bool put the trigger by id without fetching it first,
+            the trigger is created if the API answers 404 Not Found
         :return: response object
+
+        :raises: MoiraApiError
         """
-        return self._send_request(self._id)
+        return self._send_request(self._id, upsert)
 
     def set_start_hour(self, hour):
         """
@@ -240,11 +418,12 @@ class Trigger(Base):
 
         :return: trigger id if exists, None otherwise
         """
-        trigger_manager = TriggerManager(self._client)
-        for trigger in trigger_manager.fetch_all():
-            if self.name == trigger.name and \
-                    set(self.targets) == set(trigger.targets) and \
-                    set(self.tags) == set(trigger.tags):
+        index = self._client.trigger_index
+        if index is not None:
+            return index.find(self)
+        key = trigger_key(self)
+        for trigger in TriggerManager(self._client).fetch_all():
+            if trigger_key(trigger) == key:
                 return trigger
 
     def get_metrics(self, start, end):
@@ -322,6 +501,47 @@ class TriggerManager:
         else:
             raise ResponseStructureError("list doesn't exist in response", result)
 
+    def build_index(self):
+        """
+        Download all triggers once and index them. Until drop_index() is called, is_exist(),
+        Trigger.check_exists() and Trigger.save() of this client look triggers up in the index
+        instead of downloading the list every time, saves and deletes keep it up to date.
+
+        :return: TriggerIndex
+
+        :raises: ResponseStructureError
+        """
+        index = TriggerIndex(self.fetch_all())
+        self._client.trigger_index = index
+        return index
+
+    @property
+    def index(self):
+        """
+        :return: TriggerIndex used by this client, None if build_index() has not been called
+        """
+        return self._client.trigger_index
+
+    def drop_index(self):
+        """
+        Go back to downloading the trigger list for every existence check
+
+        :return: None
+        """
+        self._client.trigger_index = None
+
+    def iter_all(self):
+        """
+        Yields all existing triggers one by one while the response is being downloaded,
+        memory use doesn't grow with the number of triggers
+
+        :return: generator of Trigger
+
+        :raises: ResponseStructureError
+        """
+        for trigger in self._client.iter_list(self._full_path()):
+            yield Trigger(self._client, **trigger)
+
     def fetch_by_id(self, trigger_id):
         """
         Returns Trigger by trigger id
@@ -338,6 +558,47 @@ class TriggerManager:
         elif not 'trigger_id' in result:
             raise ResponseStructureError("invalid api response", result)
 
+    def fetch_many(self, trigger_ids, concurrency=None, check_state=False, progress=None):
+        """
+        Returns triggers by trigger ids, fetched in parallel with one request per trigger
+
+        :param trigger_ids: iterable of str trigger ids, duplicates are fetched once
+        :param concurrency: int max number of simultaneous requests, defaults to the client pool size
+        :param check_state: bool request trigger state first like fetch_by_id(), two requests per trigger
+        :param progress: callable(done, total) called from worker threads after every trigger
+        :return: dict of trigger id to Trigger, None for triggers that don't exist
+
+        :raises: MoiraApiError
+        :raises: ResponseStructureError
+        """
+        trigger_ids = list(dict.fromkeys(trigger_ids))
+        if concurrency is None:
+            concurrency = self._client.pool_maxsize
+        lock = threading.Lock()
+        done = [0]
+
+        def fetch(trigger_id):
+            try:
+                if check_state:
+                    return self.fetch_by_id(trigger_id)
+                return Trigger(self._client, **self._client.get(self._full_path(trigger_id)))
+            except MoiraApiError as e:
+                if e.status_code != 404:
+                    raise
+                return None
+            finally:
+                if progress is not None:
+                    with lock:
+                        done[0] += 1
+                        progress(done[0], len(trigger_ids))
+
+        results = map_concurrently(fetch, trigger_ids, concurrency, fail_fast=True)
+        # after the first error the remaining ids are skipped with CancelledError
+        for result in results:
+            if result.error is not None and not isinstance(result.error, CancelledError):
+                raise result.error
+        return {result.item: result.value for result in results}
+
     def search(self, only_problems, page, text):
         """
         Search triggers
@@ -370,9 +631,13 @@ class TriggerManager:
         """
         try:
             self._client.delete(self._full_path(trigger_id))
-            return False
+            deleted = False
         except InvalidJSONError:
-            return True
+            deleted = True
+        index = self._client.trigger_index
+        if deleted and index is not None:
+            index.remove(trigger_id)
+        return deleted
 
     def get_throttling(self, trigger_id):
         """
@@ -468,12 +733,11 @@ class TriggerManager:
         :param trigger: Trigger trigger to check
         :return: bool
         """
-        for moira_trigger in self.fetch_all():
-            if trigger.name == moira_trigger.name and \
-                    set(trigger.targets) == set(moira_trigger.targets) and \
-                    set(trigger.tags) == set(moira_trigger.tags):
-                return True
-        return False
+        index = self._client.trigger_index
+        if index is not None:
+            return trigger in index
+        key = trigger_key(trigger)
+        return any(trigger_key(moira_trigger) == key for moira_trigger in self.fetch_all())
 
     def get_non_existent(self, triggers):
         """
@@ -482,20 +746,116 @@ class TriggerManager:
         :param triggers: list of Trigger
         :return: list of Trigger
         """
-        moira_triggers = self.fetch_all()
-        non_existent = []
+        return self.diff(triggers).missing
+
+    def diff(self, triggers):
+        """
+        Compare triggers with the ones on the server by name, targets and tags.
+        Uses the index of build_index() if there is one, downloads all triggers otherwise.
+
+        :param triggers: list of Trigger
+        :return: TriggerDiff
+
+        :raises: ResponseStructureError
+        """
+        index = self._client.trigger_index
+        if index is None:
+            index = TriggerIndex(self.fetch_all())
+        return index.diff(triggers)
+
+    def bulk_save(self, triggers, concurrency=None):
+        """
+        Save many triggers with one existence check for all of them and parallel writes.
+
+        Triggers without id are matched with the server ones by name, targets and tags like
+        Trigger.save(), using the index of build_index() if there is one or a single download
+        of all triggers otherwise. Existing triggers are put by id with one request, see
+        Trigger.update(upsert=True), and not written at all if nothing has changed. Of triggers
+        with the same id or the same name, targets and tags only the last one is saved, the others
+        are reported as skipped.
+
+        :param triggers: iterable of Trigger
+        :param concurrency: int max number of simultaneous requests, defaults to the client pool size
+        :return: BulkReport, errors of single triggers are collected in failed
+
+        :raises: ResponseStructureError
+        """
+        index = self._client.trigger_index
+        if index is None:
+            index = TriggerIndex(self.fetch_all())
+
+        unique = {}
+        existing = {}
+        skipped = []
         for trigger in triggers:
-            exist = False
-            for moira_trigger in moira_triggers:
-                if trigger.name == moira_trigger.name and \
-                        set(trigger.targets) == set(moira_trigger.targets) and \
-                        set(trigger.tags) == set(moira_trigger.tags):
-                    exist = True
-                    break
-            if not exist:
-                non_existent.append(trigger)
-
-        return non_existent
+            if trigger.id:
+                moira_trigger = index.get(trigger.id)
+            else:
+                moira_trigger = index.find(trigger)
+                if moira_trigger is not None:
+                    trigger._id = moira_trigger.id
+            key = trigger.id or trigger_key(trigger)
+            if key in unique:
+                skipped.append(unique.pop(key))
+            unique[key] = trigger
+            existing[key] = moira_trigger
+
+        created, updated, unchanged = [], [], []
+        for key, trigger in unique.items():
+            moira_trigger = existing[key]
+            if moira_trigger is None:
+                created.append(trigger)
+            elif trigger._payload() == moira_trigger._payload():
+                unchanged.append(trigger)
+            else:
+                updated.append(trigger)
+
+        def save(trigger):
+            # created triggers with an id are put by id too and created on 404
+            return trigger._send_request(trigger.id, upsert=True)
+
+        if concurrency is None:
+            concurrency = self._client.pool_maxsize
+        failed = []
+        for result in map_concurrently(save, created + updated, concurrency):
+            if result.error is not None:
+                failed.append((result.item, result.error))
+        failures = set(id(trigger) for trigger, _ in failed)
+        return BulkReport(
+            created=[trigger for trigger in created if id(trigger) not in failures],
+            updated=[trigger for trigger in updated if id(trigger) not in failures],
+            unchanged=unchanged,
+            deleted=[],
+            failed=failed,
+            skipped=skipped,
+        )
+
+    def bulk_delete(self, trigger_ids, concurrency=None):
+        """
+        Delete many triggers in parallel
+
+        :param trigger_ids: iterable of str trigger ids, duplicates are deleted once and reported as skipped
+        :param concurrency: int max number of simultaneous requests, defaults to the client pool size
+        :return: BulkReport with deleted, failed and skipped trigger ids
+        """
+        if concurrency is None:
+            concurrency = self._client.pool_maxsize
+        unique = {}
+        skipped = []
+        for trigger_id in trigger_ids:
+            if trigger_id in unique:
+                skipped.append(trigger_id)
+            unique[trigger_id] = None
+        deleted = []
+        failed = []
+        for result in map_concurrently(self.delete, unique, concurrency):
+            if result.error is not None:
+                failed.append((result.item, result.error))
+            elif not result.value:
+                failed.append((result.item, ResponseStructureError('trigger was not deleted', result.item)))
+            else:
+                deleted.append(result.item)
+        return BulkReport(created=[], updated=[], unchanged=[], deleted=deleted, failed=failed, skipped=skipped)
 
     def set_maintenance(self, trigger_id, end_time, metrics=None):
         """
@@ -1,30 +1,26 @@
+from typing import TYPE_CHECKING
+
 from .client import Client
-from .models.contact import ContactManager
-from .models.event import EventManager
-from .models.notification import NotificationManager
-from .models.pattern import PatternManager
-from .models.subscription import SubscriptionManager
-from .models.tag import TagManager
-from .models.system_tag import SystemTagManager
-from .models.trigger import TriggerManager
-from .models.health import HealthManager
-from .models.config import ConfigManager
-from .models.user import UserManager
-from .models.team import TeamManager
+from .executor import map_concurrently
+from .profiler import Profiler
+
+if TYPE_CHECKING:
+    from .models.team import TeamManager
 
 
 class Moira:
     def __init__(self, api_url, auth_custom=None,
-                 auth_user=None, auth_pass=None, login=None):
+                 auth_user=None, auth_pass=None, login=None, **kwargs):
         """
         :param api_url: str API URL
         :param auth_custom: dict auth custom headers
         :param auth_user: str auth user
         :param auth_pass: str auth password
         :param login: str auth login
+        :param kwargs: additional Client options (connection pool settings etc.)
         """
         self._client = Client(api_url, auth_custom,
-                              auth_user, auth_pass, login)
+                              auth_user, auth_pass, login, **kwargs)
 
         self._trigger = None
         self._tag = None
@@ -39,6 +35,15 @@ class Moira:
         self._user = None
         self._team = None
 
+    @property
+    def client(self):
+        """
+        Get API client
+
+        :return: Client
+        """
+        return self._client
+
     @property
     def trigger(self):
         """
@@ -47,6 +52,9 @@ class Moira:
         :return: TriggerManager
         """
         if not self._trigger:
+            # managers are imported on first access to keep importing moira_client fast
+            from .models.trigger import TriggerManager
+
             self._trigger = TriggerManager(self._client)
         return self._trigger
 
@@ -58,6 +66,8 @@ class Moira:
         :return: SystemTagManager
         """
         if not self._system_tag:
+            from .models.system_tag import SystemTagManager
+
             self._system_tag = SystemTagManager(self._client)
         return self._system_tag
 
@@ -69,6 +79,8 @@ class Moira:
         :return: TagManager
         """
         if not self._tag:
+            from .models.tag import TagManager
+
             self._tag = TagManager(self._client)
         return self._tag
 
@@ -80,6 +92,8 @@ class Moira:
         :return: EventManager
         """
         if not self._event:
+            from .models.event import EventManager
+
             self._event = EventManager(self._client)
         return self._event
 
@@ -91,6 +105,8 @@ class Moira:
         :return: NotificationManager
         """
         if not self._notification:
+            from .models.notification import NotificationManager
+
             self._notification = NotificationManager(self._client)
         return self._notification
 
@@ -102,6 +118,8 @@ class Moira:
         :return: ContactManager
         """
         if not self._contact:
+            from .models.contact import ContactManager
+
             self._contact = ContactManager(self._client)
         return self._contact
 
@@ -113,6 +131,8 @@ class Moira:
         :return: PatternManager
         """
         if not self._pattern:
+            from .models.pattern import PatternManager
+
             self._pattern = PatternManager(self._client)
         return self._pattern
 
@@ -124,6 +144,8 @@ class Moira:
         :return: SubscriptionManager
         """
         if not self._subscription:
+            from .models.subscription import SubscriptionManager
+
             self._subscription = SubscriptionManager(self._client)
         return self._subscription
 
@@ -135,6 +157,8 @@ class Moira:
         :return: HealthManager
         """
         if not self._health:
+            from .models.health import HealthManager
+
             self._health = HealthManager(self._client)
         return self._health
 
@@ -146,6 +170,8 @@ class Moira:
         :return: ConfigManager
         """
         if not self._config:
+            from .models.config import ConfigManager
+
             self._config = ConfigManager(self._client)
         return self._config
 
@@ -158,14 +184,55 @@ class Moira:
 
         """
         if not self._user:
+            from .models.user import UserManager
+
             self._user = UserManager(self._client)
         return self._user
 
     @property
-    def team(self) -> TeamManager:
+    def team(self) -> 'TeamManager':
         """Get team manager
         """
         if not self._team:
+            from .models.team import TeamManager
+
             self._team = TeamManager(self._client)
 
         return self._team
+
+    def map(self, fn, items, concurrency=None, cancel=None, fail_fast=False):
+        """
+        Run fn (usually a manager method) for every item on a thread pool
+
+        Example: moira.map(moira.trigger.get_state, trigger_ids, concurrency=16)
+
+        :param fn: callable taking a single item
+        :param items: iterable of items
+        :param concurrency: int max number of simultaneous calls, defaults to the client pool size
+        :param cancel: threading.Event, once set items that have not started yet are skipped
+        :param fail_fast: bool skip the remaining items after the first error
+        :return: list of MapResult(item, value, error) in the order of items
+        """
+        if concurrency is None:
+            concurrency = self._client.pool_maxsize
+        return map_concurrently(fn, items, concurrency, cancel=cancel, fail_fast=fail_fast)
+
+    def profile(self):
+        """
+        Record HTTP calls made inside the with block and attribute them to manager and model methods:
+
+            with moira.profile() as profiler:
+                trigger.save()
+            print(profiler.format())
+
+        :return: Profiler
+        """
+        return Profiler(self._client)
+
+    def close(self):
+        """
+        Close pooled connections of the underlying client
+
+        :return: None
+        """
+        self._client.close()
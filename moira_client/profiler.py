@@ -0,0 +1,147 @@
+from collections import namedtuple
+import contextvars
+import sys
+import threading
+
+from .hooks import Hooks
+
+
+# calls are attributed to public methods of classes defined in these packages
+MODEL_PACKAGES = ('moira_client.models', 'moira_client.aio.models')
+
+# operation of HTTP calls made on the client directly
+DIRECT_CALL = '(client)'
+
+ProfiledCall = namedtuple('ProfiledCall', ['operation', 'chain', 'event'])
+
+# method chain of the code that handed work over to another thread or task, see caller_context()
+_outer_chain = contextvars.ContextVar('moira_client_outer_chain', default=())
+
+_active_lock = threading.Lock()
+_active = 0
+
+OperationStats = namedtuple('OperationStats', [
+    'operation', 'requests', 'errors', 'bytes_out', 'bytes_in', 'duration', 'endpoints',
+])
+
+
+def _method_chain(frame):
+    """
+    :return: tuple of 'Class.method' names of public model methods on the stack, outermost first,
+        preceded by the chain of the caller that started the current thread or task
+    """
+    chain = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_argcount and code.co_varnames[0] == 'self' and not code.co_name.startswith('_'):
+            cls = type(frame.f_locals.get('self'))
+            if cls.__module__.startswith(MODEL_PACKAGES):
+                name = '{}.{}'.format(cls.__name__, code.co_name)
+                if not chain or chain[-1] != name:
+                    chain.append(name)
+        frame = frame.f_back
+    chain.extend(reversed(_outer_chain.get()))
+    chain.reverse()
+    # a method calling itself across a thread hop is counted once
+    return tuple(name for i, name in enumerate(chain) if not i or chain[i - 1] != name)
+
+
+def caller_context():
+    """
+    Copy the current context for work run on other threads or tasks, calls made there are
+    attributed to the model methods on the stack of the caller
+
+    :return: contextvars.Context, run each piece of work in a copy of it
+    """
+    context = contextvars.copy_context()
+    # walking the stack is only worth it when somebody is profiling
+    if _active:
+        context.run(_outer_chain.set, _method_chain(sys._getframe(1)))
+    return context
+
+
+class Profiler:
+    """
+    Records HTTP calls made while it is active and attributes them to the outermost public
+    manager or model method that caused them, e.g. GETs made by check_exists() inside
+    Trigger.save() count towards Trigger.save
+    """
+    def __init__(self, client):
+        """
+
+        :param client: Client or AsyncClient
+        """
+        self._client = client
+        self._lock = threading.Lock()
+        self._installed_hooks = None
+        self.calls = []
+
+    def __enter__(self):
+        global _active
+        with _active_lock:
+            _active += 1
+        hooks = self._client.hooks
+        if hooks is None:
+            hooks = self._installed_hooks = self._client.hooks = Hooks()
+        hooks.after_response.append(self._record)
+        hooks.on_exception.append(self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        with _active_lock:
+            _active -= 1
+        if self._installed_hooks is not None:
+            self._client.hooks = None
+            self._installed_hooks = None
+        else:
+            self._client.hooks.after_response.remove(self._record)
+            self._client.hooks.on_exception.remove(self._record)
+
+    def _record(self, event):
+        chain = _method_chain(sys._getframe(1))
+        call = ProfiledCall(chain[0] if chain else DIRECT_CALL, chain, event)
+        with self._lock:
+            self.calls.append(call)
+
+    def report(self):
+        """
+        Aggregate recorded calls by operation, most requests first
+
+        :return: list of OperationStats, duration is the total time spent in HTTP calls in seconds,
+            endpoints maps 'METHOD template' to number of requests
+        """
+        stats = {}
+        with self._lock:
+            calls = list(self.calls)
+        for call in calls:
+            event = call.event
+            requests, errors, bytes_out, bytes_in, duration, endpoints = stats.get(
+                call.operation, (0, 0, 0, 0, 0.0, {}))
+            endpoint = '{} {}'.format(event.method, event.template)
+            endpoints[endpoint] = endpoints.get(endpoint, 0) + 1
+            stats[call.operation] = (
+                requests + 1,
+                errors + (event.error is not None or event.status >= 400),
+                bytes_out + event.bytes_out,
+                bytes_in + event.bytes_in,
+                duration + event.duration,
+                endpoints,
+            )
+        report = [OperationStats(operation, *values) for operation, values in stats.items()]
+        report.sort(key=lambda operation: operation.requests, reverse=True)
+        return report
+
+    def format(self):
+        """
+        :return: str table of the report
+        """
+        lines = ['{:<40} {:>8} {:>6} {:>12} {:>12} {:>10}'.format(
+            'operation', 'requests', 'errors', 'bytes out', 'bytes in', 'time, ms')]
+        for operation in self.report():
+            lines.append('{:<40} {:>8} {:>6} {:>12} {:>12} {:>10.1f}'.format(
+                operation.operation, operation.requests, operation.errors,
+                operation.bytes_out, operation.bytes_in, operation.duration * 1000))
+            for endpoint, count in sorted(operation.endpoints.items(), key=lambda item: -item[1]):
+                lines.append('    {:<36} {:>8}'.format(endpoint, count))
+        return '\n'.join(lines)
@@ -0,0 +1,88 @@
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=None):
+        """
+
+        :param rate: float tokens added per second
+        :param burst: int max number of tokens the bucket holds, defaults to one second worth of tokens
+        """
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1, rate))
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Take a token, the bucket goes into debt when it is empty
+
+        :return: float seconds to wait before the token may be used
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class RateLimiter:
+    def __init__(self, rate=None, burst=None, endpoints=None):
+        """
+
+        :param rate: float requests per second allowed in total, None for no global limit
+        :param burst: int max number of requests sent at once by the global bucket
+        :param endpoints: dict endpoint prefix (e.g. 'trigger/') to requests per second or (rate, burst) tuple
+        """
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.endpoints = {}
+        for prefix, limit in (endpoints or {}).items():
+            rate, burst = limit if isinstance(limit, tuple) else (limit, None)
+            self.endpoints[prefix] = TokenBucket(rate, burst)
+        # longest prefix first, so 'trigger/search' wins over 'trigger/'
+        self._prefixes = sorted(self.endpoints, key=len, reverse=True)
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.waited = 0.0
+
+    def _endpoint_bucket(self, path):
+        path = path.split('?', 1)[0]
+        for prefix in self._prefixes:
+            if path.startswith(prefix) or path == prefix.rstrip('/'):
+                return self.endpoints[prefix]
+        return None
+
+    def reserve(self, path):
+        """
+        Take a token from the global bucket and from the bucket of the endpoint
+
+        :param path: str api path
+        :return: float seconds to wait before the request may be sent
+        """
+        delay = 0.0
+        for bucket in (self.bucket, self._endpoint_bucket(path)):
+            if bucket is not None:
+                delay = max(delay, bucket.reserve())
+        if delay:
+            with self._lock:
+                self.waits += 1
+                self.waited += delay
+        return delay
+
+    def acquire(self, path):
+        """
+        Block until the request may be sent
+
+        :param path: str api path
+        :return: None
+        """
+        delay = self.reserve(path)
+        if delay:
+            time.sleep(delay)
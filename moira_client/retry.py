@@ -0,0 +1,172 @@
+import datetime
+import random
+import threading
+import time
+
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'DELETE'])
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+# statuses that mean the API itself is unavailable, 429 only asks to slow down
+UNAVAILABLE_STATUSES = frozenset([502, 503, 504])
+
+
+class RetryPolicy:
+    def __init__(self, total=3, backoff_factor=0.5, max_backoff=30, jitter=True,
+                 methods=IDEMPOTENT_METHODS, statuses=RETRY_STATUSES, respect_retry_after=True, retry_updates=True):
+        """
+
+        :param total: int max number of retries after the first attempt
+        :param backoff_factor: float base delay in seconds, delay grows as backoff_factor * 2 ** retry
+        :param max_backoff: float max delay between attempts in seconds
+        :param jitter: bool pick a random delay between 0 and the exponential one (full jitter)
+        :param methods: iterable of HTTP methods which are safe to retry
+        :param statuses: iterable of HTTP statuses to retry
+        :param respect_retry_after: bool wait as long as the Retry-After header asks
+        :param retry_updates: bool also retry PUT to an object path like trigger/{id}, which replaces
+            the object. PUT to a collection like trigger, subscription or contact creates a new object
+            and is never retried, the first attempt may have been committed
+        """
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.methods = frozenset(method.upper() for method in methods)
+        self.statuses = frozenset(statuses)
+        self.respect_retry_after = respect_retry_after
+        self.retry_updates = retry_updates
+
+    def can_retry(self, method, retry, path=None):
+        """
+        Check whether the request may be sent again
+
+        :param method: str HTTP method
+        :param retry: int number of retries already made
+        :param path: str api path, e.g. trigger/{id}?validate
+        :return: bool
+        """
+        if retry >= self.total:
+            return False
+        method = method.upper()
+        if method in self.methods:
+            return True
+        return method == 'PUT' and self.retry_updates and path is not None and is_object_path(path)
+
+    def is_retry_status(self, status_code):
+        """
+        :param status_code: int HTTP status
+        :return: bool
+        """
+        return status_code in self.statuses
+
+    def delay(self, retry, retry_after=None):
+        """
+        Returns seconds to wait before the next attempt
+
+        :param retry: int number of retries already made
+        :param retry_after: str value of the Retry-After response header
+        :return: float
+        """
+        if self.respect_retry_after and retry_after:
+            seconds = parse_retry_after(retry_after)
+            if seconds is not None:
+                return min(seconds, self.max_backoff)
+
+        delay = min(self.backoff_factor * (2 ** retry), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+def is_object_path(path):
+    """
+    :param path: str api path
+    :return: bool whether the path addresses an existing object, e.g. trigger/{id}, not a collection
+    """
+    return '/' in path.split('?', 1)[0].strip('/')
+
+
+def parse_retry_after(value):
+    """
+    Parse Retry-After header value
+
+    :param value: str delay in seconds or HTTP date
+    :return: float seconds or None if the value is malformed
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # email.utils is slow to import and HTTP dates are rare
+    from email.utils import parsedate_to_datetime
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    now = datetime.datetime.now(date.tzinfo or datetime.timezone.utc)
+    return max(0.0, (date - now).total_seconds())
+
+
+class CircuitBreaker:
+    STATE_CLOSED = 'closed'
+    STATE_OPEN = 'open'
+    STATE_HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, recovery_timeout=30):
+        """
+
+        :param failure_threshold: int consecutive failures after which requests fail fast
+        :param recovery_timeout: float seconds to fail fast before a single probe request is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state
+
+    def allow_request(self):
+        """
+        Check whether a request may be sent now
+
+        :return: bool
+        """
+        with self._lock:
+            if self._state == self.STATE_CLOSED:
+                return True
+            if self._state == self.STATE_OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+                self._state = self.STATE_HALF_OPEN
+                return True
+            # open, or half open with the probe still in flight
+            return False
+
+    def retry_in(self):
+        """
+        Returns seconds left until the next probe request is allowed
+
+        :return: float
+        """
+        with self._lock:
+            if self._state != self.STATE_OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.STATE_CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.STATE_OPEN
+                self._opened_at = time.monotonic()
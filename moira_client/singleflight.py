@@ -0,0 +1,113 @@
+import threading
+
+from .profiler import caller_context
+
+
+def _shared(value):
+    return value
+
+
+class _Call:
+    __slots__ = ('done', 'value', 'error', 'waiters')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the function,
+    callers arriving while it is in flight wait for its result.
+    """
+    def __init__(self, copy=_shared):
+        """
+
+        :param copy: callable giving every coalesced caller its own copy of the result,
+            by default the result object is shared
+        """
+        self.copy = copy
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        :param key: hashable key of the call
+        :param fn: callable without arguments
+        :return: result of fn, a copy of it if the call was coalesced
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self.copy(call.value)
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        # no one can join once the call is removed, the value is copied only if someone did
+        return self.copy(call.value) if call.waiters else call.value
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutine calls with the same key
+    """
+    def __init__(self, copy=_shared):
+        """
+
+        :param copy: callable giving every coalesced caller its own copy of the result,
+            by default the result object is shared
+        """
+        self.copy = copy
+        self._calls = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key, fn):
+        """
+        :param key: hashable key of the call
+        :param fn: coroutine function without arguments
+        :return: result of fn, a copy of it if the call was coalesced
+        """
+        # imported here, loading asyncio would slow down import of the blocking client
+        import asyncio
+
+        call = self._calls.get(key)
+        # a finished task waits for its done callback to be removed, don't join it
+        if call is not None and not call[0].done():
+            call[1] += 1
+            self.coalesced += 1
+        else:
+            # the shared request is profiled as part of the caller that started it
+            call = [caller_context().run(asyncio.ensure_future, fn()), 0]
+            self._calls[key] = call
+            self.calls += 1
+
+            def forget(_):
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+
+            call[0].add_done_callback(forget)
+        # cancelling one caller must not cancel the request the others wait for
+        value = await asyncio.shield(call[0])
+        return self.copy(value) if call[1] else value
@@ -0,0 +1,144 @@
+import codecs
+import json
+import re
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# characters a number may continue with, e.g. 1 of 1.5 or 1e5
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+
+_START, _KEY, _COLON, _VALUE, _FIRST_ITEM, _ITEM, _ITEM_END, _MEMBER_END, _DONE = range(9)
+
+# returned by _decode when the buffer ends inside a value
+_MORE = object()
+
+
+class ListItemParser:
+    """
+    Incremental parser of a JSON object that yields items of one of its list members as the
+    body arrives, e.g. triggers of {"list": [...]}. Only a single item is kept decoded at a time,
+    each one is parsed with the C scanner of the json module.
+
+    Other members are parsed and dropped.
+    """
+    def __init__(self, key='list'):
+        """
+
+        :param key: str name of the list member to yield items of
+        """
+        self.key = key
+        self.found = False
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._state = _START
+        self._member = None
+        self._eof = False
+
+    def feed(self, data):
+        """
+        :param data: bytes next chunk of the body
+        :return: list of items completed by the chunk
+
+        :raises: ValueError if the body is not a JSON object
+        """
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(data)
+        self._pos = 0
+        return list(self._parse())
+
+    def close(self):
+        """
+        Finish parsing after the last chunk
+
+        :return: list of remaining items
+
+        :raises: ValueError if the body is truncated
+        :raises: KeyError if the object has no such member
+        """
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(b'', final=True)
+        self._pos = 0
+        self._eof = True
+        items = list(self._parse())
+        if self._state != _DONE:
+            raise ValueError('unexpected end of JSON')
+        if not self.found:
+            raise KeyError(self.key)
+        return items
+
+    def _parse(self):
+        buffer = self._buffer
+        while True:
+            pos = _WHITESPACE.match(buffer, self._pos).end()
+            self._pos = pos
+            if pos == len(buffer):
+                return
+            char = buffer[pos]
+            state = self._state
+
+            if state == _ITEM or state == _FIRST_ITEM and char != ']':
+                item, end = self._decode(pos)
+                if item is _MORE:
+                    return
+                self._pos, self._state = end, _ITEM_END
+                yield item
+            elif state == _ITEM_END or state == _FIRST_ITEM:
+                self._expect(char, {',': _ITEM, ']': _MEMBER_END})
+            elif state == _VALUE:
+                if self._member == self.key and char == '[':
+                    self.found = True
+                    self._pos, self._state = pos + 1, _FIRST_ITEM
+                    continue
+                value, end = self._decode(pos)
+                if value is _MORE:
+                    return
+                if self._member == self.key:
+                    if value is not None:
+                        raise ValueError('{!r} is not a list'.format(self.key))
+                    self.found = True
+                self._pos, self._state = end, _MEMBER_END
+            elif state == _KEY:
+                if char == '}':
+                    self._pos, self._state = pos + 1, _DONE
+                    continue
+                if char != '"':
+                    raise ValueError('expected object key at {}'.format(pos))
+                member, end = self._decode(pos)
+                if member is _MORE:
+                    return
+                self._member = member
+                self._pos, self._state = end, _COLON
+            elif state == _COLON:
+                self._expect(char, {':': _VALUE})
+            elif state == _MEMBER_END:
+                self._expect(char, {',': _KEY, '}': _DONE})
+            elif state == _START:
+                self._expect(char, {'{': _KEY})
+            else:
+                raise ValueError('extra data after JSON object')
+
+    def _expect(self, char, transitions):
+        if char not in transitions:
+            raise ValueError('unexpected {!r} at {}'.format(char, self._pos))
+        self._pos += 1
+        self._state = transitions[char]
+
+    def _decode(self, pos):
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, pos)
+        except ValueError:
+            if self._eof:
+                raise
+            return _MORE, pos
+        # a number at the end of the buffer may continue in the next chunk, also when
+        # the decoded part is followed by an incomplete fraction or exponent like 1. or 1e
+        if self._eof:
+            return value, end
+        if end == len(self._buffer):
+            return _MORE, pos
+        is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+        if is_number and _NUMBER_TAIL.match(self._buffer, end):
+            return _MORE, pos
+        return value, end
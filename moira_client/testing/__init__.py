@@ -0,0 +1,2 @@
+from .data import MoiraData
+from .server import FakeMoiraServer
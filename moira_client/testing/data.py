@@ -0,0 +1,257 @@
+import random
+import threading
+import uuid
+
+
+DAYS_OF_WEEK = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+WEB_CONTACTS = [
+    {'type': 'mail', 'label': 'E-mail'},
+    {'type': 'slack', 'label': 'Slack'},
+    {'type': 'telegram', 'label': 'Telegram'},
+]
+
+SCHEDULE = {
+    'days': [{'enabled': True, 'name': day} for day in DAYS_OF_WEEK],
+    'startOffset': 0,
+    'endOffset': 1439,
+    'tzOffset': 0,
+}
+
+
+class NotFound(KeyError):
+    pass
+
+
+class MoiraData:
+    """
+    In-memory state of a fake Moira: triggers, subscriptions, contacts, teams, notifications.
+
+    Seeded datasets are deterministic, the same seed gives the same ids and payloads.
+    All methods are thread safe.
+    """
+    def __init__(self, seed=0, login='moira'):
+        """
+
+        :param seed: int seed of generated ids and datasets
+        :param login: str login of generated contacts and subscriptions
+        """
+        self.login = login
+        self.triggers = {}
+        self.subscriptions = {}
+        self.contacts = {}
+        self.teams = {}
+        self.team_users = {}
+        self.notifications = []
+        self.system_tags = ['moira-fatal', 'moira-nodata']
+        self.notifier_state = 'OK'
+        self.version = 0
+        self._random = random.Random(seed)
+        # held by FakeMoiraServer while a request is handled and its response encoded
+        self.lock = threading.RLock()
+
+    @classmethod
+    def generate(cls, triggers=0, subscriptions=0, contacts=0, notifications=0, tags=50, seed=0, login='moira'):
+        """
+        Generate a dataset
+
+        :param triggers: int number of triggers
+        :param subscriptions: int number of subscriptions
+        :param contacts: int number of contacts, at least one when there are subscriptions
+        :param notifications: int number of queued notifications
+        :param tags: int number of distinct service tags
+        :param seed: int random seed
+        :param login: str owner of contacts and subscriptions
+        :return: MoiraData
+        """
+        data = cls(seed=seed, login=login)
+        rng = data._random
+        tag_names = ['service-{}'.format(i) for i in range(max(tags, 1))]
+        for i in range(triggers):
+            data.add_trigger({
+                'name': 'Service {} latency'.format(i),
+                'tags': [tag_names[i % len(tag_names)], rng.choice(('latency', 'errors', 'saturation'))],
+                'targets': ['prefix.{}.instance-{}.latency.p{}'.format(
+                    tag_names[i % len(tag_names)], i, rng.choice((50, 99)))],
+                'warn_value': 300,
+                'error_value': 600,
+                'desc': 'latency of service {}'.format(i),
+                'ttl': 600,
+                'ttl_state': 'NODATA',
+                'sched': SCHEDULE,
+                'expression': '',
+                'is_remote': False,
+                'trigger_type': 'rising',
+                'mute_new_metrics': False,
+                'alone_metrics': None,
+            })
+        if subscriptions and not contacts:
+            contacts = 1
+        for i in range(contacts):
+            data.add_contact({'type': 'mail', 'value': 'user{}@example.com'.format(i), 'name': 'contact {}'.format(i)})
+        contact_ids = list(data.contacts)
+        for i in range(subscriptions):
+            data.add_subscription({
+                'tags': sorted(rng.sample(tag_names, min(2, len(tag_names)))),
+                'contacts': [contact_ids[i % len(contact_ids)]],
+                'enabled': True,
+                'any_tags': False,
+                'throttling': True,
+                'sched': SCHEDULE,
+                'ignore_warnings': False,
+                'ignore_recoverings': False,
+                'plotting': {'enabled': False, 'theme': 'light'},
+            })
+        trigger_ids = list(data.triggers)
+        for i in range(notifications):
+            data.notifications.append({
+                'id': data.new_id(),
+                'timestamp': 1500000000 + i,
+                'contact': data.contacts[contact_ids[i % len(contact_ids)]] if contact_ids else {},
+                'event': {'trigger_id': trigger_ids[i % len(trigger_ids)] if trigger_ids else '', 'state': 'ERROR'},
+                'throttled': False,
+                'send_fail': 0,
+            })
+        return data
+
+    def new_id(self):
+        """
+        :return: str random UUID from the seeded generator
+        """
+        with self.lock:
+            return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def add_trigger(self, trigger):
+        """
+        :param trigger: dict trigger payload, id is generated when missing
+        :return: dict stored trigger
+        """
+        with self.lock:
+            trigger = dict(trigger, id=trigger.get('id') or self.new_id())
+            self.triggers[trigger['id']] = trigger
+            self.version += 1
+            return trigger
+
+    def update_trigger(self, trigger_id, trigger):
+        """
+        :raises: NotFound
+        """
+        with self.lock:
+            if trigger_id not in self.triggers:
+                raise NotFound(trigger_id)
+            self.triggers[trigger_id] = dict(trigger, id=trigger_id)
+            self.version += 1
+            return self.triggers[trigger_id]
+
+    def add_subscription(self, subscription):
+        with self.lock:
+            subscription = dict(subscription, id=subscription.get('id') or self.new_id(), user=self.login)
+            self.subscriptions[subscription['id']] = subscription
+            self.version += 1
+            return subscription
+
+    def update_subscription(self, subscription_id, subscription):
+        """
+        :raises: NotFound
+        """
+        with self.lock:
+            if subscription_id not in self.subscriptions:
+                raise NotFound(subscription_id)
+            self.subscriptions[subscription_id] = dict(subscription, id=subscription_id, user=self.login)
+            self.version += 1
+            return self.subscriptions[subscription_id]
+
+    def add_contact(self, contact):
+        with self.lock:
+            contact = dict(contact, id=contact.get('id') or self.new_id(), user=self.login)
+            self.contacts[contact['id']] = contact
+            self.version += 1
+            return contact
+
+    def update_contact(self, contact_id, contact):
+        """
+        :raises: NotFound
+        """
+        with self.lock:
+            if contact_id not in self.contacts:
+                raise NotFound(contact_id)
+            self.contacts[contact_id] = dict(self.contacts[contact_id], **contact)
+            self.version += 1
+            return self.contacts[contact_id]
+
+    def add_team(self, team):
+        with self.lock:
+            team = dict(team, id=team.get('id') or self.new_id())
+            self.teams[team['id']] = team
+            self.team_users[team['id']] = [self.login]
+            self.version += 1
+            return team
+
+    def delete(self, collection, item_id):
+        """
+        :param collection: str name of a dict attribute, e.g. 'triggers'
+        :param item_id: str id
+        :return: bool whether the item existed
+        """
+        with self.lock:
+            existed = getattr(self, collection).pop(item_id, None) is not None
+            self.version += 1
+            return existed
+
+    def tags(self):
+        """
+        :return: list of str tags of triggers and subscriptions
+        """
+        with self.lock:
+            tags = set()
+            for item in list(self.triggers.values()) + list(self.subscriptions.values()):
+                tags.update(item.get('tags') or ())
+            return sorted(tags)
+
+    def tag_stats(self):
+        """
+        :return: list of dict with name, triggers (ids) and subscriptions of every tag
+        """
+        with self.lock:
+            stats = {}
+            for trigger in self.triggers.values():
+                for tag in trigger.get('tags') or ():
+                    stats.setdefault(tag, {'name': tag, 'triggers': [], 'subscriptions': []})['triggers'].append(
+                        trigger['id'])
+            for subscription in self.subscriptions.values():
+                for tag in subscription.get('tags') or ():
+                    stats.setdefault(tag, {'name': tag, 'triggers': [], 'subscriptions': []})[
+                        'subscriptions'].append(subscription)
+            return [stats[tag] for tag in sorted(stats)]
+
+    def patterns(self):
+        """
+        :return: list of dict with pattern, triggers and metrics of every trigger target
+        """
+        with self.lock:
+            patterns = {}
+            for trigger in self.triggers.values():
+                for target in trigger.get('targets') or ():
+                    patterns.setdefault(target, {'pattern': target, 'triggers': [], 'metrics': []})[
+                        'triggers'].append(trigger)
+            return [patterns[pattern] for pattern in sorted(patterns)]
+
+    def delete_tag(self, tag):
+        """
+        :return: bool whether the tag was deleted, tags used by triggers can't be
+        """
+        with self.lock:
+            if any(tag in (trigger.get('tags') or ()) for trigger in self.triggers.values()):
+                return False
+            for subscription in self.subscriptions.values():
+                if tag in (subscription.get('tags') or ()):
+                    subscription['tags'] = [name for name in subscription['tags'] if name != tag]
+            self.version += 1
+            return True
+
+    def delete_pattern(self, pattern):
+        with self.lock:
+            for trigger in self.triggers.values():
+                if pattern in (trigger.get('targets') or ()):
+                    trigger['targets'] = [target for target in trigger['targets'] if target != pattern]
+            self.version += 1
@@ -0,0 +1,700 @@
+"""
+Fake Moira API served over HTTP from memory, for load tests and benchmarks.
+
+Run standalone with: python -m moira_client.testing --triggers 10000 --port 8080
+"""
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from urllib.parse import parse_qsl
+from urllib.parse import unquote
+from urllib.parse import urlsplit
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import socketserver
+import threading
+import time
+
+from .data import WEB_CONTACTS
+from .data import MoiraData
+from .data import NotFound
+
+
+API_PREFIX = '/api/'
+
+EVENTS_PER_TRIGGER = 3
+
+ROUTES = []
+
+
+def route(method, pattern):
+    """
+    Register a handler for an API path pattern, {id} matches any single segment
+    """
+    def decorator(fn):
+        ROUTES.append((method, pattern, tuple(pattern.split('/')), fn))
+        # literal segments take precedence over {id}
+        ROUTES.sort(key=lambda item: item[2].count('{id}'))
+        return fn
+    return decorator
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        """
+
+        :param status: int HTTP status
+        :param message: str error description
+        """
+        self.status = status
+        self.message = message
+
+
+def _not_found(what):
+    return ApiError(404, '{} not found'.format(what))
+
+
+def _match(method, segments):
+    for route_method, pattern, route_segments, handler in ROUTES:
+        if route_method != method or len(route_segments) != len(segments):
+            continue
+        ids = []
+        for expected, segment in zip(route_segments, segments):
+            if expected == '{id}':
+                ids.append(segment)
+            elif expected != segment:
+                break
+        else:
+            return pattern, handler, ids
+    return None, None, None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        self.server.fake.handle(self)
+
+    do_GET = do_PUT = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+    # http.server.ThreadingHTTPServer is not available on Python 3.6
+    daemon_threads = True
+
+
+class FakeMoiraServer:
+    """
+    In-process HTTP server answering the Moira API endpoints the client uses from a MoiraData.
+
+    Latency and errors can be injected, every request is counted by method and path pattern.
+    GET responses carry an ETag and are cached until the data changes, so that serving a large
+    dataset doesn't dominate client-side measurements.
+    """
+    def __init__(self, data=None, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 error_status=503, seed=0):
+        """
+
+        :param data: MoiraData served, an empty one by default
+        :param host: str address to listen on
+        :param port: int port to listen on, 0 to pick a free one
+        :param latency: float seconds added to every response
+        :param jitter: float max seconds of uniformly distributed extra latency
+        :param error_rate: float share of requests answered with error_status instead of being handled
+        :param error_status: int HTTP status of injected errors
+        :param seed: int seed of jitter and injected errors
+        """
+        self.data = data if data is not None else MoiraData(seed=seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = Counter()
+        self.errors = Counter()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._random = random.Random(seed)
+        self._failures = []
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._server = _ThreadingHTTPServer((host, port), _Handler)
+        self._server.fake = self
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        :return: str API URL to pass to Moira
+        """
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}{}'.format(host, port, API_PREFIX)
+
+    @property
+    def total_requests(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def fail_next(self, count=1, status=503, pattern=None):
+        """
+        Answer the next requests with an error status
+
+        :param count: int number of requests to fail
+        :param status: int HTTP status
+        :param pattern: str path pattern such as 'trigger/{id}', None to fail any request
+        :return: None
+        """
+        with self._lock:
+            self._failures.extend([(pattern, status)] * count)
+
+    def reset_counters(self):
+        """
+        :return: None
+        """
+        with self._lock:
+            self.requests.clear()
+            self.errors.clear()
+            self.peak_in_flight = self.in_flight
+
+    def start(self):
+        """
+        Serve requests on a background thread
+
+        :return: FakeMoiraServer
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        name='fake-moira', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        :return: None
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def serve_forever(self):
+        """
+        Serve requests on the current thread until interrupted
+
+        :return: None
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def handle(self, request):
+        """
+        :param request: BaseHTTPRequestHandler
+        :return: None
+        """
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            self._handle(request)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _handle(self, request):
+        method = request.command
+        parts = urlsplit(request.path)
+        body = self._read_body(request)
+        path = parts.path[len(API_PREFIX):] if parts.path.startswith(API_PREFIX) else parts.path.lstrip('/')
+        segments = [unquote(segment) for segment in path.strip('/').split('/')]
+        pattern, handler, ids = _match(method, segments)
+
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        status = self._injected_status(pattern)
+        with self._lock:
+            self.requests[(method, pattern or path)] += 1
+        if status is not None:
+            self._count_error(method, pattern or path)
+            return self._reply(request, status, {'status': 'Injected error', 'error': 'injected'})
+        if handler is None:
+            self._count_error(method, path)
+            return self._reply(request, 404, {'status': 'Resource not found', 'error': 'unknown path'})
+
+        cache_key = (request.path, request.headers.get('X-Webauth-User')) if method == 'GET' else None
+        if cache_key is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None and cached[0] == self.data.version:
+                return self._reply_bytes(request, 200, cached[1], cached[2])
+
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        try:
+            if body is not None and not isinstance(body, dict):
+                raise ApiError(400, 'request body must be a JSON object')
+            with self.data.lock:
+                version = self.data.version
+                status, payload = handler(self, ids, query, body or {}, request)
+                content = b'' if payload is None else json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        except ApiError as e:
+            self._count_error(method, pattern)
+            return self._reply(request, e.status, {'status': 'Error', 'error': e.message})
+        except NotFound as e:
+            self._count_error(method, pattern)
+            return self._reply(request, 404, {'status': 'Resource not found', 'error': str(e)})
+
+        etag = '"{}"'.format(hashlib.md5(content).hexdigest())
+        if cache_key is not None and status == 200:
+            self._cache[cache_key] = (version, content, etag)
+        self._reply_bytes(request, status, content, etag if method == 'GET' else None)
+
+    def _injected_status(self, pattern):
+        with self._lock:
+            for i, (failure_pattern, status) in enumerate(self._failures):
+                if failure_pattern is None or failure_pattern == pattern:
+                    del self._failures[i]
+                    return status
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    def _count_error(self, method, pattern):
+        with self._lock:
+            self.errors[(method, pattern)] += 1
+
+    @staticmethod
+    def _read_body(request):
+        length = int(request.headers.get('Content-Length') or 0)
+        if not length:
+            return None
+        content = request.rfile.read(length)
+        if request.headers.get('Content-Encoding') == 'gzip':
+            content = gzip.decompress(content)
+        try:
+            return json.loads(content)
+        except ValueError:
+            return content
+
+    def _reply(self, request, status, payload):
+        self._reply_bytes(request, status, json.dumps(payload).encode('utf-8'))
+
+    @staticmethod
+    def _reply_bytes(request, status, content, etag=None):
+        if etag is not None and request.headers.get('If-None-Match') == etag:
+            status, content = 304, b''
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json')
+        request.send_header('Content-Length', str(len(content)))
+        if etag is not None:
+            request.send_header('ETag', etag)
+        request.end_headers()
+        request.wfile.write(content)
+
+
+def _require(body, *fields):
+    for field in fields:
+        if field not in body:
+            raise ApiError(400, '{} is required'.format(field))
+
+
+def _trigger(server, trigger_id):
+    trigger = server.data.triggers.get(trigger_id)
+    if trigger is None:
+        raise _not_found('trigger {}'.format(trigger_id))
+    return trigger
+
+
+# triggers
+
+@route('GET', 'trigger')
+def _get_triggers(server, ids, query, body, request):
+    triggers = list(server.data.triggers.values())
+    if not query:
+        return 200, {'list': triggers}
+    text = query.get('text', '').lower()
+    if text:
+        triggers = [trigger for trigger in triggers if text in trigger['name'].lower()]
+    page, size = int(query.get('page') or 0), int(query.get('size') or 10)
+    return 200, {'list': triggers[page * size:(page + 1) * size], 'page': page, 'size': size, 'total': len(triggers)}
+
+
+@route('PUT', 'trigger')
+def _create_trigger(server, ids, query, body, request):
+    _require(body, 'name', 'targets')
+    trigger = server.data.add_trigger(body)
+    return 200, {'id': trigger['id'], 'message': 'trigger created'}
+
+
+@route('GET', 'trigger/{id}')
+def _get_trigger(server, ids, query, body, request):
+    return 200, _trigger(server, ids[0])
+
+
+@route('PUT', 'trigger/{id}')
+def _update_trigger(server, ids, query, body, request):
+    _require(body, 'name', 'targets')
+    trigger = server.data.update_trigger(ids[0], body)
+    return 200, {'id': trigger['id'], 'message': 'trigger updated'}
+
+
+@route('DELETE', 'trigger/{id}')
+def _delete_trigger(server, ids, query, body, request):
+    server.data.delete('triggers', ids[0])
+    return 200, None
+
+
+@route('GET', 'trigger/{id}/state')
+def _get_trigger_state(server, ids, query, body, request):
+    if ids[0] not in server.data.triggers:
+        # like Moira, a trigger without a last check has a state without the state
+        return 200, {'trigger_id': ids[0]}
+    return 200, {'trigger_id': ids[0], 'state': 'OK', 'timestamp': 1500000000, 'score': 0, 'metrics': {}}
+
+
+@route('GET', 'trigger/{id}/metrics')
+def _get_trigger_metrics(server, ids, query, body, request):
+    _trigger(server, ids[0])
+    return 200, {'main': {}}
+
+
+@route('DELETE', 'trigger/{id}/metrics')
+def _delete_trigger_metric(server, ids, query, body, request):
+    _trigger(server, ids[0])
+    return 200, {}
+
+
+@route('DELETE', 'trigger/{id}/metrics/nodata')
+def _delete_nodata_metrics(server, ids, query, body, request):
+    _trigger(server, ids[0])
+    return 200, {}
+
+
+@route('GET', 'trigger/{id}/throttling')
+def _get_throttling(server, ids, query, body, request):
+    _trigger(server, ids[0])
+    return 200, {'throttling': 0}
+
+
+@route('DELETE', 'trigger/{id}/throttling')
+def _reset_throttling(server, ids, query, body, request):
+    _trigger(server, ids[0])
+    return 200, {}
+
+
+@route('PUT', 'trigger/{id}/setMaintenance')
+def _set_maintenance(server, ids, query, body, request):
+    _trigger(server, ids[0])
+    return 200, {}
+
+
+# subscriptions and contacts
+
+@route('GET', 'subscription')
+def _get_subscriptions(server, ids, query, body, request):
+    return 200, {'list': list(server.data.subscriptions.values())}
+
+
+@route('PUT', 'subscription')
+def _create_subscription(server, ids, query, body, request):
+    _require(body, 'contacts')
+    return 200, server.data.add_subscription(body)
+
+
+@route('PUT', 'subscription/{id}')
+def _update_subscription(server, ids, query, body, request):
+    return 200, server.data.update_subscription(ids[0], body)
+
+
+@route('DELETE', 'subscription/{id}')
+def _delete_subscription(server, ids, query, body, request):
+    server.data.delete('subscriptions', ids[0])
+    return 200, None
+
+
+@route('PUT', 'subscription/{id}/test')
+def _test_subscription(server, ids, query, body, request):
+    if ids[0] not in server.data.subscriptions:
+        raise _not_found('subscription {}'.format(ids[0]))
+    return 200, None
+
+
+@route('GET', 'contact')
+def _get_contacts(server, ids, query, body, request):
+    return 200, {'list': list(server.data.contacts.values())}
+
+
+@route('PUT', 'contact')
+def _create_contact(server, ids, query, body, request):
+    _require(body, 'type', 'value')
+    return 200, server.data.add_contact(body)
+
+
+@route('PUT', 'contact/{id}')
+def _update_contact(server, ids, query, body, request):
+    return 200, server.data.update_contact(ids[0], body)
+
+
+@route('DELETE', 'contact/{id}')
+def _delete_contact(server, ids, query, body, request):
+    server.data.delete('contacts', ids[0])
+    return 200, None
+
+
+@route('POST', 'contact/{id}/test')
+def _test_contact(server, ids, query, body, request):
+    if ids[0] not in server.data.contacts:
+        raise _not_found('contact {}'.format(ids[0]))
+    return 200, None
+
+
+# tags, patterns, events, notifications
+
+@route('GET', 'tag')
+def _get_tags(server, ids, query, body, request):
+    return 200, {'list': server.data.tags()}
+
+
+@route('GET', 'tag/stats')
+def _get_tag_stats(server, ids, query, body, request):
+    return 200, {'list': server.data.tag_stats()}
+
+
+@route('DELETE', 'tag/{id}')
+def _delete_tag(server, ids, query, body, request):
+    if not server.data.delete_tag(ids[0]):
+        raise ApiError(400, 'this tag is assigned to triggers')
+    return 200, {'message': 'tag deleted'}
+
+
+@route('GET', 'system-tag')
+def _get_system_tags(server, ids, query, body, request):
+    return 200, {'list': server.data.system_tags}
+
+
+@route('GET', 'pattern')
+def _get_patterns(server, ids, query, body, request):
+    return 200, {'list': server.data.patterns()}
+
+
+@route('DELETE', 'pattern/{id}')
+def _delete_pattern(server, ids, query, body, request):
+    server.data.delete_pattern(ids[0])
+    return 200, None
+
+
+@route('GET', 'event/{id}')
+def _get_events(server, ids, query, body, request):
+    _trigger(server, ids[0])
+    events = [
+        {'trigger_id': ids[0], 'timestamp': 1500000000 + i * 60, 'metric': 'metric',
+         'state': 'ERROR' if i % 2 else 'OK', 'old_state': 'OK' if i % 2 else 'ERROR'}
+        for i in range(EVENTS_PER_TRIGGER)
+    ]
+    page, size = int(query.get('p') or 0), int(query.get('size') or 100)
+    return 200, {'list': events[page * size:(page + 1) * size], 'page': page, 'size': size, 'total': len(events)}
+
+
+@route('DELETE', 'event/all')
+def _delete_events(server, ids, query, body, request):
+    return 200, None
+
+
+@route('GET', 'notification')
+def _get_notifications(server, ids, query, body, request):
+    notifications = server.data.notifications
+    start, end = int(query.get('start') or 0), int(query.get('end') or -1)
+    selected = notifications[start:] if end == -1 else notifications[start:end + 1]
+    return 200, {'list': selected, 'total': len(notifications)}
+
+
+@route('DELETE', 'notification')
+def _delete_notification(server, ids, query, body, request):
+    notifications = [item for item in server.data.notifications if item['id'] != query.get('id')]
+    removed = len(server.data.notifications) - len(notifications)
+    server.data.notifications = notifications
+    server.data.version += 1
+    # the client takes 0 for success
+    return 200, {'result': 0 if removed else -1}
+
+
+@route('DELETE', 'notification/all')
+def _delete_notifications(server, ids, query, body, request):
+    server.data.notifications = []
+    server.data.version += 1
+    return 200, None
+
+
+# health, config, user
+
+@route('GET', 'health/notifier')
+def _get_notifier_state(server, ids, query, body, request):
+    return 200, {'state': server.data.notifier_state}
+
+
+@route('PUT', 'health/notifier')
+def _set_notifier_state(server, ids, query, body, request):
+    _require(body, 'state')
+    server.data.notifier_state = body['state']
+    server.data.version += 1
+    return 200, {'state': body['state']}
+
+
+@route('GET', 'config')
+def _get_config(server, ids, query, body, request):
+    return 200, {'remoteAllowed': False, 'contacts': WEB_CONTACTS, 'supportEmail': 'support@example.com'}
+
+
+@route('GET', 'user')
+def _get_user(server, ids, query, body, request):
+    return 200, {'login': request.headers.get('X-Webauth-User') or server.data.login}
+
+
+@route('GET', 'user/settings')
+def _get_user_settings(server, ids, query, body, request):
+    return 200, {
+        'login': request.headers.get('X-Webauth-User') or server.data.login,
+        'contacts': [contact for contact in server.data.contacts.values() if not contact.get('team_id')],
+        'subscriptions': [item for item in server.data.subscriptions.values() if not item.get('team_id')],
+    }
+
+
+# teams
+
+def _team(server, team_id):
+    team = server.data.teams.get(team_id)
+    if team is None:
+        raise _not_found('team {}'.format(team_id))
+    return team
+
+
+@route('GET', 'teams')
+def _get_teams(server, ids, query, body, request):
+    return 200, {'teams': list(server.data.teams.values())}
+
+
+@route('POST', 'teams')
+def _create_team(server, ids, query, body, request):
+    _require(body, 'name')
+    return 200, {'id': server.data.add_team(body)['id']}
+
+
+@route('GET', 'teams/{id}')
+def _get_team(server, ids, query, body, request):
+    return 200, _team(server, ids[0])
+
+
+@route('PATCH', 'teams/{id}')
+def _update_team(server, ids, query, body, request):
+    _team(server, ids[0]).update(body)
+    server.data.version += 1
+    return 200, {'id': ids[0]}
+
+
+@route('DELETE', 'teams/{id}')
+def _delete_team(server, ids, query, body, request):
+    _team(server, ids[0])
+    server.data.delete('teams', ids[0])
+    server.data.delete('team_users', ids[0])
+    return 200, {'id': ids[0]}
+
+
+@route('GET', 'teams/{id}/users')
+def _get_team_users(server, ids, query, body, request):
+    _team(server, ids[0])
+    return 200, {'usernames': server.data.team_users[ids[0]]}
+
+
+@route('POST', 'teams/{id}/users')
+def _add_team_users(server, ids, query, body, request):
+    _require(body, 'usernames')
+    _team(server, ids[0])
+    users = server.data.team_users[ids[0]]
+    users.extend(name for name in body['usernames'] if name not in users)
+    server.data.version += 1
+    return 200, {'usernames': list(users)}
+
+
+@route('PUT', 'teams/{id}/users')
+def _set_team_users(server, ids, query, body, request):
+    _require(body, 'usernames')
+    _team(server, ids[0])
+    server.data.team_users[ids[0]] = list(body['usernames'])
+    server.data.version += 1
+    return 200, {'usernames': body['usernames']}
+
+
+@route('DELETE', 'teams/{id}/users/{id}')
+def _delete_team_user(server, ids, query, body, request):
+    _team(server, ids[0])
+    users = server.data.team_users[ids[0]]
+    if ids[1] not in users:
+        raise _not_found('user {}'.format(ids[1]))
+    users.remove(ids[1])
+    server.data.version += 1
+    return 200, {'usernames': list(users)}
+
+
+@route('GET', 'teams/{id}/settings')
+def _get_team_settings(server, ids, query, body, request):
+    _team(server, ids[0])
+    return 200, {
+        'team_id': ids[0],
+        'contacts': [contact for contact in server.data.contacts.values() if contact.get('team_id') == ids[0]],
+        'subscriptions': [item for item in server.data.subscriptions.values() if item.get('team_id') == ids[0]],
+    }
+
+
+@route('POST', 'teams/{id}/contacts')
+def _create_team_contact(server, ids, query, body, request):
+    _require(body, 'type', 'value')
+    _team(server, ids[0])
+    return 200, server.data.add_contact(dict(body, team_id=ids[0]))
+
+
+@route('POST', 'teams/{id}/subscriptions')
+def _create_team_subscription(server, ids, query, body, request):
+    _require(body, 'contacts')
+    _team(server, ids[0])
+    return 200, server.data.add_subscription(dict(body, team_id=ids[0]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a fake Moira API from memory')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--triggers', type=int, default=1000)
+    parser.add_argument('--subscriptions', type=int, default=100)
+    parser.add_argument('--contacts', type=int, default=10)
+    parser.add_argument('--notifications', type=int, default=0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--error-status', type=int, default=503)
+    args = parser.parse_args(argv)
+
+    data = MoiraData.generate(triggers=args.triggers, subscriptions=args.subscriptions, contacts=args.contacts,
+                              notifications=args.notifications, seed=args.seed)
+    server = FakeMoiraServer(data, host=args.host, port=args.port, latency=args.latency_ms / 1000,
+                             jitter=args.jitter_ms / 1000, error_rate=args.error_rate,
+                             error_status=args.error_status, seed=args.seed)
+    print('Fake Moira API with {} triggers at {}'.format(len(data.triggers), server.url))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+from importlib import import_module
+
+from .base import DEFAULT_POOL_CONNECTIONS
+from .base import DEFAULT_POOL_MAXSIZE
+from .base import HTTP2_PRIOR_KNOWLEDGE
+from .base import Response
+from .base import Transport
+from .base import TransportConnectionError
+from .base import TransportError
+from .base import TransportTimeout
+
+
+# backends are imported on first use, only the chosen HTTP library gets loaded
+TRANSPORTS = {
+    'requests': ('.requests', 'RequestsTransport'),
+    'urllib3': ('.urllib3', 'Urllib3Transport'),
+    'httpx': ('.httpx', 'HttpxTransport'),
+}
+
+
+def check_transport(transport, http2=False):
+    """
+    Validate transport options without importing the HTTP library
+
+    :param transport: 'requests', 'urllib3', 'httpx' or Transport object
+    :param http2: bool or HTTP2_PRIOR_KNOWLEDGE
+    :return: None
+
+    :raises: ValueError
+    """
+    if isinstance(transport, Transport):
+        return
+    if transport not in TRANSPORTS:
+        raise ValueError('Unknown transport "{}"'.format(transport))
+    if http2 and transport != 'httpx':
+        raise ValueError('http2 is only supported by the httpx transport')
+
+
+def get_transport(transport, pool_connections, pool_maxsize, idle_timeout=None, headers=None, http2=False):
+    """
+    Resolve HTTP transport
+
+    :param transport: 'requests', 'urllib3', 'httpx' or Transport object
+    :param pool_connections: int number of per-host connection pools to keep
+    :param pool_maxsize: int max number of keep-alive connections per host
+    :param idle_timeout: float seconds of inactivity after which pooled connections are dropped
+    :param headers: dict headers sent with every request
+    :param http2: bool or HTTP2_PRIOR_KNOWLEDGE, only supported by the httpx transport
+    :return: Transport
+
+    :raises: ValueError
+    :raises: ImportError
+    """
+    check_transport(transport, http2)
+    if isinstance(transport, Transport):
+        return transport
+    module, name = TRANSPORTS[transport]
+    cls = getattr(import_module(module, __name__), name)
+    if http2:
+        return cls(pool_connections, pool_maxsize, idle_timeout, headers, http2=http2)
+    return cls(pool_connections, pool_maxsize, idle_timeout, headers)
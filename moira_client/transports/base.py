@@ -0,0 +1,160 @@
+import threading
+import time
+
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# speak HTTP/2 without negotiation, the only way to use it over plain http://
+HTTP2_PRIOR_KNOWLEDGE = 'prior_knowledge'
+
+
+class TransportError(IOError):
+    """
+    Request failed without a response
+    """
+
+
+class TransportConnectionError(TransportError):
+    """
+    Connection could not be established or was dropped, the request may be retried
+    """
+
+
+class TransportTimeout(TransportError):
+    """
+    Server didn't answer in time, the request may be retried
+    """
+
+
+class Response:
+    """
+    Response contract shared by all transports
+    """
+    status_code = None
+    headers = None
+
+    @property
+    def content(self):
+        """
+        :return: bytes decompressed body, read on first access
+        """
+        raise NotImplementedError
+
+    @property
+    def wire_bytes(self):
+        """
+        :return: int body bytes read from the socket, i.e. before decompression, None if unknown
+        """
+        return None
+
+    def iter_content(self, chunk_size):
+        """
+        :param chunk_size: int bytes to read at a time
+        :return: generator of decompressed body chunks
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Release the connection, dropping it if the body has not been read to the end
+
+        :return: None
+        """
+
+
+class Transport:
+    """
+    Sends HTTP requests over a pool of keep-alive connections.
+
+    request() accepts headers, auth, params (dict), data (bytes), timeout (float) and stream (bool),
+    other keyword arguments are passed to the underlying HTTP library as is. Headers with None values
+    are not sent. Failures without a response are raised as TransportError.
+    """
+    name = None
+
+    def __init__(self, pool_connections, pool_maxsize, idle_timeout=None, headers=None):
+        """
+
+        :param pool_connections: int number of per-host connection pools to keep
+        :param pool_maxsize: int max number of keep-alive connections per host
+        :param idle_timeout: float seconds of inactivity after which pooled connections are dropped,
+            None to keep them until the transport is closed
+        :param headers: dict headers sent with every request
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self.headers = headers or {}
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._last_used = time.monotonic()
+
+    def create_auth(self, auth_user, auth_pass):
+        """
+        :param auth_user: str auth user
+        :param auth_pass: str auth password
+        :return: basic auth credentials in the form request() takes them
+        """
+        raise NotImplementedError
+
+    def request(self, method, url, headers=None, auth=None, **kwargs):
+        """
+        Send a request
+
+        :param method: str HTTP method
+        :param url: str URL
+        :param headers: dict request headers
+        :param auth: credentials returned by create_auth
+        :param kwargs: request parameters
+        :return: Response
+
+        :raises: TransportError
+        """
+        self._acquire()
+        try:
+            return self._request(method, url, headers, auth, **kwargs)
+        finally:
+            self._release()
+
+    def close(self):
+        """
+        Close all pooled connections, the transport stays usable
+
+        :return: None
+        """
+        raise NotImplementedError
+
+    def _request(self, method, url, headers, auth, **kwargs):
+        raise NotImplementedError
+
+    def _acquire(self):
+        if self.idle_timeout is None:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self._in_flight == 0 and now - self._last_used > self.idle_timeout:
+                # the server has most likely dropped our keep-alive sockets by now
+                self.close()
+            self._in_flight += 1
+            self._last_used = now
+
+    def _release(self):
+        if self.idle_timeout is None:
+            return
+        with self._lock:
+            self._in_flight -= 1
+            self._last_used = time.monotonic()
+
+    def __repr__(self):
+        return '{}(pool_connections={}, pool_maxsize={}, idle_timeout={})'.format(
+            type(self).__name__, self.pool_connections, self.pool_maxsize, self.idle_timeout)
+
+
+def drop_none(headers):
+    """
+    :param headers: dict request headers
+    :return: dict headers without None values
+    """
+    return {name: value for name, value in headers.items() if value is not None}
@@ -0,0 +1,282 @@
+from base64 import b64decode
+from base64 import b64encode
+from collections import namedtuple
+from urllib.parse import urlencode
+from urllib.parse import urlsplit
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from requests.structures import CaseInsensitiveDict
+
+from ..compression import ACCEPT_ENCODING
+from . import get_transport
+from .base import DEFAULT_POOL_CONNECTIONS
+from .base import DEFAULT_POOL_MAXSIZE
+from .base import Response
+from .base import Transport
+from .base import TransportError
+
+
+CASSETTE_VERSION = 1
+
+# replay every request after the time it took when it was recorded
+RECORDED_LATENCY = 'recorded'
+
+Interaction = namedtuple('Interaction', ['method', 'url', 'body_hash', 'status', 'headers', 'content',
+                                         'wire_bytes', 'elapsed'])
+
+
+class UnmatchedRequestError(TransportError):
+    def __init__(self, method, url):
+        """
+
+        :param method: str HTTP method
+        :param url: str request path and query
+        """
+        super().__init__('{} {} is not in the cassette'.format(method, url))
+        self.method = method
+        self.url = url
+
+
+def request_key(method, url, params=None, data=None, headers=None):
+    """
+    Key requests are matched by, independent of the API host
+
+    :param method: str HTTP method
+    :param url: str URL
+    :param params: dict query parameters
+    :param data: bytes request body
+    :param headers: dict request headers
+    :return: (str method, str path and query, str body hash or None)
+    """
+    parts = urlsplit(url)
+    query = parts.query
+    if params:
+        extra = urlencode(sorted((name, value) for name, value in params.items() if value is not None), doseq=True)
+        query = '{}&{}'.format(query, extra) if query else extra
+    path = parts.path + ('?' + query if query else '')
+    if not data:
+        return method, path, None
+    if headers and headers.get('Content-Encoding') == 'gzip':
+        # gzip headers carry a timestamp, hash what was compressed
+        data = gzip.decompress(data)
+    return method, path, hashlib.sha1(data).hexdigest()
+
+
+class Cassette:
+    """
+    Recorded request/response pairs, saved as gzipped JSON
+    """
+    def __init__(self, interactions=()):
+        """
+
+        :param interactions: iterable of Interaction
+        """
+        self.interactions = list(interactions)
+        self._lock = threading.Lock()
+
+    def add(self, interaction):
+        """
+        :param interaction: Interaction
+        :return: None
+        """
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self, path):
+        """
+        :param path: str file path
+        :return: None
+        """
+        with self._lock:
+            interactions = [_dump_interaction(interaction) for interaction in self.interactions]
+        document = {'version': CASSETTE_VERSION, 'interactions': interactions}
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(document, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        """
+        :param path: str file path
+        :return: Cassette
+
+        :raises: ValueError
+        """
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            document = json.load(f)
+        if document.get('version') != CASSETTE_VERSION:
+            raise ValueError('Unsupported cassette version {}'.format(document.get('version')))
+        return cls(_load_interaction(interaction) for interaction in document['interactions'])
+
+    def __len__(self):
+        return len(self.interactions)
+
+
+def _dump_interaction(interaction):
+    result = interaction._asdict()
+    try:
+        result['content'] = interaction.content.decode('utf-8')
+    except UnicodeDecodeError:
+        result['content'] = None
+        result['content_b64'] = b64encode(interaction.content).decode('ascii')
+    return result
+
+
+def _load_interaction(data):
+    content_b64 = data.pop('content_b64', None)
+    if content_b64 is not None:
+        data['content'] = b64decode(content_b64)
+    else:
+        data['content'] = data['content'].encode('utf-8')
+    return Interaction(**data)
+
+
+class ReplayResponse(Response):
+    def __init__(self, interaction):
+        """
+
+        :param interaction: Interaction
+        """
+        self.status_code = interaction.status
+        self.headers = CaseInsensitiveDict(interaction.headers)
+        self._interaction = interaction
+
+    @property
+    def content(self):
+        return self._interaction.content
+
+    @property
+    def wire_bytes(self):
+        return self._interaction.wire_bytes
+
+    def iter_content(self, chunk_size):
+        content = self._interaction.content
+        for start in range(0, len(content), chunk_size):
+            yield content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class RecordTransport(Transport):
+    """
+    Sends requests with another transport and records them into a cassette.
+    Streamed responses are read as a whole.
+    """
+    name = 'record'
+
+    def __init__(self, cassette, transport='requests', pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, idle_timeout=None):
+        """
+
+        :param cassette: Cassette interactions are added to
+        :param transport: transport name or Transport object requests are sent with
+        :param pool_connections: int number of per-host connection pools to keep
+        :param pool_maxsize: int max number of keep-alive connections per host
+        :param idle_timeout: float seconds of inactivity after which pooled connections are dropped
+        """
+        super().__init__(pool_connections, pool_maxsize)
+        self.cassette = cassette
+        self.transport = get_transport(transport, pool_connections, pool_maxsize, idle_timeout,
+                                       headers={'Accept-Encoding': ACCEPT_ENCODING})
+
+    def create_auth(self, auth_user, auth_pass):
+        return self.transport.create_auth(auth_user, auth_pass)
+
+    def close(self):
+        self.transport.close()
+
+    def _request(self, method, url, headers, auth, **kwargs):
+        _, path, body_hash = request_key(method, url, kwargs.get('params'), kwargs.get('data'), headers)
+        started = time.monotonic()
+        r = self.transport.request(method, url, headers=headers, auth=auth, **kwargs)
+        try:
+            content = r.content
+        finally:
+            r.close()
+        interaction = Interaction(
+            method=method, url=path, body_hash=body_hash, status=r.status_code, headers=dict(r.headers),
+            content=content, wire_bytes=r.wire_bytes, elapsed=time.monotonic() - started,
+        )
+        self.cassette.add(interaction)
+        return ReplayResponse(interaction)
+
+
+class ReplayTransport(Transport):
+    """
+    Answers requests from a cassette without network access.
+
+    Identical requests get their recorded responses in order, the last one is repeated once they
+    run out. Optional latency and bandwidth are simulated with sleeps; the bandwidth is one link
+    shared by concurrent requests, like a real connection to the API.
+    """
+    name = 'replay'
+
+    def __init__(self, cassette, latency=None, bandwidth=None):
+        """
+
+        :param cassette: Cassette to replay
+        :param latency: float seconds each request takes, RECORDED_LATENCY to take as long as when
+            recorded, None to answer right away
+        :param bandwidth: float bytes per second of request and response bodies, None for unlimited
+        """
+        super().__init__(pool_connections=1, pool_maxsize=1)
+        self.cassette = cassette
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.requests = 0
+        self._responses = {}
+        for interaction in cassette.interactions:
+            key = (interaction.method, interaction.url, interaction.body_hash)
+            self._responses.setdefault(key, []).append(interaction)
+        self._served = {}
+        self._link_free_at = 0.0
+
+    def create_auth(self, auth_user, auth_pass):
+        return auth_user, auth_pass
+
+    def close(self):
+        pass
+
+    def rewind(self):
+        """
+        Replay the cassette from the start
+
+        :return: None
+        """
+        with self._lock:
+            self._served.clear()
+            self._link_free_at = 0.0
+
+    def _request(self, method, url, headers, auth, **kwargs):
+        data = kwargs.get('data')
+        key = request_key(method, url, kwargs.get('params'), data, headers)
+        with self._lock:
+            interactions = self._responses.get(key)
+            if not interactions:
+                raise UnmatchedRequestError(key[0], key[1])
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+            self.requests += 1
+            interaction = interactions[min(served, len(interactions) - 1)]
+            delay = self._delay(interaction, len(data) if data else 0)
+        if delay > 0:
+            time.sleep(delay)
+        return ReplayResponse(interaction)
+
+    def _delay(self, interaction, sent_bytes):
+        if self.latency == RECORDED_LATENCY:
+            latency = interaction.elapsed
+        else:
+            latency = self.latency or 0.0
+        if not self.bandwidth:
+            return latency
+        now = time.monotonic()
+        received_bytes = interaction.wire_bytes if interaction.wire_bytes is not None else len(interaction.content)
+        # bodies are queued on the link after the latency, one after another
+        start = max(now + latency, self._link_free_at)
+        self._link_free_at = start + (sent_bytes + received_bytes) / self.bandwidth
+        return self._link_free_at - now
@@ -0,0 +1,188 @@
+import asyncio
+import threading
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from .base import HTTP2_PRIOR_KNOWLEDGE
+from .base import Response
+from .base import Transport
+from .base import TransportConnectionError
+from .base import TransportError
+from .base import TransportTimeout
+from .base import drop_none
+
+
+def _translate(error):
+    if isinstance(error, httpx.TimeoutException):
+        return TransportTimeout(error)
+    if isinstance(error, (httpx.NetworkError, httpx.RemoteProtocolError)):
+        return TransportConnectionError(error)
+    return TransportError(error)
+
+
+class HttpxResponse(Response):
+    def __init__(self, response):
+        """
+
+        :param response: httpx.Response
+        """
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self._response = response
+
+    @property
+    def content(self):
+        try:
+            return self._response.read()
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+
+    @property
+    def wire_bytes(self):
+        return self._response.num_bytes_downloaded
+
+    def iter_content(self, chunk_size):
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+
+    def close(self):
+        # responses of Http2Session are read and closed on the event loop already
+        if not self._response.is_closed:
+            self._response.close()
+
+
+class HttpxTransport(Transport):
+    """
+    httpx.Client for HTTP/1.1; with http2, a private event loop multiplexing requests of all threads
+    over a few HTTP/2 connections. HTTP/2 responses are always read as a whole, stream is ignored.
+    """
+    name = 'httpx'
+
+    def __init__(self, pool_connections, pool_maxsize, idle_timeout=None, headers=None, http2=False):
+        """
+
+        :param pool_connections: int number of per-host connection pools to keep, unused by httpx
+        :param pool_maxsize: int max number of keep-alive connections, with http2 max number of connections
+        :param idle_timeout: float seconds after which idle connections are dropped
+        :param headers: dict headers sent with every request
+        :param http2: bool negotiate HTTP/2 over https://, HTTP2_PRIOR_KNOWLEDGE to use it over http://
+        """
+        if httpx is None:
+            raise ImportError('httpx transport requires httpx, install moira-python-client[http2]')
+        super().__init__(pool_connections, pool_maxsize, idle_timeout, headers)
+        self.http2 = http2
+        self._session = self._create_session()
+
+    def create_auth(self, auth_user, auth_pass):
+        return httpx.BasicAuth(auth_user, auth_pass)
+
+    def close(self):
+        self._session.close()
+        if not self.http2:
+            # a closed httpx.Client can't send requests anymore
+            self._session = self._create_session()
+
+    def _request(self, method, url, headers, auth, data=None, stream=False, **kwargs):
+        headers = drop_none(headers or {})
+        if data is not None:
+            kwargs['content'] = data
+        try:
+            if stream and not self.http2:
+                request = self._session.build_request(method, url, headers=headers, **kwargs)
+                return HttpxResponse(self._session.send(request, auth=auth, stream=True))
+            return HttpxResponse(self._session.request(method, url, headers=headers, auth=auth, **kwargs))
+        except httpx.HTTPError as e:
+            raise _translate(e) from e
+
+    def _acquire(self):
+        # httpx expires idle connections on its own, see keepalive_expiry
+        pass
+
+    def _release(self):
+        pass
+
+    def _create_session(self):
+        if self.http2:
+            return Http2Session(
+                prior_knowledge=self.http2 == HTTP2_PRIOR_KNOWLEDGE, max_connections=self.pool_maxsize,
+                keepalive_expiry=self.idle_timeout, headers=self.headers,
+            )
+        limits = httpx.Limits(max_keepalive_connections=self.pool_maxsize, keepalive_expiry=self.idle_timeout)
+        return httpx.Client(limits=limits, timeout=None, headers=self.headers)
+
+
+class Http2Session:
+    """
+    Blocking facade over httpx.AsyncClient running on a private event loop thread.
+
+    httpx's blocking HTTP/2 connection is not safe to share between threads (stream ids may reach
+    the server out of order), the asyncio one multiplexes concurrent requests correctly.
+    """
+    def __init__(self, prior_knowledge=False, max_connections=None, keepalive_expiry=None, headers=None):
+        """
+
+        :param prior_knowledge: bool speak HTTP/2 without negotiation, needed for http:// URLs
+        :param max_connections: int max number of connections, each one multiplexes many requests
+        :param keepalive_expiry: float seconds after which idle connections are dropped
+        :param headers: dict headers sent with every request
+        """
+        self._client_kwargs = {
+            'http1': not prior_knowledge,
+            'http2': True,
+            'limits': httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            'timeout': None,
+            'headers': headers,
+        }
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._client = None
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request and wait for the response
+
+        :param method: str HTTP method
+        :param url: str URL
+        :param kwargs: httpx request parameters
+        :return: httpx.Response with the body read
+        """
+        loop = self._start()
+        return asyncio.run_coroutine_threadsafe(self._client.request(method, url, **kwargs), loop).result()
+
+    def close(self):
+        """
+        Close connections and stop the event loop thread, the next request starts them again
+
+        :return: None
+        """
+        with self._lock:
+            if self._loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = self._thread = self._client = None
+
+    def _start(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name='moira-http2', daemon=True)
+                thread.start()
+                self._client = asyncio.run_coroutine_threadsafe(self._create_client(), loop).result()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    async def _create_client(self):
+        return httpx.AsyncClient(**self._client_kwargs)
@@ -0,0 +1,85 @@
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+import requests
+
+from .base import Response
+from .base import Transport
+from .base import TransportConnectionError
+from .base import TransportError
+from .base import TransportTimeout
+
+
+# translated errors subclass the original requests exception, code catching those keeps working
+_TRANSLATED_ERRORS = {}
+
+
+def _translate(error):
+    cls = type(error)
+    translated = _TRANSLATED_ERRORS.get(cls)
+    if translated is None:
+        if isinstance(error, requests.exceptions.Timeout):
+            base = TransportTimeout
+        elif isinstance(error, requests.exceptions.ConnectionError):
+            base = TransportConnectionError
+        else:
+            base = TransportError
+        translated = _TRANSLATED_ERRORS[cls] = type(cls.__name__, (base, cls), {'__module__': __name__})
+    return translated(*error.args, request=error.request, response=error.response)
+
+
+class RequestsResponse(Response):
+    def __init__(self, response):
+        """
+
+        :param response: requests.Response
+        """
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self._response = response
+
+    @property
+    def content(self):
+        return self._response.content
+
+    @property
+    def wire_bytes(self):
+        raw = getattr(self._response, 'raw', None)
+        if raw is not None and hasattr(raw, 'tell'):
+            return raw.tell()
+        return None
+
+    def iter_content(self, chunk_size):
+        return self._response.iter_content(chunk_size)
+
+    def close(self):
+        self._response.close()
+
+
+class RequestsTransport(Transport):
+    """
+    requests.Session, the most featureful and the slowest stack: proxies from the environment,
+    .netrc, redirects, cookies
+    """
+    name = 'requests'
+
+    def __init__(self, pool_connections, pool_maxsize, idle_timeout=None, headers=None):
+        super().__init__(pool_connections, pool_maxsize, idle_timeout, headers)
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+    def create_auth(self, auth_user, auth_pass):
+        return HTTPBasicAuth(auth_user, auth_pass)
+
+    def close(self):
+        self._session.close()
+
+    def _request(self, method, url, headers, auth, **kwargs):
+        try:
+            return RequestsResponse(self._session.request(method, url, headers=headers, auth=auth, **kwargs))
+        except TransportError:
+            raise
+        except requests.exceptions.RequestException as e:
+            raise _translate(e) from e
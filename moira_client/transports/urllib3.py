@@ -0,0 +1,96 @@
+from urllib.parse import urlencode
+
+import urllib3
+from urllib3.exceptions import HTTPError
+from urllib3.exceptions import NewConnectionError
+from urllib3.exceptions import ProtocolError
+from urllib3.exceptions import ProxyError
+from urllib3.exceptions import SSLError
+from urllib3.exceptions import TimeoutError
+
+from .base import Response
+from .base import Transport
+from .base import TransportConnectionError
+from .base import TransportError
+from .base import TransportTimeout
+from .base import drop_none
+
+
+def _translate(error):
+    # NewConnectionError is a ConnectTimeoutError in urllib3 2.x, check it first
+    if isinstance(error, (NewConnectionError, ProtocolError, ProxyError, SSLError)):
+        return TransportConnectionError(error)
+    if isinstance(error, TimeoutError):
+        return TransportTimeout(error)
+    return TransportError(error)
+
+
+class Urllib3Response(Response):
+    def __init__(self, response, consumed):
+        """
+
+        :param response: urllib3.BaseHTTPResponse
+        :param consumed: bool whether the body has been read already
+        """
+        self.status_code = response.status
+        self.headers = response.headers
+        self._response = response
+        self._consumed = consumed
+
+    @property
+    def content(self):
+        try:
+            content = self._response.data
+        except HTTPError as e:
+            raise _translate(e) from e
+        self._consumed = True
+        return content
+
+    @property
+    def wire_bytes(self):
+        return self._response.tell()
+
+    def iter_content(self, chunk_size):
+        try:
+            yield from self._response.stream(chunk_size)
+        except HTTPError as e:
+            raise _translate(e) from e
+        self._consumed = True
+
+    def close(self):
+        if not self._consumed:
+            # unread bytes would be taken for the next response, drop the connection
+            self._response.close()
+        self._response.release_conn()
+
+
+class Urllib3Transport(Transport):
+    """
+    Bare urllib3 connection pools, the lowest per-request overhead.
+    Redirects are not followed, proxies are not read from the environment.
+    """
+    name = 'urllib3'
+
+    def __init__(self, pool_connections, pool_maxsize, idle_timeout=None, headers=None):
+        super().__init__(pool_connections, pool_maxsize, idle_timeout, headers)
+        self._pool = urllib3.PoolManager(num_pools=pool_connections, maxsize=pool_maxsize)
+
+    def create_auth(self, auth_user, auth_pass):
+        return urllib3.util.make_headers(basic_auth='{}:{}'.format(auth_user, auth_pass))
+
+    def close(self):
+        self._pool.clear()
+
+    def _request(self, method, url, headers, auth, params=None, data=None, stream=False, **kwargs):
+        if params:
+            query = urlencode([(name, value) for name, value in params.items() if value is not None], doseq=True)
+            url += ('&' if '?' in url else '?') + query
+        headers = dict(self.headers, **drop_none(headers or {}))
+        if auth:
+            headers.update(auth)
+        try:
+            response = self._pool.urlopen(method, url, body=data, headers=headers, retries=False, redirect=False,
+                                          preload_content=not stream, **kwargs)
+        except HTTPError as e:
+            raise _translate(e) from e
+        return Urllib3Response(response, consumed=not stream)
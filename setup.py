@@ -29,6 +29,10 @@ setup(
         'moira_client.models.team.settings',
         'moira_client.models.team.subscription',
         'moira_client.models.team.user',
+        'moira_client.aio',
+        'moira_client.aio.models',
+        'moira_client.testing',
+        'moira_client.transports',
     ],
     classifiers=[
         'Development Status :: 4 - Beta',
@@ -49,5 +53,11 @@ setup(
         "License :: OSI Approved :: MIT License"
     ],
     url='https://github.com/moira-alert/python-moira-client',
-    install_requires=required
+    install_requires=required,
+    extras_require={
+        'async': ['httpx'],
+        'http2': ['httpx[http2]'],
+        'orjson': ['orjson'],
+        'ujson': ['ujson'],
+    }
 )
@@ -0,0 +1,220 @@
+import asyncio
+import unittest
+try:
+    from unittest.mock import AsyncMock, patch
+except ImportError:
+    from mock import AsyncMock, patch
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from moira_client.client import InvalidJSONError
+from moira_client.client import MoiraApiError
+from moira_client.transports import TransportConnectionError
+from moira_client.transports import TransportError
+from moira_client.transports import TransportTimeout
+
+TEST_API_URL = 'http://test/api/url'
+
+
+def _response(status_code, content):
+    return httpx.Response(status_code, content=content, request=httpx.Request('GET', TEST_API_URL))
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+class AsyncClientTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        from moira_client.aio import AsyncClient
+        self.client = AsyncClient(TEST_API_URL, login='login')
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_get(self):
+        response = _response(200, b'{"list": []}')
+
+        with patch.object(self.client._session, 'request', new=AsyncMock(return_value=response)) as mock_request:
+            result = await self.client.get('trigger', params={'page': 1})
+
+        self.assertEqual({'list': []}, result)
+        mock_request.assert_called_with(
+            'GET', TEST_API_URL + '/trigger', headers=self.client.headers, auth=None, params={'page': 1})
+
+    async def test_put(self):
+        response = _response(200, b'{"id": "1"}')
+        data = {'name': 'trigger'}
+
+        with patch.object(self.client._session, 'request', new=AsyncMock(return_value=response)) as mock_request:
+            result = await self.client.put('trigger', json=data)
+
+        self.assertEqual({'id': '1'}, result)
+        self.assertEqual('PUT', mock_request.call_args[0][0])
+        self.assertEqual(b'{"name":"trigger"}', mock_request.call_args[1]['content'])
+
+    async def test_api_error(self):
+        response = _response(500, b'error')
+
+        with patch.object(self.client._session, 'request', new=AsyncMock(return_value=response)):
+            with self.assertRaises(MoiraApiError) as ctx:
+                await self.client.get('trigger')
+
+        self.assertEqual(b'error', ctx.exception.body)
+
+    async def test_invalid_json(self):
+        response = _response(200, b'')
+
+        with patch.object(self.client._session, 'request', new=AsyncMock(return_value=response)):
+            with self.assertRaises(InvalidJSONError) as ctx:
+                await self.client.delete('trigger/1')
+
+        self.assertEqual(b'', ctx.exception.content)
+
+    async def test_none_headers_are_not_sent(self):
+        from moira_client.aio import AsyncClient
+        client = AsyncClient(TEST_API_URL)
+        response = _response(200, b'{}')
+
+        with patch.object(client._session, 'request', new=AsyncMock(return_value=response)) as mock_request:
+            await client.get('config')
+
+        self.assertNotIn('X-Webauth-User', mock_request.call_args[1]['headers'])
+        await client.close()
+
+    async def test_retry(self):
+        from moira_client.aio import AsyncClient
+        from moira_client.retry import RetryPolicy
+        client = AsyncClient(TEST_API_URL, retry=RetryPolicy(total=2))
+        responses = [httpx.ConnectError('refused'), _response(503, b''), _response(200, b'{"list": []}')]
+
+        with patch.object(client._session, 'request', new=AsyncMock(side_effect=responses)) as mock_request, \
+                patch('moira_client.aio.client.asyncio.sleep', new=AsyncMock()):
+            result = await client.get('trigger')
+
+        self.assertEqual({'list': []}, result)
+        self.assertEqual(3, mock_request.call_count)
+        await client.close()
+
+    async def test_errors_are_translated(self):
+        cases = [
+            (httpx.ConnectError('refused'), TransportConnectionError),
+            (httpx.ReadTimeout('timeout'), TransportTimeout),
+            (httpx.UnsupportedProtocol('ftp'), TransportError),
+        ]
+        for error, expected in cases:
+            with self.subTest(error=error), \
+                    patch.object(self.client._session, 'request', new=AsyncMock(side_effect=error)):
+                with self.assertRaises(expected):
+                    await self.client.get('trigger')
+
+    async def test_does_not_retry_create_after_read_timeout(self):
+        from moira_client.aio import AsyncClient
+        from moira_client.retry import RetryPolicy
+        client = AsyncClient(TEST_API_URL, retry=RetryPolicy(total=2))
+
+        with patch.object(client._session, 'request', new=AsyncMock(side_effect=httpx.ReadTimeout('timeout'))) \
+                as mock_request, patch('moira_client.aio.client.asyncio.sleep', new=AsyncMock()):
+            with self.assertRaises(TransportTimeout):
+                await client.put('trigger', json={})
+
+        self.assertEqual(1, mock_request.call_count)
+        await client.close()
+
+    async def test_concurrent_gets_are_coalesced(self):
+        from moira_client.aio import AsyncClient
+        client = AsyncClient(TEST_API_URL, coalesce=True)
+
+        async def request(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return _response(200, b'{"list": []}')
+
+        with patch.object(client._session, 'request', new=AsyncMock(side_effect=request)) as mock_request:
+            results = await asyncio.gather(*[client.get('trigger') for _ in range(3)])
+
+        self.assertEqual([{'list': []}] * 3, results)
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(2, client.single_flight.coalesced)
+        await client.close()
+
+    async def test_rate_limit(self):
+        from moira_client.aio import AsyncClient
+        from moira_client.ratelimit import RateLimiter
+        client = AsyncClient(TEST_API_URL, rate_limiter=RateLimiter(rate=1, burst=1))
+
+        with patch.object(client._session, 'request', new=AsyncMock(return_value=_response(200, b'{}'))), \
+                patch('moira_client.aio.client.asyncio.sleep', new=AsyncMock()) as sleep_mock:
+            await client.get('trigger')
+            await client.get('trigger')
+
+        self.assertEqual(1, sleep_mock.call_count)
+        await client.close()
+
+    async def test_hedging_cancels_slow_attempt(self):
+        from moira_client.aio import AsyncClient
+        from moira_client.hedging import HedgePolicy
+        client = AsyncClient(TEST_API_URL, hedging=HedgePolicy(delay=0.01))
+        cancelled = []
+
+        async def request(*args, **kwargs):
+            if not cancelled:
+                cancelled.append(False)
+                try:
+                    await asyncio.sleep(5)
+                except asyncio.CancelledError:
+                    cancelled[0] = True
+                    raise
+            return _response(200, b'{"id": "1"}')
+
+        with patch.object(client._session, 'request', new=AsyncMock(side_effect=request)) as mock_request:
+            result = await client.get('trigger/1')
+            await asyncio.sleep(0)
+
+        self.assertEqual({'id': '1'}, result)
+        self.assertEqual(2, mock_request.call_count)
+        self.assertEqual([True], cancelled)
+        self.assertEqual(1, client.hedging.hedge_wins)
+        await client.close()
+
+    async def test_hooks(self):
+        from moira_client.aio import AsyncClient
+        from moira_client.metrics import LatencyHistogram
+        histogram = LatencyHistogram()
+        client = AsyncClient(TEST_API_URL, hooks=histogram.hooks())
+
+        with patch.object(client._session, 'request', new=AsyncMock(return_value=_response(200, b'{}'))):
+            await client.get('event/1')
+
+        self.assertEqual(1, histogram.stats()[('GET', 'event/{id}')].count)
+        await client.close()
+
+    async def test_iter_list(self):
+        response = httpx.Response(200, content=b'{"list": [{"id": "1"}, {"id": "2"}]}',
+                                  request=httpx.Request('GET', TEST_API_URL))
+
+        with patch.object(self.client._session, 'send', new=AsyncMock(return_value=response)) as mock_send:
+            result = [item async for item in self.client.iter_list('trigger', params={'p': 0})]
+
+        self.assertEqual([{'id': '1'}, {'id': '2'}], result)
+        self.assertTrue(mock_send.call_args[1]['stream'])
+        self.assertEqual('p=0', mock_send.call_args[0][0].url.query.decode())
+
+    async def test_iter_list_api_error(self):
+        response = httpx.Response(500, content=b'error', request=httpx.Request('GET', TEST_API_URL))
+
+        with patch.object(self.client._session, 'send', new=AsyncMock(return_value=response)):
+            with self.assertRaises(MoiraApiError):
+                [item async for item in self.client.iter_list('trigger')]
+
+    async def test_iter_list_read_error(self):
+        class Stream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b'{"list": ['
+                raise httpx.ReadError('reset')
+
+        response = httpx.Response(200, stream=Stream(), request=httpx.Request('GET', TEST_API_URL))
+
+        with patch.object(self.client._session, 'send', new=AsyncMock(return_value=response)):
+            with self.assertRaises(TransportConnectionError):
+                [item async for item in self.client.iter_list('trigger')]
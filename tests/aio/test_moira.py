@@ -0,0 +1,210 @@
+import asyncio
+import unittest
+try:
+    from unittest.mock import AsyncMock, patch
+except ImportError:
+    from mock import AsyncMock, patch
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from moira_client.client import MoiraApiError
+from moira_client.client import ResponseStructureError
+from moira_client.models.config import Config
+from moira_client.models.subscription import Subscription
+from moira_client.models.team import TeamModel
+from moira_client.models.trigger import Trigger
+
+TEST_API_URL = 'http://test/url'
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+class AsyncMoiraTest(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        from moira_client.aio import AsyncMoira
+        self.moira = AsyncMoira(TEST_API_URL)
+        self.client = self.moira._client
+
+    async def asyncTearDown(self):
+        await self.moira.close()
+
+    async def test_trigger_fetch_all(self):
+        triggers = {'list': [{'id': '1', 'name': 'name', 'tags': ['tag'], 'targets': ['target']}]}
+
+        with patch.object(self.client, 'get', new=AsyncMock(return_value=triggers)) as get_mock:
+            result = await self.moira.trigger.fetch_all()
+
+        get_mock.assert_called_with('trigger')
+        self.assertIsInstance(result[0], Trigger)
+        self.assertEqual('1', result[0].id)
+
+    async def test_trigger_fetch_all_bad_response(self):
+        with patch.object(self.client, 'get', new=AsyncMock(return_value={})):
+            with self.assertRaises(ResponseStructureError):
+                await self.moira.trigger.fetch_all()
+
+    async def test_trigger_save_new(self):
+        trigger = self.moira.trigger.create('Name', ['tag'], ['target'])
+
+        with patch.object(self.client, 'get', new=AsyncMock(return_value={'list': []})), \
+                patch.object(self.client, 'put', new=AsyncMock(return_value={'id': '1'})) as put_mock:
+            result = await self.moira.trigger.save(trigger)
+
+        self.assertEqual('trigger?validate', put_mock.call_args[0][0])
+        self.assertEqual('1', result['id'])
+        self.assertEqual('1', trigger.id)
+
+    async def test_trigger_save_existing(self):
+        existing = {'id': '1', 'name': 'Name', 'tags': ['tag'], 'targets': ['target']}
+        state = {'state': 'OK', 'trigger_id': '1'}
+        trigger = self.moira.trigger.create('Name', ['tag'], ['target'])
+
+        with patch.object(self.client, 'get', new=AsyncMock(side_effect=[{'list': [existing]}, state, existing])), \
+                patch.object(self.client, 'put', new=AsyncMock(return_value={'id': '1'})) as put_mock:
+            await self.moira.trigger.save(trigger)
+
+        self.assertEqual('trigger/1?validate', put_mock.call_args[0][0])
+        self.assertEqual('1', put_mock.call_args[1]['json']['id'])
+
+    async def test_trigger_upsert_missing(self):
+        trigger = self.moira.trigger.create(id='1', name='Name', tags=['tag'], targets=['target'])
+
+        with patch.object(self.client, 'get', new=AsyncMock()) as get_mock, \
+                patch.object(self.client, 'put',
+                             new=AsyncMock(side_effect=[MoiraApiError(b'', 404), {'id': '2'}])) as put_mock:
+            await self.moira.trigger.save(trigger, upsert=True)
+
+        self.assertFalse(get_mock.called)
+        self.assertEqual(['trigger/1?validate', 'trigger?validate'], [call[0][0] for call in put_mock.call_args_list])
+        self.assertEqual('2', trigger.id)
+
+    async def test_trigger_fetch_many(self):
+        async def get(path):
+            if path == 'trigger/missing':
+                raise MoiraApiError(b'', 404)
+            return {'id': '1', 'name': 'Name', 'tags': ['tag'], 'targets': ['target']}
+
+        with patch.object(self.client, 'get', new=AsyncMock(side_effect=get)) as get_mock:
+            result = await self.moira.trigger.fetch_many(['1', 'missing', '1'], concurrency=2)
+
+        self.assertEqual(2, get_mock.call_count)
+        self.assertEqual('1', result['1'].id)
+        self.assertIsNone(result['missing'])
+
+    async def test_trigger_fetch_many_check_state_missing(self):
+        with patch.object(self.client, 'get', new=AsyncMock(side_effect=MoiraApiError(b'', 404))):
+            result = await self.moira.trigger.fetch_many(['missing'], check_state=True)
+
+        self.assertEqual({'missing': None}, result)
+
+    async def test_trigger_fetch_many_cancels_other_fetches_on_error(self):
+        cancelled = []
+
+        async def get(path):
+            if path == 'trigger/bad':
+                raise MoiraApiError(b'', 500)
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(path)
+                raise
+
+        with patch.object(self.client, 'get', new=AsyncMock(side_effect=get)):
+            with self.assertRaises(MoiraApiError):
+                await asyncio.wait_for(self.moira.trigger.fetch_many(['1', 'bad', '2'], concurrency=3), 5)
+
+        self.assertEqual(['trigger/1', 'trigger/2'], sorted(cancelled))
+
+    async def test_trigger_get_non_existent(self):
+        existing = {'id': '1', 'name': 'Name', 'tags': ['a', 'b'], 'targets': ['target']}
+        triggers = [
+            self.moira.trigger.create('Name', ['b', 'a'], ['target']),
+            self.moira.trigger.create('Name', ['a'], ['target']),
+        ]
+
+        with patch.object(self.client, 'get', new=AsyncMock(return_value={'list': [existing]})):
+            missing = await self.moira.trigger.get_non_existent(triggers)
+            diff = await self.moira.trigger.diff(triggers)
+            exists = await self.moira.trigger.is_exist(triggers[0])
+            found = await self.moira.trigger.check_exists(triggers[1])
+
+        self.assertEqual([triggers[1]], missing)
+        self.assertEqual([(triggers[0], '1')], [(trigger, moira_trigger.id) for trigger, moira_trigger in diff.matched])
+        self.assertEqual([], diff.server_only)
+        self.assertTrue(exists)
+        self.assertIsNone(found)
+
+    async def test_subscription_save(self):
+        subscription = self.moira.subscription.create(['tag'], ['contact'])
+
+        with patch.object(self.client, 'put', new=AsyncMock(return_value={'id': '1'})) as put_mock:
+            result = await self.moira.subscription.save(subscription)
+
+        put_mock.assert_called_with('subscription', json=subscription._payload())
+        self.assertEqual('1', result)
+        self.assertIsInstance(subscription, Subscription)
+
+    async def test_config_fetch(self):
+        config = {'remoteAllowed': True, 'contacts': [{'type': 'mail', 'label': 'E-mail'}]}
+
+        with patch.object(self.client, 'get', new=AsyncMock(return_value=config)):
+            result = await self.moira.config.fetch()
+
+        self.assertIsInstance(result, Config)
+        self.assertEqual('mail', result.contacts[0].type)
+
+    async def test_team_get(self):
+        team = {'id': '1', 'name': 'name', 'description': 'description'}
+
+        with patch.object(self.client, 'get', new=AsyncMock(return_value=team)) as get_mock:
+            result = await self.moira.team.get('1')
+
+        get_mock.assert_called_with('teams/1')
+        self.assertIsInstance(result, TeamModel)
+
+    async def test_team_user_get(self):
+        with patch.object(self.client, 'get', new=AsyncMock(return_value={'usernames': ['user']})) as get_mock:
+            result = await self.moira.team.user.get('1')
+
+        get_mock.assert_called_with('teams/1/users')
+        self.assertEqual(['user'], result.usernames)
+
+    async def test_profile(self):
+        responses = [
+            httpx.Response(200, content=b'{"list": []}', request=httpx.Request('GET', TEST_API_URL)),
+            httpx.Response(200, content=b'{"id": "1"}', request=httpx.Request('PUT', TEST_API_URL)),
+        ]
+        trigger = self.moira.trigger.create('Name', ['tag'], ['target'])
+
+        with patch.object(self.client._session, 'request', new=AsyncMock(side_effect=responses)):
+            with self.moira.profile() as profiler:
+                await self.moira.trigger.save(trigger)
+
+        report = profiler.report()
+        self.assertEqual(['AsyncTriggerManager.save'], [operation.operation for operation in report])
+        self.assertEqual({'GET trigger': 1, 'PUT trigger': 1}, report[0].endpoints)
+
+    async def test_profile_fetch_many(self):
+        def respond(*args, **kwargs):
+            content = b'{"id": "1", "name": "Name", "tags": ["tag"], "targets": ["target"]}'
+            return httpx.Response(200, content=content, request=httpx.Request('GET', TEST_API_URL))
+
+        with patch.object(self.client._session, 'request', new=AsyncMock(side_effect=respond)):
+            with self.moira.profile() as profiler:
+                await self.moira.trigger.fetch_many(['1', '2'])
+
+        report = profiler.report()
+        self.assertEqual(['AsyncTriggerManager.fetch_many'], [operation.operation for operation in report])
+        self.assertEqual({'GET trigger/{id}': 2}, report[0].endpoints)
+
+    async def test_trigger_iter_all(self):
+        async def iter_list(path, **kwargs):
+            yield {'id': '1', 'name': 'name', 'tags': ['tag'], 'targets': ['target']}
+
+        with patch.object(self.client, 'iter_list', new=iter_list):
+            result = [trigger async for trigger in self.moira.trigger.iter_all()]
+
+        self.assertEqual(['1'], [trigger.id for trigger in result])
@@ -39,6 +39,16 @@ class NotificationTest(ModelTest):
         self.assertTrue(get_mock.called)
         get_mock.assert_called_with('notification', params=params)
 
+    def test_iter_all(self):
+        client = Client(self.api_url)
+        notification_manager = NotificationManager(client)
+
+        with patch.object(client, 'iter_list', return_value=iter([{'id': '1'}])) as iter_list_mock:
+            result = list(notification_manager.iter_all())
+
+        iter_list_mock.assert_called_with('notification', params={'start': 0, 'end': -1})
+        self.assertEqual([{'id': '1'}], result)
+
     def test_delete_all(self):
         client = Client(self.api_url)
         notification_manager = NotificationManager(client)
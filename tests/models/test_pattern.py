@@ -35,6 +35,18 @@ class PatternTest(ModelTest):
         self.assertTrue(get_mock.called)
         get_mock.assert_called_with('pattern')
 
+    def test_iter_all(self):
+        client = Client(self.api_url)
+        pattern_manager = PatternManager(client)
+        patterns = [{'pattern': 'a.b', 'metrics': [], 'triggers': [{'id': '1', 'name': 'n', 'tags': [], 'targets': []}]}]
+
+        with patch.object(client, 'iter_list', return_value=iter(patterns)) as iter_list_mock:
+            result = list(pattern_manager.iter_all())
+
+        iter_list_mock.assert_called_with('pattern')
+        self.assertEqual('a.b', result[0].pattern)
+        self.assertEqual('1', result[0].triggers[0].id)
+
     def test_delete(self):
         client = Client(self.api_url)
         pattern_manager = PatternManager(client)
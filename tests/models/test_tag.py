@@ -104,7 +104,6 @@ class TagTest(ModelTest):
             self.assertEqual(1, len(stats[0].subscriptions))
             self.assertEqual(subscription_id, stats[0].subscriptions[0].id)
 
-
     def test_fetch_assigned_triggers(self):
         client = Client(self.api_url)
         tag_manager = TagManager(client)
@@ -1,13 +1,18 @@
 try:
     from unittest.mock import Mock
+    from unittest.mock import call
     from unittest.mock import patch
 except ImportError:
     from mock import Mock
+    from mock import call
     from mock import patch
 
 from moira_client.client import Client
 from moira_client.client import InvalidJSONError
+from moira_client.client import MoiraApiError
 from moira_client.client import ResponseStructureError
+from moira_client.models.trigger import Trigger
+from moira_client.models.trigger import TriggerIndex
 from moira_client.models.trigger import TriggerManager
 from .test_model import ModelTest
 
@@ -36,6 +41,17 @@ class TriggerTest(ModelTest):
         self.assertTrue(get_mock.called)
         get_mock.assert_called_with('trigger')
 
+    def test_iter_all(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        triggers = [{'id': '1', 'name': 'name', 'tags': ['tag'], 'targets': ['target']}]
+
+        with patch.object(client, 'iter_list', return_value=iter(triggers)) as iter_list_mock:
+            result = list(trigger_manager.iter_all())
+
+        iter_list_mock.assert_called_with('trigger')
+        self.assertEqual(['1'], [trigger.id for trigger in result])
+
     def test_delete_fail(self):
         client = Client(self.api_url)
         trigger_manager = TriggerManager(client)
@@ -199,3 +215,337 @@ class TriggerTest(ModelTest):
                 self.assertTrue(put_mock.called)
                 self.assertEqual(put_mock.call_args[0][0], 'trigger/{}?{}'.format(trigger_id, self.QUERY_PARAM_VALIDATE_FLAG))
                 self.assertEqual(result['id'], trigger_id)
+
+    def test_upsert_existing_trigger(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        trigger = trigger_manager.create(id='1', name='Name', tags=['tag'], targets=['target'])
+
+        with patch.object(client, 'get') as get_mock, \
+                patch.object(client, 'put', return_value={'id': '1'}) as put_mock:
+            result = trigger.update(upsert=True)
+
+        self.assertFalse(get_mock.called)
+        put_mock.assert_called_once()
+        self.assertEqual('trigger/1?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), put_mock.call_args[0][0])
+        self.assertEqual('1', result['id'])
+
+    def test_upsert_creates_missing_trigger(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        trigger = trigger_manager.create(id='1', name='Name', tags=['tag'], targets=['target'])
+
+        with patch.object(client, 'put', side_effect=[MoiraApiError(b'', 404), {'id': '2'}]) as put_mock:
+            trigger.save(upsert=True)
+
+        self.assertEqual('trigger?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), put_mock.call_args[0][0])
+        self.assertEqual('1', put_mock.call_args[1]['json']['id'])
+        self.assertEqual('2', trigger.id)
+
+    def test_upsert_raises_other_errors(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        trigger = trigger_manager.create(id='1', name='Name', tags=['tag'], targets=['target'])
+
+        with patch.object(client, 'put', side_effect=MoiraApiError(b'invalid', 400)) as put_mock:
+            with self.assertRaises(MoiraApiError):
+                trigger.update(upsert=True)
+
+        self.assertEqual(1, put_mock.call_count)
+
+    def test_fetch_many(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        progress = []
+
+        def get(path):
+            if path == 'trigger/missing':
+                raise MoiraApiError(b'', 404)
+            return {'id': path.split('/')[1], 'name': 'Name', 'tags': ['tag'], 'targets': ['target']}
+
+        with patch.object(client, 'get', side_effect=get) as get_mock:
+            result = trigger_manager.fetch_many(['1', 'missing', '2', '1'], concurrency=2,
+                                                progress=lambda done, total: progress.append((done, total)))
+
+        self.assertEqual(3, get_mock.call_count)
+        self.assertEqual(['1', 'missing', '2'], list(result))
+        self.assertEqual('2', result['2'].id)
+        self.assertIsNone(result['missing'])
+        self.assertEqual([(1, 3), (2, 3), (3, 3)], sorted(progress))
+
+    def test_fetch_many_check_state(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        trigger = {'id': '1', 'name': 'Name', 'tags': ['tag'], 'targets': ['target']}
+
+        with patch.object(client, 'get', side_effect=[{'state': 'OK', 'trigger_id': '1'}, trigger]) as get_mock:
+            result = trigger_manager.fetch_many(['1'], concurrency=1, check_state=True)
+
+        self.assertEqual('trigger/1/state', get_mock.call_args_list[0][0][0])
+        self.assertEqual('1', result['1'].id)
+
+    def test_fetch_many_check_state_missing(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+
+        with patch.object(client, 'get', side_effect=MoiraApiError(b'', 404)):
+            result = trigger_manager.fetch_many(['missing'], concurrency=1, check_state=True)
+
+        self.assertEqual({'missing': None}, result)
+
+    def test_fetch_many_raises_other_errors(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+
+        with patch.object(client, 'get', side_effect=MoiraApiError(b'', 500)):
+            with self.assertRaises(MoiraApiError):
+                trigger_manager.fetch_many(['1', '2', '3'], concurrency=1)
+
+    def test_get_non_existent(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        existing = {'id': '1', 'name': 'Name', 'tags': ['a', 'b'], 'targets': ['target']}
+        triggers = [
+            trigger_manager.create('Name', ['b', 'a'], ['target']),
+            trigger_manager.create('Name', ['a'], ['target']),
+            trigger_manager.create('Other', ['a', 'b'], ['target']),
+        ]
+
+        with patch.object(client, 'get', return_value={'list': [existing]}) as get_mock:
+            result = trigger_manager.get_non_existent(triggers)
+
+        get_mock.assert_called_once_with('trigger')
+        self.assertEqual([id(trigger) for trigger in triggers[1:]], [id(trigger) for trigger in result])
+
+    def test_diff(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        existing = [
+            {'id': '1', 'name': 'Name', 'tags': ['tag'], 'targets': ['target']},
+            {'id': '2', 'name': 'Server only', 'tags': ['tag'], 'targets': ['target']},
+        ]
+        same = trigger_manager.create('Name', ['tag'], ['target'])
+        new = trigger_manager.create('New', ['tag'], ['target'])
+
+        with patch.object(client, 'get', return_value={'list': existing}):
+            diff = trigger_manager.diff([same, new, same])
+
+        self.assertEqual([id(new)], [id(trigger) for trigger in diff.missing])
+        self.assertEqual([(id(same), '1'), (id(same), '1')],
+                         [(id(trigger), moira_trigger.id) for trigger, moira_trigger in diff.matched])
+        self.assertEqual(['2'], [trigger.id for trigger in diff.server_only])
+
+    def test_bulk_save(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        existing = [
+            {'id': '1', 'name': 'Same', 'tags': ['tag'], 'targets': ['target']},
+            {'id': '2', 'name': 'Changed', 'tags': ['tag'], 'targets': ['target']},
+        ]
+        same = trigger_manager.create('Same', ['tag'], ['target'])
+        changed = trigger_manager.create('Changed', ['tag'], ['target'], desc='new')
+        new = trigger_manager.create('New', ['tag'], ['target'])
+        duplicate = trigger_manager.create('New', ['tag'], ['target'])
+        failing = trigger_manager.create('Failing', ['tag'], ['target'])
+
+        def put(path, json):
+            if json['name'] == 'Failing':
+                raise MoiraApiError(b'invalid', 400)
+            return {'id': json.get('id', '3')}
+
+        with patch.object(client, 'get', return_value={'list': existing}) as get_mock, \
+                patch.object(client, 'put', side_effect=put) as put_mock:
+            report = trigger_manager.bulk_save([same, changed, new, failing, duplicate], concurrency=2)
+
+        self.assertEqual(1, get_mock.call_count)
+        self.assertEqual(3, put_mock.call_count)
+        self.assertEqual([duplicate], report.created)
+        self.assertEqual([changed], report.updated)
+        self.assertEqual([same], report.unchanged)
+        self.assertEqual([], report.deleted)
+        self.assertEqual([failing], [trigger for trigger, _ in report.failed])
+        self.assertEqual(400, report.failed[0][1].status_code)
+        self.assertEqual([new], report.skipped)
+        self.assertEqual('1', same.id)
+        self.assertEqual('3', duplicate.id)
+        update = call('trigger/2?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), json=dict(changed._payload(), id='2'))
+        self.assertIn(update, put_mock.call_args_list)
+
+    def test_bulk_delete(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+
+        def delete(path):
+            if path == 'trigger/2':
+                raise MoiraApiError(b'', 500)
+            if path == 'trigger/4':
+                return {}
+            raise InvalidJSONError(b'')
+
+        with patch.object(client, 'delete', side_effect=delete) as delete_mock:
+            report = trigger_manager.bulk_delete(['1', '2', '1', '3', '4'], concurrency=2)
+
+        self.assertEqual(4, delete_mock.call_count)
+        self.assertEqual(['1', '3'], report.deleted)
+        self.assertEqual(['2', '4'], [trigger_id for trigger_id, _ in report.failed])
+        self.assertIsInstance(report.failed[1][1], ResponseStructureError)
+        self.assertEqual(['1'], report.skipped)
+
+    def test_delete_keeps_index_when_not_deleted(self):
+        client = Client(self.api_url)
+        trigger_manager = TriggerManager(client)
+        existing = {'id': '1', 'name': 'Name', 'tags': ['tag'], 'targets': ['target']}
+
+        with patch.object(client, 'get', return_value={'list': [existing]}):
+            index = trigger_manager.build_index()
+        with patch.object(client, 'delete', return_value={}):
+            self.assertFalse(trigger_manager.delete('1'))
+
+        self.assertIsNotNone(index.get('1'))
+
+
+class TriggerIndexTest(ModelTest):
+
+    def _trigger(self, trigger_id, name='Name', tags=('a', 'b'), targets=('x', 'y')):
+        return Trigger(None, name, list(tags), list(targets), id=trigger_id)
+
+    def test_find_ignores_order_of_tags_and_targets(self):
+        existing = self._trigger('1')
+        index = TriggerIndex([existing])
+
+        self.assertIs(existing, index.find(self._trigger(None, tags=('b', 'a'), targets=('y', 'x'))))
+        self.assertIsNone(index.find(self._trigger(None, name='Other')))
+        self.assertIsNone(index.find(self._trigger(None, tags=('a',))))
+
+    def test_add_replaces_previous_version(self):
+        index = TriggerIndex([self._trigger('1')])
+
+        index.add(self._trigger('1', name='Renamed'))
+
+        self.assertEqual(1, len(index))
+        self.assertNotIn(self._trigger(None), index)
+        self.assertIn(self._trigger(None, name='Renamed'), index)
+
+    def test_remove_keeps_duplicates(self):
+        index = TriggerIndex([self._trigger('1'), self._trigger('2')])
+
+        self.assertEqual('1', index.find(self._trigger(None)).id)
+        index.remove('1')
+        self.assertEqual('2', index.find(self._trigger(None)).id)
+        index.remove('2')
+        index.remove('3')
+        self.assertEqual(0, len(index))
+
+    def test_get_by_id(self):
+        index = TriggerIndex([self._trigger('1'), self._trigger('2'), self._trigger('3', name='Other')])
+
+        self.assertEqual('2', index.get('2').id)
+        self.assertEqual('3', index.get('3').id)
+        self.assertIsNone(index.get('4'))
+
+    def test_duplicate_is_found_after_first_is_replaced(self):
+        index = TriggerIndex([self._trigger('1'), self._trigger('2'), self._trigger('3')])
+
+        index.add(self._trigger('1', name='Renamed'))
+        index.remove('3')
+
+        self.assertEqual('2', index.find(self._trigger(None)).id)
+        self.assertEqual(['1'], [trigger.id for trigger in index.exclude({('Name', frozenset('xy'), frozenset('ab'))})])
+
+
+class TriggerManagerIndexTest(ModelTest):
+    QUERY_PARAM_VALIDATE_FLAG = 'validate'
+
+    def setUp(self):
+        self.client = Client(self.api_url)
+        self.trigger_manager = TriggerManager(self.client)
+        existing = {'id': '1', 'name': 'Name', 'tags': ['tag'], 'targets': ['target']}
+        with patch.object(self.client, 'get', return_value={'list': [existing]}):
+            self.index = self.trigger_manager.build_index()
+
+    def test_is_exist_uses_index(self):
+        with patch.object(self.client, 'get') as get_mock:
+            self.assertTrue(self.trigger_manager.is_exist(self.trigger_manager.create('Name', ['tag'], ['target'])))
+            self.assertFalse(self.trigger_manager.is_exist(self.trigger_manager.create('New', ['tag'], ['target'])))
+
+        self.assertFalse(get_mock.called)
+        self.assertIs(self.index, self.trigger_manager.index)
+        self.assertIs(self.index, TriggerManager(self.client).index)
+
+    def test_save_new_trigger_is_indexed(self):
+        trigger = self.trigger_manager.create('New', ['tag'], ['target'])
+
+        with patch.object(self.client, 'get') as get_mock, \
+                patch.object(self.client, 'put', return_value={'id': '2'}) as put_mock:
+            trigger.save()
+
+        self.assertFalse(get_mock.called)
+        self.assertEqual('trigger?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), put_mock.call_args[0][0])
+        self.assertEqual('2', self.index.find(self.trigger_manager.create('New', ['tag'], ['target'])).id)
+
+    def test_save_existing_trigger_skips_list_download(self):
+        state = {'state': 'OK', 'trigger_id': '1'}
+        trigger = {'id': '1', 'name': 'Name', 'tags': ['tag'], 'targets': ['target']}
+        trigger_dto = self.trigger_manager.create('Name', ['tag'], ['target'])
+
+        with patch.object(self.client, 'get', side_effect=[state, trigger]) as get_mock, \
+                patch.object(self.client, 'put', return_value={'id': '1'}) as put_mock:
+            trigger_dto.save()
+
+        self.assertEqual(2, get_mock.call_count)
+        self.assertEqual('trigger/1?{}'.format(self.QUERY_PARAM_VALIDATE_FLAG), put_mock.call_args[0][0])
+
+    def test_delete_removes_trigger(self):
+        with patch.object(self.client, 'delete', new=Mock(side_effect=InvalidJSONError(b''))):
+            self.trigger_manager.delete('1')
+
+        self.assertEqual(0, len(self.index))
+
+    def test_diff_uses_index(self):
+        with patch.object(self.client, 'get') as get_mock:
+            diff = self.trigger_manager.diff([self.trigger_manager.create('New', ['tag'], ['target'])])
+
+        self.assertFalse(get_mock.called)
+        self.assertEqual(1, len(diff.missing))
+        self.assertEqual(['1'], [trigger.id for trigger in diff.server_only])
+
+    def test_bulk_save_uses_index(self):
+        triggers = [
+            self.trigger_manager.create('Name', ['tag'], ['target']),
+            self.trigger_manager.create(id='1', name='Name', tags=['tag'], targets=['target']),
+            self.trigger_manager.create('New', ['tag'], ['target']),
+        ]
+
+        with patch.object(self.client, 'get') as get_mock, \
+                patch.object(self.client, 'put', return_value={'id': '2'}):
+            report = self.trigger_manager.bulk_save(triggers)
+
+        self.assertFalse(get_mock.called)
+        self.assertEqual([triggers[1]], report.unchanged)
+        self.assertEqual([triggers[2]], report.created)
+        self.assertEqual(2, len(self.index))
+
+    def test_bulk_save_writes_trigger_edited_after_save(self):
+        trigger = self.trigger_manager.create('New', ['tag'], ['target'], warn_value=1)
+        with patch.object(self.client, 'put', return_value={'id': '2'}):
+            trigger.save()
+        trigger.warn_value = 5
+        trigger.tags.append('edited')
+
+        with patch.object(self.client, 'put', return_value={'id': '2'}) as put_mock:
+            report = self.trigger_manager.bulk_save([trigger])
+
+        self.assertEqual([trigger], report.updated)
+        self.assertEqual(5, put_mock.call_args[1]['json']['warn_value'])
+        self.assertEqual(5, self.index.get('2').warn_value)
+        self.assertEqual(['tag', 'edited'], self.index.get('2').tags)
+        self.assertIsNot(trigger, self.index.get('2'))
+
+    def test_drop_index(self):
+        self.trigger_manager.drop_index()
+
+        with patch.object(self.client, 'get', return_value={'list': []}) as get_mock:
+            self.assertFalse(self.trigger_manager.is_exist(self.trigger_manager.create('Name', ['tag'], ['target'])))
+
+        self.assertTrue(get_mock.called)
+        self.assertIsNone(self.trigger_manager.index)
@@ -0,0 +1,144 @@
+import time
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from moira_client.cache import ResponseCache
+from moira_client.cache import RevalidationCache
+from moira_client.cache import cache_key
+
+
+class CacheKeyTest(unittest.TestCase):
+
+    def test_params_order_does_not_matter(self):
+        self.assertEqual(cache_key('trigger', {'a': 1, 'b': 2}), cache_key('trigger', {'b': 2, 'a': 1}))
+
+    def test_params_are_part_of_key(self):
+        self.assertNotEqual(cache_key('trigger', {'page': 1}), cache_key('trigger', {'page': 2}))
+        self.assertEqual(cache_key('trigger'), cache_key('trigger', {}))
+
+
+class RevalidationCacheTest(unittest.TestCase):
+
+    def test_conditional_headers(self):
+        cache = RevalidationCache()
+        cache.store('key', {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}, b'{}', {})
+        headers = {'User-Agent': 'test'}
+
+        conditional = cache.conditional_headers(cache.lookup('key'), headers)
+
+        self.assertEqual('"v1"', conditional['If-None-Match'])
+        self.assertEqual('Wed, 21 Oct 2015 07:28:00 GMT', conditional['If-Modified-Since'])
+        self.assertEqual({'User-Agent': 'test'}, headers)
+
+    def test_response_without_validators_is_not_stored(self):
+        cache = RevalidationCache()
+
+        cache.store('key', {}, b'{}', {})
+
+        self.assertIsNone(cache.lookup('key'))
+        self.assertEqual(1, cache.misses)
+
+    def test_revalidated_decodes_stored_body(self):
+        cache = RevalidationCache()
+        cache.store('key', {'ETag': '"v1"'}, b'{"list": []}', {'list': []})
+
+        first = cache.revalidated(cache.lookup('key'), lambda content: {'decoded': content})
+
+        self.assertEqual({'decoded': b'{"list": []}'}, first)
+        self.assertEqual(1, cache.hits)
+
+    def test_shared_returns_decoded_object(self):
+        cache = RevalidationCache(shared=True)
+        value = {'list': []}
+        cache.store('key', {'ETag': '"v1"'}, b'{"list": []}', value)
+
+        self.assertIs(value, cache.revalidated(cache.lookup('key'), None))
+
+    def test_lru_eviction(self):
+        cache = RevalidationCache(max_entries=2)
+        for key in ('a', 'b'):
+            cache.store(key, {'ETag': key}, b'{}', {})
+        cache.lookup('a')
+
+        cache.store('c', {'ETag': 'c'}, b'{}', {})
+
+        self.assertIsNotNone(cache.lookup('a'))
+        self.assertIsNone(cache.lookup('b'))
+        self.assertEqual(2, len(cache))
+
+
+class ResponseCacheTest(unittest.TestCase):
+
+    def test_hit_and_miss(self):
+        cache = ResponseCache(ttl=60)
+        key = cache_key('trigger')
+
+        self.assertEqual((False, None), cache.get(key))
+        cache.store(key, {'list': []})
+
+        self.assertEqual((True, {'list': []}), cache.get(key))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+
+    def test_callers_get_their_own_copy(self):
+        cache = ResponseCache(ttl=60)
+        key = cache_key('trigger')
+        value = {'list': [{'tags': ['tag']}]}
+
+        cache.store(key, value)
+        value['list'][0]['tags'].append('stored')
+        cache.get(key)[1]['list'][0]['tags'].append('hit')
+
+        self.assertEqual((True, {'list': [{'tags': ['tag']}]}), cache.get(key))
+
+    def test_expiration(self):
+        cache = ResponseCache(ttl=10)
+        key = cache_key('trigger')
+        cache.store(key, {})
+
+        with patch('moira_client.cache.time.monotonic', return_value=time.monotonic() + 11):
+            self.assertEqual((False, None), cache.get(key))
+
+        self.assertEqual(0, len(cache))
+
+    def test_path_ttls(self):
+        cache = ResponseCache(ttl=5, path_ttls={'trigger': 1, 'trigger/': 2, 'config': 0})
+
+        self.assertEqual(2, cache.ttl_for('trigger/1/state'))
+        self.assertEqual(1, cache.ttl_for('trigger'))
+        self.assertEqual(5, cache.ttl_for('tag/stats'))
+
+        cache.store(cache_key('config'), {})
+        self.assertEqual(0, len(cache))
+
+    def test_lru_bound(self):
+        cache = ResponseCache(ttl=60, max_entries=2)
+        for path in ('a', 'b', 'c'):
+            cache.store(cache_key(path), path)
+
+        self.assertEqual((False, None), cache.get(cache_key('a')))
+        self.assertEqual(2, len(cache))
+
+    def test_write_invalidates_related_paths(self):
+        cache = ResponseCache(ttl=60)
+        for path in ('trigger', 'trigger/1/state', 'tag/stats', 'contact', 'user/settings', 'config'):
+            cache.store(cache_key(path), path)
+
+        self.assertEqual(3, cache.invalidate('trigger/1?validate'))
+        self.assertEqual((False, None), cache.get(cache_key('tag/stats')))
+
+        self.assertEqual(2, cache.invalidate('contact/2'))
+        self.assertEqual((True, 'config'), cache.get(cache_key('config')))
+        self.assertEqual(5, cache.invalidations)
+
+    def test_unknown_segment_invalidates_itself(self):
+        cache = ResponseCache(ttl=60)
+        cache.store(cache_key('health/notifier'), {})
+        cache.store(cache_key('config'), {})
+
+        cache.invalidate('health/notifier')
+
+        self.assertEqual(1, len(cache))
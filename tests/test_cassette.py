@@ -0,0 +1,182 @@
+import gzip
+import json
+import os
+import tempfile
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+import requests
+
+from moira_client.client import Client
+from moira_client.client import MoiraApiError
+from moira_client.compression import GzipCompression
+from moira_client.moira import Moira
+from moira_client.transports import Transport
+from moira_client.transports.cassette import RECORDED_LATENCY
+from moira_client.transports.cassette import Cassette
+from moira_client.transports.cassette import Interaction
+from moira_client.transports.cassette import RecordTransport
+from moira_client.transports.cassette import ReplayTransport
+from moira_client.transports.cassette import UnmatchedRequestError
+from moira_client.transports.cassette import request_key
+from moira_client.transports.requests import RequestsResponse
+
+TEST_API_URL = 'http://test/api/url'
+
+
+class FakeApiTransport(Transport):
+    """
+    Stores triggers in memory, answers trigger list GETs and trigger PUTs
+    """
+    def __init__(self):
+        super().__init__(1, 1)
+        self.triggers = []
+
+    def create_auth(self, auth_user, auth_pass):
+        return None
+
+    def close(self):
+        pass
+
+    def _request(self, method, url, headers, auth, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        if method == 'PUT':
+            trigger = dict(json.loads(kwargs['data']), id=str(len(self.triggers) + 1))
+            self.triggers.append(trigger)
+            response._content = json.dumps({'id': trigger['id']}).encode()
+        else:
+            response._content = json.dumps({'list': self.triggers}).encode()
+        response.headers['ETag'] = '"{}"'.format(len(self.triggers))
+        return RequestsResponse(response)
+
+
+def interaction(url, content=b'{}', status=200, body_hash=None, elapsed=0.0, method='GET'):
+    return Interaction(method=method, url=url, body_hash=body_hash, status=status, headers={},
+                       content=content, wire_bytes=len(content), elapsed=elapsed)
+
+
+class RequestKeyTest(unittest.TestCase):
+
+    def test_host_is_ignored(self):
+        self.assertEqual(('GET', '/api/trigger', None), request_key('GET', 'http://a:80/api/trigger'))
+        self.assertEqual(('GET', '/api/trigger', None), request_key('GET', 'https://b/api/trigger'))
+
+    def test_params_are_sorted(self):
+        key = request_key('GET', 'http://a/api/event?p=0', params={'size': 10, 'from': 1, 'to': None})
+        self.assertEqual('/api/event?p=0&from=1&size=10', key[1])
+
+    def test_gzipped_bodies_match_uncompressed(self):
+        compressed = gzip.compress(b'{"name":"trigger"}', mtime=1)
+        self.assertEqual(request_key('PUT', 'http://a/trigger', data=b'{"name":"trigger"}'),
+                         request_key('PUT', 'http://a/trigger', data=compressed, headers={'Content-Encoding': 'gzip'}))
+
+
+class CassetteTest(unittest.TestCase):
+
+    def test_record_save_load_replay(self):
+        cassette = Cassette()
+        moira = Moira(TEST_API_URL, transport=RecordTransport(cassette, transport=FakeApiTransport()))
+        for name in ('first', 'second'):
+            moira.trigger.create(name, ['tag'], ['target']).save()
+        recorded = [trigger.id for trigger in moira.trigger.fetch_all()]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'triggers.cassette')
+            cassette.save(path)
+            loaded = Cassette.load(path)
+
+        self.assertEqual(cassette.interactions, loaded.interactions)
+        transport = ReplayTransport(loaded)
+        moira = Moira(TEST_API_URL.replace('test', 'other'), transport=transport)
+        for name in ('first', 'second'):
+            moira.trigger.create(name, ['tag'], ['target']).save()
+        self.assertEqual(recorded, [trigger.id for trigger in moira.trigger.fetch_all()])
+        self.assertEqual(len(cassette), transport.requests)
+
+    def test_binary_content(self):
+        cassette = Cassette([interaction('/api/url/blob', b'\xff\x00')])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'blob.cassette')
+            cassette.save(path)
+            self.assertEqual(b'\xff\x00', Cassette.load(path).interactions[0].content)
+
+    def test_unsupported_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'old.cassette')
+            with gzip.open(path, 'wt') as f:
+                f.write('{"version": 0, "interactions": []}')
+            with self.assertRaises(ValueError):
+                Cassette.load(path)
+
+
+class ReplayTransportTest(unittest.TestCase):
+
+    def test_responses_are_replayed_in_order_then_repeated(self):
+        cassette = Cassette([
+            interaction('/api/url/trigger/1/state', b'{"state": "NODATA"}'),
+            interaction('/api/url/trigger/1/state', b'{"state": "OK"}'),
+        ])
+        client = Client(TEST_API_URL, transport=ReplayTransport(cassette))
+
+        states = [client.get('trigger/1/state')['state'] for _ in range(3)]
+
+        self.assertEqual(['NODATA', 'OK', 'OK'], states)
+        client.transport.rewind()
+        self.assertEqual('NODATA', client.get('trigger/1/state')['state'])
+
+    def test_error_statuses_are_replayed(self):
+        client = Client(TEST_API_URL, transport=ReplayTransport(Cassette([interaction('/api/url/x', b'no', 404)])))
+
+        with self.assertRaises(MoiraApiError):
+            client.get('x')
+
+    def test_unmatched_request(self):
+        client = Client(TEST_API_URL, transport=ReplayTransport(Cassette()))
+
+        with self.assertRaises(UnmatchedRequestError) as ctx:
+            client.put('trigger', json={})
+
+        self.assertEqual(('PUT', '/api/url/trigger'), (ctx.exception.method, ctx.exception.url))
+
+    def test_compressed_bodies_are_matched(self):
+        body_hash = request_key('PUT', TEST_API_URL, data=b'{"targets":["' + b'a' * 100 + b'"]}')[2]
+        cassette = Cassette([interaction('/api/url/trigger', b'{"id": "1"}', body_hash=body_hash, method='PUT')])
+        client = Client(TEST_API_URL, codec='json', compression=GzipCompression(threshold=10),
+                        transport=ReplayTransport(cassette))
+
+        self.assertEqual({'id': '1'}, client.put('trigger', json={'targets': ['a' * 100]}))
+
+    def test_streaming(self):
+        cassette = Cassette([interaction('/api/url/trigger', b'{"list": [1, 2, 3]}')])
+        client = Client(TEST_API_URL, transport=ReplayTransport(cassette))
+
+        self.assertEqual([1, 2, 3], list(client.iter_list('trigger', chunk_size=4)))
+
+    def test_latency(self):
+        cassette = Cassette([interaction('/api/url/a', elapsed=0.25)])
+        for latency, expected in ((None, None), (0.1, 0.1), (RECORDED_LATENCY, 0.25)):
+            client = Client(TEST_API_URL, transport=ReplayTransport(cassette, latency=latency))
+            with self.subTest(latency=latency), patch('moira_client.transports.cassette.time.sleep') as mock_sleep:
+                client.get('a')
+                if expected is None:
+                    self.assertFalse(mock_sleep.called)
+                else:
+                    mock_sleep.assert_called_once_with(expected)
+
+    def test_bandwidth_is_shared(self):
+        content = b'"' + b'a' * 998 + b'"'
+        transport = ReplayTransport(Cassette([interaction('/api/url/a', content)]), latency=0.5, bandwidth=1000)
+        client = Client(TEST_API_URL, transport=transport)
+
+        with patch('moira_client.transports.cassette.time.monotonic', return_value=100.0), \
+                patch('moira_client.transports.cassette.time.sleep') as mock_sleep:
+            client.get('a')
+            client.get('a')
+
+        # the second body waits for the first one to go through the link
+        self.assertEqual([((1.5,),), ((2.5,),)], mock_sleep.call_args_list)
@@ -1,3 +1,7 @@
+import gzip
+import io
+import threading
+import time
 import unittest
 try:
     from unittest.mock import patch
@@ -5,8 +9,29 @@ except ImportError:
     from mock import patch
 
 import requests
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from moira_client.client import CircuitOpenError
 from moira_client.client import Client
 from moira_client.client import InvalidJSONError
+from moira_client.client import MoiraApiError
+from moira_client.client import ResponseStructureError
+from moira_client.cache import ResponseCache
+from moira_client.cache import RevalidationCache
+from moira_client.compression import GzipCompression
+from moira_client.hedging import HedgePolicy
+from moira_client.hooks import Hooks
+from moira_client.metrics import LatencyHistogram
+from moira_client.models.trigger import TriggerManager
+from moira_client.ratelimit import RateLimiter
+from moira_client.retry import CircuitBreaker
+from moira_client.retry import RetryPolicy
+from moira_client.transports import TransportConnectionError
+from moira_client.transports import TransportError
+from moira_client.transports import TransportTimeout
 
 TEST_API_URL = 'http://test/api/url'
 TEST_HEADERS = {
@@ -16,7 +41,17 @@ TEST_HEADERS = {
     }
 
 
+def make_response(status_code, content=b'{}', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
 class FakeResponse:
+    status_code = 200
+    headers = {}
 
     @property
     def content(self):
@@ -33,116 +68,704 @@ class ClientTest(unittest.TestCase):
 
     def test_get(self):
 
-        def get(url, params, **kwargs):
-            pass
-
-        with patch.object(requests, 'get', side_effects=get) as mock_get:
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
             test_path = 'test_path'
 
             client = Client(TEST_API_URL, TEST_HEADERS)
             client.get(test_path)
 
-        self.assertTrue(mock_get.called)
+        self.assertTrue(mock_request.called)
         expected_url_call = TEST_API_URL + '/' + test_path
-        mock_get.assert_called_with(expected_url_call, headers=TEST_HEADERS, auth=None)
+        mock_request.assert_called_with('GET', expected_url_call, headers=TEST_HEADERS, auth=None)
 
     def test_put(self):
 
-        def put(url, data, **kwargs):
-            pass
-
-        with patch.object(requests, 'put', side_effects=put) as mock_put:
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
             test_path = 'test_path'
             test_data = {'test': 'test'}
 
             client = Client(TEST_API_URL, TEST_HEADERS)
             client.put(test_path, data=test_data)
 
-        self.assertTrue(mock_put.called)
+        self.assertTrue(mock_request.called)
         expected_url_call = TEST_API_URL + '/' + test_path
-        mock_put.assert_called_with(expected_url_call, data=test_data, headers=TEST_HEADERS, auth=None)
+        mock_request.assert_called_with('PUT', expected_url_call, data=test_data, headers=TEST_HEADERS, auth=None)
 
     def test_post(self):
-        def post(url, data, **kwargs):
-            pass
 
-        with patch.object(requests, 'post', side_effects=post) as mock_post:
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
             test_path = 'test_path'
             test_data = {'test': 'test'}
 
             client = Client(TEST_API_URL, TEST_HEADERS)
             client.post(test_path, data=test_data)
 
-        self.assertTrue(mock_post.called)
+        self.assertTrue(mock_request.called)
         expected_url_call = TEST_API_URL + '/' + test_path
-        mock_post.assert_called_with(expected_url_call, data=test_data, headers=TEST_HEADERS, auth=None)
+        mock_request.assert_called_with('POST', expected_url_call, data=test_data, headers=TEST_HEADERS, auth=None)
 
     def test_delete(self):
 
-        def delete(url, **kwargs):
-            pass
-
-        with patch.object(requests, 'delete', side_effects=delete) as mock_delete:
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
             test_path = 'test_path'
 
             client = Client(TEST_API_URL, TEST_HEADERS)
             client.delete(test_path)
 
-        self.assertTrue(mock_delete.called)
+        self.assertTrue(mock_request.called)
         expected_url_call = TEST_API_URL + '/' + test_path
-        mock_delete.assert_called_with(expected_url_call, headers=TEST_HEADERS, auth=None)
+        mock_request.assert_called_with('DELETE', expected_url_call, headers=TEST_HEADERS, auth=None)
 
     def test_get_invalid_response(self):
-
-        def get(url, params, **kwargs):
-            return FakeResponse()
-
         response = FakeResponse()
 
-        with patch.object(requests, 'get', side_effects=get, return_value=response) as mock_get:
+        with patch.object(requests.Session, 'request', return_value=response) as mock_request:
             test_path = 'test_path'
 
             client = Client(TEST_API_URL, TEST_HEADERS)
             with self.assertRaises(InvalidJSONError):
                 client.get(test_path)
 
-        self.assertTrue(mock_get.called)
+        self.assertTrue(mock_request.called)
         expected_url_call = TEST_API_URL + '/' + test_path
-        mock_get.assert_called_with(expected_url_call, headers=TEST_HEADERS, auth=None)
+        mock_request.assert_called_with('GET', expected_url_call, headers=TEST_HEADERS, auth=None)
 
     def test_put_invalid_response(self):
         test_data = {'test': 'test'}
-
-        def put(url, data, **kwargs):
-            return FakeResponse()
-
         response = FakeResponse()
 
-        with patch.object(requests, 'put', side_effects=put, return_value=response) as mock_put:
+        with patch.object(requests.Session, 'request', return_value=response) as mock_request:
             test_path = 'test_path'
 
             client = Client(TEST_API_URL, TEST_HEADERS)
             with self.assertRaises(InvalidJSONError):
                 client.put(test_path, data=test_data)
 
-        self.assertTrue(mock_put.called)
+        self.assertTrue(mock_request.called)
         expected_url_call = TEST_API_URL + '/' + test_path
-        mock_put.assert_called_with(expected_url_call, data=test_data, headers=TEST_HEADERS, auth=None)
+        mock_request.assert_called_with('PUT', expected_url_call, data=test_data, headers=TEST_HEADERS, auth=None)
 
     def test_delete_invalid_response(self):
-
-        def delete(url, **kwargs):
-            return FakeResponse()
-
         response = FakeResponse()
 
-        with patch.object(requests, 'delete', side_effects=delete, return_value=response) as mock_delete:
+        with patch.object(requests.Session, 'request', return_value=response) as mock_request:
             test_path = 'test_path'
 
             client = Client(TEST_API_URL, TEST_HEADERS)
             with self.assertRaises(InvalidJSONError):
                 client.delete(test_path)
 
-        self.assertTrue(mock_delete.called)
+        self.assertTrue(mock_request.called)
         expected_url_call = TEST_API_URL + '/' + test_path
-        mock_delete.assert_called_with(expected_url_call, headers=TEST_HEADERS, auth=None)
+        mock_request.assert_called_with('DELETE', expected_url_call, headers=TEST_HEADERS, auth=None)
+
+    def test_session_is_reused(self):
+        client = Client(TEST_API_URL, TEST_HEADERS)
+        session = client.transport._session
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)):
+            client.get('test_path')
+            client.get('test_path')
+
+        self.assertIs(session, client.transport._session)
+
+    def test_transport_is_created_on_first_request(self):
+        client = Client(TEST_API_URL, TEST_HEADERS, auth_user='user', auth_pass='pass')
+        self.assertIsNone(client._transport)
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
+            client.get('test_path')
+
+        self.assertIsNotNone(client._transport)
+        self.assertEqual(('user', 'pass'), (mock_request.call_args[1]['auth'].username,
+                                            mock_request.call_args[1]['auth'].password))
+
+    def test_invalid_transport_fails_on_creation(self):
+        with self.assertRaises(ValueError):
+            Client(TEST_API_URL, transport='curl')
+        with self.assertRaises(ValueError):
+            Client(TEST_API_URL, transport='urllib3', http2=True)
+
+    def test_pool_options(self):
+        client = Client(TEST_API_URL, TEST_HEADERS, pool_connections=2, pool_maxsize=32)
+
+        adapter = client.transport._session.get_adapter(TEST_API_URL)
+        self.assertEqual(2, adapter._pool_connections)
+        self.assertEqual(32, adapter._pool_maxsize)
+
+    def test_idle_timeout_drops_connections(self):
+        client = Client(TEST_API_URL, TEST_HEADERS, idle_timeout=1)
+        client.transport._last_used -= 10
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)), \
+                patch.object(requests.Session, 'close') as mock_close:
+            client.get('test_path')
+
+        self.assertTrue(mock_close.called)
+
+
+class ClientRetryTest(unittest.TestCase):
+
+    def test_retries_overload_statuses(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=3, jitter=False))
+        responses = [make_response(503), make_response(502), make_response(200, b'{"list": []}')]
+
+        with patch.object(requests.Session, 'request', side_effect=responses) as mock_request, \
+                patch('moira_client.client.time.sleep') as mock_sleep:
+            result = client.get('trigger')
+
+        self.assertEqual({'list': []}, result)
+        self.assertEqual(3, mock_request.call_count)
+        self.assertEqual([((0.5,),), ((1.0,),)], mock_sleep.call_args_list)
+
+    def test_gives_up_after_total(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=2))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(504, b'timeout')) as mock_request, \
+                patch('moira_client.client.time.sleep'):
+            with self.assertRaises(MoiraApiError) as ctx:
+                client.get('trigger')
+
+        self.assertEqual(3, mock_request.call_count)
+        self.assertEqual(b'timeout', ctx.exception.body)
+
+    def test_does_not_retry_non_idempotent_methods(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=3))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(503)) as mock_request, \
+                patch('moira_client.client.time.sleep'):
+            with self.assertRaises(MoiraApiError):
+                client.post('teams', json={})
+
+        self.assertEqual(1, mock_request.call_count)
+
+    def test_does_not_retry_create_after_read_timeout(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=3))
+
+        with patch.object(requests.Session, 'request', side_effect=requests.exceptions.ReadTimeout()) as mock_request, \
+                patch('moira_client.client.time.sleep'):
+            with self.assertRaises(TransportTimeout):
+                client.put('trigger?validate', json={'name': 'name'})
+
+        self.assertEqual(1, mock_request.call_count)
+
+    def test_retries_update(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=3))
+        responses = [requests.exceptions.ReadTimeout(), make_response(504), make_response(200, b'{"id": "1"}')]
+
+        with patch.object(requests.Session, 'request', side_effect=responses) as mock_request, \
+                patch('moira_client.client.time.sleep'):
+            client.put('trigger/1?validate', json={'name': 'name'})
+
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_respects_retry_after(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=1))
+        responses = [make_response(429, headers={'Retry-After': '7'}), make_response(200)]
+
+        with patch.object(requests.Session, 'request', side_effect=responses), \
+                patch('moira_client.client.time.sleep') as mock_sleep:
+            client.get('trigger')
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    def test_retries_connection_errors(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=1))
+        responses = [requests.exceptions.ConnectionError(), make_response(200)]
+
+        with patch.object(requests.Session, 'request', side_effect=responses) as mock_request, \
+                patch('moira_client.client.time.sleep'):
+            client.delete('trigger/1')
+
+        self.assertEqual(2, mock_request.call_count)
+
+    def test_connection_error_without_retry(self):
+        client = Client(TEST_API_URL)
+
+        with patch.object(requests.Session, 'request', side_effect=requests.exceptions.ConnectionError()):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                client.get('trigger')
+
+    def test_circuit_breaker_fails_fast(self):
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+        client = Client(TEST_API_URL, circuit_breaker=breaker)
+
+        with patch.object(requests.Session, 'request', return_value=make_response(503)) as mock_request:
+            for _ in range(2):
+                with self.assertRaises(MoiraApiError):
+                    client.get('trigger')
+            with self.assertRaises(CircuitOpenError) as ctx:
+                client.get('trigger')
+
+        self.assertEqual(2, mock_request.call_count)
+        self.assertGreater(ctx.exception.retry_in, 0)
+
+
+class ClientCodecTest(unittest.TestCase):
+
+    def test_encodes_json_with_codec(self):
+        client = Client(TEST_API_URL, codec='json')
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
+            client.put('trigger', json={'name': 'trigger'})
+
+        self.assertNotIn('json', mock_request.call_args[1])
+        self.assertEqual(b'{"name":"trigger"}', mock_request.call_args[1]['data'])
+
+    def test_decodes_with_codec(self):
+        for codec in ('json', 'auto'):
+            client = Client(TEST_API_URL, codec=codec)
+
+            with patch.object(requests.Session, 'request', return_value=make_response(200, b'{"list":[1]}')):
+                self.assertEqual({'list': [1]}, client.get('trigger'))
+
+    def test_empty_body_is_invalid_json(self):
+        client = Client(TEST_API_URL)
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200, b'')):
+            with self.assertRaises(InvalidJSONError) as ctx:
+                client.delete('trigger/1')
+
+        self.assertEqual(b'', ctx.exception.content)
+
+
+class ClientCompressionTest(unittest.TestCase):
+
+    def test_advertises_compressed_responses(self):
+        client = Client(TEST_API_URL)
+
+        self.assertEqual('gzip, deflate', client.transport._session.headers['Accept-Encoding'])
+
+    def test_compresses_large_bodies(self):
+        client = Client(TEST_API_URL, TEST_HEADERS, codec='json', compression=GzipCompression(threshold=100))
+        payload = {'targets': ['a' * 1000]}
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
+            client.put('trigger', json=payload)
+
+        kwargs = mock_request.call_args[1]
+        self.assertEqual('gzip', kwargs['headers']['Content-Encoding'])
+        self.assertEqual(b'{"targets":["' + b'a' * 1000 + b'"]}', gzip.decompress(kwargs['data']))
+        # client headers are not modified
+        self.assertNotIn('Content-Encoding', client.headers)
+
+    def test_does_not_compress_small_bodies(self):
+        client = Client(TEST_API_URL, TEST_HEADERS, codec='json', compression=GzipCompression(threshold=100))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
+            client.put('trigger', json={'name': 'trigger'})
+
+        self.assertEqual(TEST_HEADERS, mock_request.call_args[1]['headers'])
+        self.assertEqual(b'{"name":"trigger"}', mock_request.call_args[1]['data'])
+
+    def test_transfer_stats(self):
+        client = Client(TEST_API_URL, codec='json', compression=GzipCompression(threshold=100))
+        payload = {'targets': ['a' * 1000]}
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200, b'{"id":"1"}')):
+            client.put('trigger', json=payload)
+
+        stats = client.transfer_stats
+        self.assertEqual(1, stats.requests)
+        self.assertEqual(len(b'{"targets":["' + b'a' * 1000 + b'"]}'), stats.sent_bytes)
+        self.assertLess(stats.sent_wire_bytes, stats.sent_bytes)
+        self.assertEqual(10, stats.received_bytes)
+        self.assertGreater(stats.saved_bytes, 0)
+
+
+class ClientRevalidationTest(unittest.TestCase):
+
+    def test_not_modified_serves_cached_body(self):
+        client = Client(TEST_API_URL, revalidation_cache=RevalidationCache(shared=True))
+        responses = [
+            make_response(200, b'{"list": [1]}', {'ETag': '"v1"'}),
+            make_response(304, b'', {'ETag': '"v1"'}),
+        ]
+
+        with patch.object(requests.Session, 'request', side_effect=responses) as mock_request:
+            first = client.get('trigger')
+            second = client.get('trigger')
+
+        self.assertIs(first, second)
+        self.assertNotIn('If-None-Match', mock_request.call_args_list[0][1]['headers'])
+        self.assertEqual('"v1"', mock_request.call_args_list[1][1]['headers']['If-None-Match'])
+        self.assertEqual(1, client.revalidation_cache.hits)
+
+    def test_modified_response_replaces_cached_body(self):
+        client = Client(TEST_API_URL, revalidation_cache=RevalidationCache())
+        responses = [
+            make_response(200, b'{"list": [1]}', {'ETag': '"v1"'}),
+            make_response(200, b'{"list": [2]}', {'ETag': '"v2"'}),
+            make_response(304, b''),
+        ]
+
+        with patch.object(requests.Session, 'request', side_effect=responses) as mock_request:
+            client.get('trigger')
+            client.get('trigger')
+            result = client.get('trigger')
+
+        self.assertEqual({'list': [2]}, result)
+        self.assertEqual('"v2"', mock_request.call_args_list[2][1]['headers']['If-None-Match'])
+
+    def test_only_get_is_revalidated(self):
+        client = Client(TEST_API_URL, revalidation_cache=RevalidationCache())
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200, b'{}', {'ETag': '"v1"'})):
+            client.put('trigger', json={})
+
+        self.assertEqual(0, len(client.revalidation_cache))
+
+
+class ClientResponseCacheTest(unittest.TestCase):
+
+    def test_get_is_served_from_cache(self):
+        client = Client(TEST_API_URL, response_cache=ResponseCache(ttl=60))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200, b'{"list": []}')) as mock_request:
+            client.get('tag/stats')
+            result = client.get('tag/stats')
+
+        self.assertEqual({'list': []}, result)
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(1, client.response_cache.hits)
+
+    def test_models_do_not_modify_cached_response(self):
+        client = Client(TEST_API_URL, response_cache=ResponseCache(ttl=60))
+        body = b'{"list": [{"id": "1", "name": "name", "tags": ["tag"], "targets": ["target"]}]}'
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200, body)) as mock_request:
+            TriggerManager(client).fetch_all()[0].add_tag('LOCAL-ONLY')
+            triggers = TriggerManager(client).fetch_all()
+
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(['tag'], triggers[0].tags)
+
+    def test_write_invalidates_cache(self):
+        client = Client(TEST_API_URL, response_cache=ResponseCache(ttl=60))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200, b'{"list": []}')) as mock_request:
+            client.get('tag/stats')
+            client.put('trigger/1?validate', json={})
+            client.get('tag/stats')
+
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_failed_write_invalidates_cache(self):
+        client = Client(TEST_API_URL, response_cache=ResponseCache(ttl=60))
+        responses = [make_response(200, b'{"list": []}'), make_response(500, b'error'), make_response(200)]
+
+        with patch.object(requests.Session, 'request', side_effect=responses) as mock_request:
+            client.get('contact')
+            with self.assertRaises(MoiraApiError):
+                client.delete('contact/1')
+            client.get('contact')
+
+        self.assertEqual(3, mock_request.call_count)
+
+    def test_errors_are_not_cached(self):
+        client = Client(TEST_API_URL, response_cache=ResponseCache(ttl=60))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(500, b'error')) as mock_request:
+            for _ in range(2):
+                with self.assertRaises(MoiraApiError):
+                    client.get('trigger')
+
+        self.assertEqual(2, mock_request.call_count)
+
+
+class ClientCoalesceTest(unittest.TestCase):
+
+    def test_concurrent_gets_are_coalesced(self):
+        client = Client(TEST_API_URL, coalesce=True)
+        started = threading.Event()
+        release = threading.Event()
+
+        def request(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return make_response(200, b'{"list": []}')
+
+        with patch.object(requests.Session, 'request', side_effect=request) as mock_request:
+            results = []
+            threads = [threading.Thread(target=lambda: results.append(client.get('trigger'))) for _ in range(3)]
+            threads[0].start()
+            started.wait(5)
+            for thread in threads[1:]:
+                thread.start()
+            while client.single_flight.coalesced < 2:
+                time.sleep(0.001)
+            release.set()
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual([{'list': []}] * 3, results)
+
+    def test_different_params_are_not_coalesced(self):
+        client = Client(TEST_API_URL, coalesce=True)
+
+        with patch.object(client.single_flight, 'do', wraps=client.single_flight.do) as mock_do, \
+                patch.object(requests.Session, 'request', return_value=make_response(200)):
+            client.get('trigger', params={'p': 0})
+            client.get('trigger', params={'p': 1})
+            client.put('trigger/1', json={})
+
+        self.assertEqual(
+            [('trigger', (('p', '0'),)), ('trigger', (('p', '1'),))],
+            [call[0][0] for call in mock_do.call_args_list])
+
+
+class ClientRateLimitTest(unittest.TestCase):
+
+    def test_requests_wait_for_token(self):
+        client = Client(TEST_API_URL, rate_limiter=RateLimiter(endpoints={'trigger/': (1, 1)}))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)), \
+                patch('moira_client.ratelimit.time.sleep') as sleep_mock:
+            client.get('trigger/1')
+            client.get('contact')
+            client.get('trigger/2')
+
+        self.assertEqual(1, sleep_mock.call_count)
+        self.assertTrue(0 < sleep_mock.call_args[0][0] <= 1)
+
+
+class ClientHedgingTest(unittest.TestCase):
+
+    def test_fast_response_is_not_hedged(self):
+        client = Client(TEST_API_URL, hedging=HedgePolicy(delay=5))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200, b'{"id": "1"}')) as mock_request:
+            result = client.get('trigger/1')
+
+        self.assertEqual({'id': '1'}, result)
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(0, client.hedging.hedged)
+        client.close()
+
+    def test_slow_response_is_hedged(self):
+        client = Client(TEST_API_URL, hedging=HedgePolicy(delay=0.01))
+        release = threading.Event()
+        responses = iter([b'{"replica": "slow"}', b'{"replica": "fast"}'])
+        lock = threading.Lock()
+
+        def request(*args, **kwargs):
+            with lock:
+                content = next(responses)
+            if content == b'{"replica": "slow"}':
+                release.wait(5)
+            return make_response(200, content)
+
+        with patch.object(requests.Session, 'request', side_effect=request) as mock_request:
+            result = client.get('trigger/1/state')
+            release.set()
+
+        self.assertEqual({'replica': 'fast'}, result)
+        self.assertEqual(2, mock_request.call_count)
+        self.assertEqual(1, client.hedging.hedged)
+        self.assertEqual(1, client.hedging.hedge_wins)
+        client.close()
+
+    def test_failed_attempt_waits_for_other(self):
+        client = Client(TEST_API_URL, hedging=HedgePolicy(delay=0.01))
+        hedge_sent = threading.Event()
+        calls = []
+
+        def request(*args, **kwargs):
+            calls.append(1)
+            if len(calls) == 1:
+                hedge_sent.wait(5)
+                raise requests.exceptions.ConnectionError('reset')
+            hedge_sent.set()
+            return make_response(200, b'{"id": "1"}')
+
+        with patch.object(requests.Session, 'request', side_effect=request):
+            result = client.get('trigger/1')
+
+        self.assertEqual({'id': '1'}, result)
+        self.assertEqual(1, client.hedging.hedge_wins)
+        client.close()
+
+    def test_steady_latency_is_not_hedged_under_concurrency(self):
+        client = Client(TEST_API_URL, pool_maxsize=10, hedging=HedgePolicy(delay=0.05))
+
+        def request(*args, **kwargs):
+            time.sleep(0.02)
+            return make_response(200, b'{"id": "1"}')
+
+        def caller():
+            for _ in range(5):
+                client.get('trigger/1')
+
+        with patch.object(requests.Session, 'request', side_effect=request) as mock_request:
+            callers = [threading.Thread(target=caller) for _ in range(60)]
+            for thread in callers:
+                thread.start()
+            for thread in callers:
+                thread.join()
+
+        self.assertEqual(300, client.hedging.requests)
+        self.assertLessEqual(client.hedging.hedged, 3)
+        self.assertEqual(300 + client.hedging.hedged, mock_request.call_count)
+        client.close()
+
+    def test_writes_are_not_hedged(self):
+        client = Client(TEST_API_URL, hedging=HedgePolicy(delay=0))
+
+        with patch.object(requests.Session, 'request', return_value=make_response(200)) as mock_request:
+            client.put('trigger/1', json={})
+
+        self.assertEqual(1, mock_request.call_count)
+        self.assertEqual(0, client.hedging.requests)
+
+
+class ClientHooksTest(unittest.TestCase):
+
+    def test_hooks_see_every_attempt(self):
+        histogram = LatencyHistogram()
+        events = []
+        hooks = histogram.hooks()
+        hooks.before_request.append(events.append)
+        hooks.after_response.append(events.append)
+        hooks.on_exception.append(events.append)
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=2), hooks=hooks)
+        responses = [requests.exceptions.ConnectionError('refused'), make_response(200, b'{"state": "OK"}')]
+
+        with patch.object(requests.Session, 'request', side_effect=responses), patch('moira_client.client.time.sleep'):
+            client.get('trigger/1/state')
+
+        self.assertEqual(4, len(events))
+        self.assertEqual('trigger/{id}/state', events[0].template)
+        self.assertIsInstance(events[1].error, requests.exceptions.ConnectionError)
+        self.assertEqual((200, 15), (events[3].status, events[3].bytes_in))
+        stats = histogram.stats()[('GET', 'trigger/{id}/state')]
+        self.assertEqual((2, 1), (stats.count, stats.errors))
+
+    def test_hooks_see_error_status(self):
+        hooks = Hooks()
+        events = []
+        hooks.after_response.append(events.append)
+        client = Client(TEST_API_URL, hooks=hooks)
+
+        with patch.object(requests.Session, 'request', return_value=make_response(404, b'not found')):
+            with self.assertRaises(MoiraApiError):
+                client.put('trigger/1', json={'name': 'trigger'})
+
+        self.assertEqual(('PUT', 'trigger/{id}', 404), events[0][:1] + events[0][2:4])
+        self.assertEqual(len(b'{"name":"trigger"}'), events[0].bytes_out)
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+class ClientHttp2Test(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(TEST_API_URL, login='login', http2=True)
+
+    def tearDown(self):
+        self.client.close()
+
+    def _response(self, status_code, content):
+        return httpx.Response(status_code, content=content, request=httpx.Request('GET', TEST_API_URL))
+
+    def test_get(self):
+        with patch.object(httpx.AsyncClient, 'request',
+                          return_value=self._response(200, b'{"list": []}')) as mock_request:
+            result = self.client.get('trigger', params={'p': 0})
+
+        self.assertEqual({'list': []}, result)
+        mock_request.assert_called_with('GET', TEST_API_URL + '/trigger', headers=TEST_HEADERS, auth=None,
+                                        params={'p': 0})
+
+    def test_put_sends_content(self):
+        with patch.object(httpx.AsyncClient, 'request', return_value=self._response(200, b'{}')) as mock_request:
+            self.client.put('trigger/1', json={'name': 'trigger'})
+
+        self.assertEqual(b'{"name":"trigger"}', mock_request.call_args[1]['content'])
+
+    def test_api_error(self):
+        with patch.object(httpx.AsyncClient, 'request', return_value=self._response(500, b'error')):
+            with self.assertRaises(MoiraApiError) as ctx:
+                self.client.get('trigger')
+
+        self.assertEqual(b'error', ctx.exception.body)
+
+    def test_invalid_json(self):
+        with patch.object(httpx.AsyncClient, 'request', return_value=self._response(200, b'not json')):
+            with self.assertRaises(InvalidJSONError):
+                self.client.get('trigger')
+
+    def test_errors_are_translated(self):
+        cases = [
+            (httpx.ConnectError('refused'), TransportConnectionError),
+            (httpx.ReadTimeout('timeout'), TransportTimeout),
+            (httpx.UnsupportedProtocol('ftp'), TransportError),
+        ]
+        for error, expected in cases:
+            with self.subTest(error=error), patch.object(httpx.AsyncClient, 'request', side_effect=error):
+                with self.assertRaises(expected):
+                    self.client.get('trigger')
+
+    def test_retry(self):
+        client = Client(TEST_API_URL, http2=True, retry=RetryPolicy(total=1))
+        responses = [httpx.ConnectError('refused'), self._response(200, b'{}')]
+
+        with patch.object(httpx.AsyncClient, 'request', side_effect=responses) as mock_request, \
+                patch('moira_client.client.time.sleep'):
+            client.get('trigger')
+
+        self.assertEqual(2, mock_request.call_count)
+        client.close()
+
+    def test_close_restarts_event_loop(self):
+        with patch.object(httpx.AsyncClient, 'request', return_value=self._response(200, b'{}')):
+            self.client.get('trigger')
+            self.client.close()
+            self.client.get('trigger')
+
+
+def make_stream_response(status_code, content):
+    response = requests.Response()
+    response.status_code = status_code
+    response.raw = io.BytesIO(content)
+    return response
+
+
+class ClientIterListTest(unittest.TestCase):
+
+    def test_items_are_streamed(self):
+        client = Client(TEST_API_URL)
+        body = b'{"list": [{"id": "1"}, {"id": "2"}]}'
+
+        with patch.object(requests.Session, 'request',
+                          return_value=make_stream_response(200, body)) as mock_request:
+            result = list(client.iter_list('trigger', chunk_size=5))
+
+        self.assertEqual([{'id': '1'}, {'id': '2'}], result)
+        self.assertTrue(mock_request.call_args[1]['stream'])
+        self.assertEqual(len(body), client.transfer_stats.received_wire_bytes)
+
+    def test_api_error(self):
+        client = Client(TEST_API_URL)
+
+        with patch.object(requests.Session, 'request', return_value=make_stream_response(500, b'error')):
+            with self.assertRaises(MoiraApiError) as ctx:
+                list(client.iter_list('trigger'))
+
+        self.assertEqual(b'error', ctx.exception.body)
+
+    def test_bad_response(self):
+        client = Client(TEST_API_URL)
+
+        with patch.object(requests.Session, 'request', return_value=make_stream_response(200, b'{}')):
+            with self.assertRaises(ResponseStructureError):
+                list(client.iter_list('trigger'))
+        with patch.object(requests.Session, 'request', return_value=make_stream_response(200, b'{"list": [')):
+            with self.assertRaises(InvalidJSONError):
+                list(client.iter_list('trigger'))
+
+    def test_retry_status(self):
+        client = Client(TEST_API_URL, retry=RetryPolicy(total=1))
+        responses = [make_stream_response(503, b''), make_stream_response(200, b'{"list": [1]}')]
+
+        with patch.object(requests.Session, 'request', side_effect=responses), patch('moira_client.client.time.sleep'):
+            self.assertEqual([1], list(client.iter_list('trigger')))
@@ -0,0 +1,47 @@
+from importlib.util import find_spec
+import unittest
+
+from moira_client import codec
+from moira_client.codec import StdlibJSONCodec
+from moira_client.codec import get_codec
+
+DOCUMENT = {'list': [{'id': '1', 'name': 'триггер', 'tags': ['a'], 'warn_value': 1.5, 'sched': None}]}
+
+
+class CodecTest(unittest.TestCase):
+
+    def _available_codecs(self):
+        for name in codec.CODECS:
+            try:
+                yield get_codec(name)
+            except ImportError:
+                pass
+
+    def test_round_trip(self):
+        for json_codec in self._available_codecs():
+            with self.subTest(codec=json_codec.name):
+                encoded = json_codec.dumps(DOCUMENT)
+                self.assertIsInstance(encoded, bytes)
+                self.assertEqual(DOCUMENT, json_codec.loads(encoded))
+
+    def test_invalid_json_raises_value_error(self):
+        for json_codec in self._available_codecs():
+            with self.subTest(codec=json_codec.name):
+                for content in (b'', b'not json'):
+                    with self.assertRaises(ValueError):
+                        json_codec.loads(content)
+
+    def test_auto_prefers_fast_codecs(self):
+        expected = 'orjson' if find_spec('orjson') else 'ujson' if find_spec('ujson') else 'json'
+
+        self.assertEqual(expected, get_codec('auto').name)
+        self.assertEqual(expected, get_codec(None).name)
+
+    def test_custom_codec(self):
+        custom = StdlibJSONCodec()
+
+        self.assertIs(custom, get_codec(custom))
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec('yaml')
@@ -0,0 +1,53 @@
+import gzip
+import unittest
+
+from moira_client.compression import GzipCompression
+from moira_client.compression import TransferStats
+
+
+class GzipCompressionTest(unittest.TestCase):
+
+    def test_small_body_is_not_compressed(self):
+        compression = GzipCompression(threshold=1024)
+        body = b'{"name": "trigger"}'
+
+        self.assertEqual((body, None), compression.compress(body))
+
+    def test_large_body_is_compressed(self):
+        compression = GzipCompression(level=9, threshold=1024)
+        body = b'{"targets": ["' + b'a' * 4096 + b'"]}'
+
+        compressed, encoding = compression.compress(body)
+
+        self.assertEqual('gzip', encoding)
+        self.assertLess(len(compressed), len(body))
+        self.assertEqual(body, gzip.decompress(compressed))
+
+    def test_invalid_level(self):
+        with self.assertRaises(ValueError):
+            GzipCompression(level=10)
+
+
+class TransferStatsTest(unittest.TestCase):
+
+    def test_record(self):
+        stats = TransferStats()
+
+        stats.record(1000, 100, 5000, 500)
+        stats.record(0, 0, 10, 10)
+
+        self.assertEqual(2, stats.requests)
+        self.assertEqual(1000, stats.sent_bytes)
+        self.assertEqual(100, stats.sent_wire_bytes)
+        self.assertEqual(5010, stats.received_bytes)
+        self.assertEqual(510, stats.received_wire_bytes)
+        self.assertEqual(900 + 4500, stats.saved_bytes)
+
+    def test_reset(self):
+        stats = TransferStats()
+        stats.record(1, 1, 1, 1)
+
+        stats.reset()
+
+        self.assertEqual(0, stats.requests)
+        self.assertEqual(0, stats.saved_bytes)
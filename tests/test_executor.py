@@ -0,0 +1,82 @@
+from concurrent.futures import CancelledError
+import threading
+import time
+import unittest
+
+from moira_client.executor import map_concurrently
+from moira_client.moira import Moira
+
+
+class MapConcurrentlyTest(unittest.TestCase):
+
+    def test_keeps_input_order(self):
+        def slow_square(x):
+            time.sleep(0.001 * (10 - x))
+            return x * x
+
+        results = map_concurrently(slow_square, range(10), concurrency=4)
+
+        self.assertEqual(list(range(10)), [r.item for r in results])
+        self.assertEqual([x * x for x in range(10)], [r.value for r in results])
+        self.assertTrue(all(r.error is None for r in results))
+
+    def test_collects_errors_per_item(self):
+        def fn(x):
+            if x % 2:
+                raise ValueError(x)
+            return x
+
+        results = map_concurrently(fn, range(4), concurrency=2)
+
+        self.assertEqual([0, None, 2, None], [r.value for r in results])
+        self.assertIsNone(results[0].error)
+        self.assertIsInstance(results[1].error, ValueError)
+        self.assertIsInstance(results[3].error, ValueError)
+
+    def test_bounded_concurrency(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max': 0}
+
+        def fn(x):
+            with lock:
+                state['running'] += 1
+                state['max'] = max(state['max'], state['running'])
+            time.sleep(0.005)
+            with lock:
+                state['running'] -= 1
+
+        map_concurrently(fn, range(20), concurrency=3)
+
+        self.assertLessEqual(state['max'], 3)
+
+    def test_cancel(self):
+        cancel = threading.Event()
+
+        def fn(x):
+            if x == 0:
+                cancel.set()
+            return x
+
+        results = map_concurrently(fn, range(10), concurrency=1, cancel=cancel)
+
+        self.assertIsNone(results[0].error)
+        self.assertTrue(all(isinstance(r.error, CancelledError) for r in results[1:]))
+
+    def test_fail_fast(self):
+        def fn(x):
+            raise ValueError(x)
+
+        results = map_concurrently(fn, range(5), concurrency=1, fail_fast=True)
+
+        self.assertIsInstance(results[0].error, ValueError)
+        self.assertTrue(all(isinstance(r.error, CancelledError) for r in results[1:]))
+
+    def test_empty_items(self):
+        self.assertEqual([], map_concurrently(str, [], concurrency=4))
+
+    def test_moira_map_defaults_to_pool_size(self):
+        moira = Moira('http://test/url', pool_maxsize=2)
+
+        results = moira.map(str, [1, 2, 3])
+
+        self.assertEqual(['1', '2', '3'], [r.value for r in results])
@@ -0,0 +1,56 @@
+import unittest
+
+from moira_client.hedging import HedgePolicy
+
+
+class HedgePolicyTest(unittest.TestCase):
+
+    def test_fixed_delay(self):
+        policy = HedgePolicy(delay=0.05)
+
+        policy.record_latency(10)
+        self.assertEqual(0.05, policy.delay())
+
+    def test_max_delay_until_enough_samples(self):
+        policy = HedgePolicy(min_samples=3, max_delay=0.5)
+
+        policy.record_latency(0.01)
+        self.assertEqual(0.5, policy.delay())
+
+    def test_percentile_delay(self):
+        policy = HedgePolicy(percentile=90, min_samples=10, min_delay=0, max_delay=10)
+
+        for latency in range(1, 101):
+            policy.record_latency(latency / 100.0)
+
+        self.assertEqual(0.91, policy.delay())
+
+    def test_percentile_delay_is_bounded(self):
+        policy = HedgePolicy(min_samples=1, min_delay=0.01, max_delay=0.2)
+
+        policy.record_latency(0.001)
+        self.assertEqual(0.01, policy.delay())
+        for _ in range(10):
+            policy.record_latency(5)
+        self.assertEqual(0.2, policy.delay())
+
+    def test_window(self):
+        policy = HedgePolicy(window=2, min_samples=1, min_delay=0, max_delay=10)
+
+        for latency in (5, 0.1, 0.1):
+            policy.record_latency(latency)
+
+        self.assertEqual(0.1, policy.delay())
+
+    def test_stats(self):
+        policy = HedgePolicy()
+
+        policy.record(hedged=False)
+        policy.record(hedged=True)
+        policy.record(hedged=True, hedge_won=True)
+        policy.record(hedged=False)
+
+        self.assertEqual(4, policy.requests)
+        self.assertEqual(2, policy.hedged)
+        self.assertEqual(1, policy.hedge_wins)
+        self.assertEqual(0.5, policy.hedge_rate)
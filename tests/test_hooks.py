@@ -0,0 +1,49 @@
+import unittest
+try:
+    from unittest.mock import Mock
+except ImportError:
+    from mock import Mock
+
+from moira_client.hooks import Hooks
+from moira_client.hooks import RequestEvent
+from moira_client.hooks import path_template
+
+
+class PathTemplateTest(unittest.TestCase):
+
+    def test_path_template(self):
+        cases = [
+            ('trigger', 'trigger'),
+            ('trigger?validate', 'trigger'),
+            ('trigger/abc-123/state', 'trigger/{id}/state'),
+            ('trigger/1/metrics/nodata', 'trigger/{id}/metrics/nodata'),
+            ('tag/stats', 'tag/stats'),
+            ('tag/my-tag', 'tag/{id}'),
+            ('teams/1/users/2', 'teams/{id}/users/{id}'),
+            ('user/settings', 'user/settings'),
+            ('', ''),
+        ]
+        for path, template in cases:
+            with self.subTest(path=path):
+                self.assertEqual(template, path_template(path))
+
+
+class HooksTest(unittest.TestCase):
+
+    def test_hooks_are_called(self):
+        before, after, failed = Mock(), Mock(), Mock()
+        hooks = Hooks(before_request=[before], after_response=[after], on_exception=[failed])
+
+        request, started = hooks.request_started('GET', 'trigger/1')
+        hooks.request_finished(request, started, 200, 0, 42)
+        error = ValueError()
+        hooks.request_failed(request, started, 10, error)
+
+        before.assert_called_once_with(RequestEvent('GET', 'trigger/1', 'trigger/{id}'))
+        response = after.call_args[0][0]
+        self.assertEqual(('GET', 'trigger/{id}', 200, 0, 42, None),
+                         (response.method, response.template, response.status,
+                          response.bytes_out, response.bytes_in, response.error))
+        self.assertTrue(response.duration >= 0)
+        self.assertIs(error, failed.call_args[0][0].error)
+        self.assertIsNone(failed.call_args[0][0].status)
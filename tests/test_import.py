@@ -0,0 +1,28 @@
+import subprocess
+import sys
+import unittest
+
+CHECK_MODULES = '''
+import sys
+import moira_client
+
+moira = moira_client.Moira('http://localhost/api/')
+moira.trigger, moira.team
+print(' '.join(sorted(name for name in ('requests', 'urllib3', 'httpx', 'asyncio') if name in sys.modules)))
+'''
+
+
+class LazyImportTest(unittest.TestCase):
+
+    def test_http_stack_is_not_imported_before_first_request(self):
+        loaded = subprocess.check_output([sys.executable, '-c', CHECK_MODULES]).decode().split()
+
+        self.assertEqual([], loaded)
+
+    def test_http_error_is_still_exported(self):
+        import requests
+        import moira_client
+
+        self.assertIs(requests.HTTPError, moira_client.HTTPError)
+        with self.assertRaises(AttributeError):
+            moira_client.missing
@@ -0,0 +1,54 @@
+import unittest
+
+from moira_client.hooks import ResponseEvent
+from moira_client.metrics import LatencyHistogram
+
+
+def make_event(duration, template='trigger/{id}', status=200, error=None):
+    return ResponseEvent('GET', 'trigger/1', template, status, 0, 0, duration, error)
+
+
+class LatencyHistogramTest(unittest.TestCase):
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+
+        for i in range(1, 101):
+            histogram.observe(make_event(i / 1000.0))
+
+        stats = histogram.stats()[('GET', 'trigger/{id}')]
+        self.assertEqual(100, stats.count)
+        self.assertAlmostEqual(0.0505, stats.mean)
+        self.assertEqual(0.1, stats.max)
+        # percentiles are bucket upper bounds, within ~19% of the real value
+        self.assertTrue(0.05 <= stats.p50 <= 0.05 * 1.19)
+        self.assertTrue(0.09 <= stats.p90 <= 0.09 * 1.19)
+        self.assertTrue(0.099 <= stats.p99 <= 0.1)
+
+    def test_endpoints_and_errors(self):
+        histogram = LatencyHistogram()
+
+        histogram.observe(make_event(0.01))
+        histogram.observe(make_event(0.01, status=503))
+        histogram.observe(make_event(0.01, status=None, error=ValueError()))
+        histogram.observe(make_event(0.01, template='trigger/{id}/state', status=404))
+
+        stats = histogram.stats()
+        self.assertEqual((3, 2), (stats[('GET', 'trigger/{id}')].count, stats[('GET', 'trigger/{id}')].errors))
+        self.assertEqual((1, 0), (stats[('GET', 'trigger/{id}/state')].count,
+                                  stats[('GET', 'trigger/{id}/state')].errors))
+
+    def test_slow_requests(self):
+        histogram = LatencyHistogram()
+
+        histogram.observe(make_event(600))
+
+        self.assertEqual(600, histogram.stats()[('GET', 'trigger/{id}')].p99)
+
+    def test_reset(self):
+        histogram = LatencyHistogram()
+
+        histogram.observe(make_event(0.01))
+        histogram.reset()
+
+        self.assertEqual({}, histogram.stats())
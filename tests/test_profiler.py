@@ -0,0 +1,89 @@
+import json
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+import requests
+from moira_client import Moira
+from moira_client.hooks import Hooks
+from moira_client.profiler import DIRECT_CALL
+
+TEST_API_URL = 'http://test/api/url'
+
+TRIGGER = {'id': '1', 'name': 'trigger', 'targets': ['target'], 'tags': ['tag']}
+
+
+def respond(method, url, **kwargs):
+    path = url[len(TEST_API_URL) + 1:]
+    if path == 'trigger':
+        body = {'list': [TRIGGER]}
+    elif path == 'trigger/1/state':
+        body = {'state': 'OK'}
+    else:
+        body = TRIGGER
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps(body).encode()
+    return response
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def test_calls_are_attributed_to_outermost_method(self):
+        moira = Moira(TEST_API_URL)
+        trigger = moira.trigger.create(name='trigger', targets=['target'], tags=['tag'])
+
+        with patch.object(requests.Session, 'request', side_effect=respond):
+            with moira.profile() as profiler:
+                trigger.save()
+                moira.trigger.fetch_all()
+                moira.client.get('config')
+
+        report = {operation.operation: operation for operation in profiler.report()}
+        self.assertEqual(4, report['Trigger.save'].requests)
+        self.assertEqual(
+            {'GET trigger': 1, 'GET trigger/{id}/state': 1, 'GET trigger/{id}': 1, 'PUT trigger/{id}': 1},
+            report['Trigger.save'].endpoints)
+        self.assertEqual(1, report['TriggerManager.fetch_all'].requests)
+        self.assertEqual(1, report[DIRECT_CALL].requests)
+        self.assertEqual('Trigger.save', profiler.report()[0].operation)
+        self.assertEqual(('Trigger.save', 'Trigger.check_exists', 'TriggerManager.fetch_all'),
+                         profiler.calls[0].chain)
+        self.assertIn('Trigger.save', profiler.format())
+
+    def test_calls_on_worker_threads_are_attributed_to_caller(self):
+        moira = Moira(TEST_API_URL)
+
+        with patch.object(requests.Session, 'request', side_effect=respond):
+            with moira.profile() as profiler:
+                moira.trigger.fetch_many(['1', '2', '3'], concurrency=3)
+
+        report = profiler.report()
+        self.assertEqual(['TriggerManager.fetch_many'], [operation.operation for operation in report])
+        self.assertEqual({'GET trigger/{id}': 3}, report[0].endpoints)
+
+    def test_hooks_are_restored(self):
+        moira = Moira(TEST_API_URL)
+
+        with moira.profile():
+            self.assertIsNotNone(moira.client.hooks)
+        self.assertIsNone(moira.client.hooks)
+
+        hooks = Hooks()
+        moira = Moira(TEST_API_URL, hooks=hooks)
+        with moira.profile():
+            self.assertEqual(1, len(hooks.after_response))
+        self.assertIs(hooks, moira.client.hooks)
+        self.assertEqual([], hooks.after_response)
+
+    def test_calls_outside_block_are_not_recorded(self):
+        moira = Moira(TEST_API_URL)
+
+        with patch.object(requests.Session, 'request', side_effect=respond):
+            with moira.profile() as profiler:
+                pass
+            moira.trigger.fetch_all()
+
+        self.assertEqual([], profiler.report())
@@ -0,0 +1,76 @@
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from moira_client.ratelimit import RateLimiter
+from moira_client.ratelimit import TokenBucket
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    @patch('moira_client.ratelimit.time.monotonic', return_value=100.0)
+    def test_burst_then_rate(self, monotonic_mock):
+        bucket = TokenBucket(rate=10, burst=2)
+
+        self.assertEqual([0, 0], [bucket.reserve(), bucket.reserve()])
+        self.assertAlmostEqual(0.1, bucket.reserve())
+        self.assertAlmostEqual(0.2, bucket.reserve())
+
+    @patch('moira_client.ratelimit.time.monotonic')
+    def test_refill(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+        bucket = TokenBucket(rate=10, burst=1)
+        bucket.reserve()
+
+        monotonic_mock.return_value = 100.1
+        self.assertAlmostEqual(0, bucket.reserve())
+
+        monotonic_mock.return_value = 200.0
+        self.assertEqual(0, bucket.reserve())
+        self.assertAlmostEqual(0.1, bucket.reserve())
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    @patch('moira_client.ratelimit.time.monotonic', return_value=100.0)
+    def test_endpoint_bucket(self, monotonic_mock):
+        limiter = RateLimiter(endpoints={'trigger/': (10, 1), 'event/': 1})
+
+        self.assertEqual(0, limiter.reserve('trigger/1'))
+        self.assertAlmostEqual(0.1, limiter.reserve('trigger?validate'))
+        self.assertEqual(0, limiter.reserve('event/1'))
+        self.assertEqual(0, limiter.reserve('contact'))
+        self.assertEqual(1, limiter.waits)
+
+    @patch('moira_client.ratelimit.time.monotonic', return_value=100.0)
+    def test_global_and_endpoint_buckets(self, monotonic_mock):
+        limiter = RateLimiter(rate=10, burst=1, endpoints={'trigger/': (1, 1)})
+
+        self.assertEqual(0, limiter.reserve('trigger/1'))
+        self.assertAlmostEqual(1, limiter.reserve('trigger/2'))
+        self.assertAlmostEqual(0.2, limiter.reserve('contact'))
+
+    @patch('moira_client.ratelimit.time.monotonic', return_value=100.0)
+    def test_longest_prefix_wins(self, monotonic_mock):
+        limiter = RateLimiter(endpoints={'trigger/': 100, 'trigger/search': (1, 1)})
+
+        limiter.reserve('trigger/search')
+        self.assertAlmostEqual(1, limiter.reserve('trigger/search'))
+        self.assertEqual(0, limiter.reserve('trigger/1'))
+
+    @patch('moira_client.ratelimit.time.sleep')
+    @patch('moira_client.ratelimit.time.monotonic', return_value=100.0)
+    def test_acquire_sleeps(self, monotonic_mock, sleep_mock):
+        limiter = RateLimiter(rate=2, burst=1)
+
+        limiter.acquire('trigger')
+        limiter.acquire('trigger')
+
+        sleep_mock.assert_called_once_with(0.5)
+        self.assertEqual(0.5, limiter.waited)
@@ -0,0 +1,104 @@
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+from moira_client.retry import CircuitBreaker
+from moira_client.retry import RetryPolicy
+from moira_client.retry import parse_retry_after
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def test_can_retry(self):
+        policy = RetryPolicy(total=2)
+
+        self.assertTrue(policy.can_retry('GET', 0))
+        self.assertTrue(policy.can_retry('delete', 1))
+        self.assertFalse(policy.can_retry('GET', 2))
+        self.assertFalse(policy.can_retry('POST', 0))
+        self.assertFalse(policy.can_retry('PATCH', 0))
+
+    def test_can_retry_updates_only(self):
+        policy = RetryPolicy(total=2)
+
+        self.assertTrue(policy.can_retry('put', 1, 'trigger/1?validate'))
+        self.assertTrue(policy.can_retry('PUT', 0, 'health/notifier'))
+        self.assertFalse(policy.can_retry('PUT', 0, 'trigger?validate'))
+        self.assertFalse(policy.can_retry('PUT', 0, 'subscription'))
+        self.assertFalse(policy.can_retry('PUT', 0, '/contact/'))
+        self.assertFalse(policy.can_retry('PUT', 0))
+        self.assertFalse(RetryPolicy(retry_updates=False).can_retry('PUT', 0, 'trigger/1'))
+
+    def test_exponential_delay(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+        self.assertEqual([1, 2, 4, 5], [policy.delay(retry) for retry in range(4)])
+
+    def test_jitter_stays_below_exponential_delay(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=100)
+
+        for retry in range(5):
+            self.assertTrue(0 <= policy.delay(retry) <= 2 ** retry)
+
+    def test_retry_after_is_capped(self):
+        policy = RetryPolicy(max_backoff=10)
+
+        self.assertEqual(3, policy.delay(0, '3'))
+        self.assertEqual(10, policy.delay(0, '120'))
+
+    def test_retry_after_ignored(self):
+        policy = RetryPolicy(backoff_factor=1, jitter=False, respect_retry_after=False)
+
+        self.assertEqual(1, policy.delay(0, '3'))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(5, parse_retry_after('5'))
+        self.assertEqual(0, parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'))
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30)
+
+        for _ in range(2):
+            breaker.record_failure()
+        self.assertTrue(breaker.allow_request())
+
+        breaker.record_failure()
+        self.assertEqual(CircuitBreaker.STATE_OPEN, breaker.state)
+        self.assertFalse(breaker.allow_request())
+
+    def test_success_resets_failures(self):
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.STATE_CLOSED, breaker.state)
+
+    def test_half_open_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+
+        with patch('moira_client.retry.time.monotonic', return_value=breaker._opened_at + 31):
+            self.assertTrue(breaker.allow_request())
+            # only a single probe is let through
+            self.assertFalse(breaker.allow_request())
+
+        breaker.record_success()
+        self.assertTrue(breaker.allow_request())
+
+    def test_failed_probe_reopens(self):
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30)
+        breaker.record_failure()
+
+        with patch('moira_client.retry.time.monotonic', return_value=breaker._opened_at + 31):
+            breaker.allow_request()
+            breaker.record_failure()
+
+        self.assertEqual(CircuitBreaker.STATE_OPEN, breaker.state)
@@ -0,0 +1,174 @@
+import asyncio
+import threading
+import unittest
+
+from moira_client.codec import copy_json
+from moira_client.singleflight import AsyncSingleFlight
+from moira_client.singleflight import SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def _run_concurrently(self, single_flight, fn, count):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(single_flight.do('key', fn)))
+            for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def test_concurrent_calls_are_coalesced(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return {'list': []}
+
+        leader = threading.Thread(target=single_flight.do, args=('key', fn))
+        leader.start()
+        started.wait(5)
+        threads, results = self._run_concurrently(single_flight, fn, 3)
+        while single_flight.coalesced < 3:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads + [leader]:
+            thread.join(5)
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual([{'list': []}] * 3, results)
+        self.assertEqual(1, single_flight.calls)
+        self.assertEqual(3, single_flight.coalesced)
+
+    def test_coalesced_callers_get_their_own_copy(self):
+        single_flight = SingleFlight(copy=copy_json)
+        started = threading.Event()
+        release = threading.Event()
+        value = {'tags': ['tag']}
+        leader_results = []
+
+        def fn():
+            started.set()
+            release.wait(5)
+            return value
+
+        leader = threading.Thread(target=lambda: leader_results.append(single_flight.do('key', fn)))
+        leader.start()
+        started.wait(5)
+        threads, results = self._run_concurrently(single_flight, fn, 2)
+        while single_flight.coalesced < 2:
+            threading.Event().wait(0.001)
+        release.set()
+        for thread in threads + [leader]:
+            thread.join(5)
+
+        results += leader_results
+        self.assertEqual([value] * 3, results)
+        self.assertEqual(3, len(set(id(result) for result in results)))
+        self.assertEqual(3, len(set(id(result['tags']) for result in results)))
+        self.assertIs(value, single_flight.do('key', lambda: value))
+
+    def test_sequential_calls_are_not_coalesced(self):
+        single_flight = SingleFlight()
+
+        self.assertEqual(1, single_flight.do('key', lambda: 1))
+        self.assertEqual(2, single_flight.do('key', lambda: 2))
+        self.assertEqual(2, single_flight.calls)
+        self.assertEqual(0, single_flight.coalesced)
+
+    def test_error_is_shared(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def fn():
+            started.set()
+            release.wait(5)
+            raise ValueError('error')
+
+        def call():
+            try:
+                single_flight.do('key', fn)
+            except ValueError as e:
+                errors.append(e)
+
+        leader = threading.Thread(target=call)
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=call)
+        follower.start()
+        while single_flight.coalesced < 1:
+            threading.Event().wait(0.001)
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(2, len(errors))
+        self.assertEqual(1, single_flight.calls)
+
+
+class AsyncSingleFlightTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_calls_are_coalesced(self):
+        single_flight = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {'list': []}
+
+        results = await asyncio.gather(*[single_flight.do('key', fn) for _ in range(5)])
+
+        self.assertEqual([{'list': []}] * 5, results)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(4, single_flight.coalesced)
+
+    async def test_coalesced_callers_get_their_own_copy(self):
+        single_flight = AsyncSingleFlight(copy=copy_json)
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            return {'tags': ['tag']}
+
+        results = await asyncio.gather(*[single_flight.do('key', fn) for _ in range(3)])
+        results[0]['tags'].append('changed')
+
+        self.assertEqual([{'tags': ['tag']}] * 2, results[1:])
+        self.assertEqual(3, len(set(id(result['tags']) for result in results)))
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        single_flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            return 1
+
+        first = asyncio.ensure_future(single_flight.do('key', fn))
+        second = asyncio.ensure_future(single_flight.do('key', fn))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(1, await second)
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+
+    async def test_error_is_shared(self):
+        single_flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError('error')
+
+        results = await asyncio.gather(*[single_flight.do('key', fn) for _ in range(2)], return_exceptions=True)
+
+        self.assertIsInstance(results[0], ValueError)
+        self.assertIsInstance(results[1], ValueError)
+        self.assertEqual(0, len(single_flight._calls))
@@ -0,0 +1,72 @@
+import json
+import unittest
+
+from moira_client.streaming import ListItemParser
+
+
+def parse(body, chunk_size, key='list'):
+    parser = ListItemParser(key)
+    items = []
+    for i in range(0, len(body), chunk_size):
+        items.extend(parser.feed(body[i:i + chunk_size]))
+    items.extend(parser.close())
+    return items
+
+
+class ListItemParserTest(unittest.TestCase):
+
+    def test_items_for_any_chunk_size(self):
+        document = {
+            'page': 10,
+            'meta': {'nested': [1, {'list': '}]'}]},
+            'list': [{'id': str(i), 'name': 'триггер ' * i, 'value': 1.5 * i} for i in range(30)],
+            'total': 123456,
+        }
+        body = json.dumps(document, ensure_ascii=False).encode('utf-8')
+
+        for chunk_size in (1, 2, 3, 17, 4096, len(body)):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(document['list'], parse(body, chunk_size))
+
+    def test_scalar_items(self):
+        self.assertEqual([12345, 'a', None, True], parse(b' { "list" : [ 12345 , "a", null, true ] } ', 1))
+
+    def test_split_at_every_offset(self):
+        bodies = (
+            b'{"list": [1.5, -2e5, 3E-2, 10, 0.25e+1, "a", true, null], "total": 1.25e3}',
+            b'{"page": -0.5, "list": [{"id": "1", "value": 1.5}, 12345, [1e5, 2.0]], "size": 100}',
+        )
+        for body in bodies:
+            expected = json.loads(body)['list']
+            for offset in range(len(body) + 1):
+                with self.subTest(body=body, offset=offset):
+                    parser = ListItemParser()
+                    items = parser.feed(body[:offset]) + parser.feed(body[offset:]) + parser.close()
+                    self.assertEqual(expected, items)
+
+    def test_empty_and_null_list(self):
+        self.assertEqual([], parse(b'{"list": []}', 1))
+        self.assertEqual([], parse(b'{"list": null}', 1))
+
+    def test_missing_key(self):
+        with self.assertRaises(KeyError):
+            parse(b'{"other": [1]}', 1)
+
+    def test_other_key(self):
+        self.assertEqual([1], parse(b'{"list": [0], "teams": [1]}', 4, key='teams'))
+
+    def test_truncated_body(self):
+        for body in (b'{"list": [{"id": 1}', b'{"list": [1', b'{"list": [1]'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                parse(body, 1)
+
+    def test_invalid_body(self):
+        for body in (b'[1, 2]', b'{"list": [1 2]}', b'{"list": {}}', b'{"list": []} {}', b'{list: []}'):
+            with self.subTest(body=body), self.assertRaises(ValueError):
+                parse(body, 3)
+
+    def test_items_are_yielded_before_the_end(self):
+        parser = ListItemParser()
+
+        self.assertEqual([], parser.feed(b'{"list": [{"id": "1"'))
+        self.assertEqual([{'id': '1'}], parser.feed(b'}, {"id": "2"'))
@@ -0,0 +1,200 @@
+import time
+import unittest
+
+from moira_client.cache import RevalidationCache
+from moira_client.client import Client
+from moira_client.client import MoiraApiError
+from moira_client.compression import GzipCompression
+from moira_client.moira import Moira
+from moira_client.retry import RetryPolicy
+from moira_client.testing import FakeMoiraServer
+from moira_client.testing import MoiraData
+from moira_client.testing.data import NotFound
+
+
+class MoiraDataTest(unittest.TestCase):
+
+    def test_generate_is_deterministic(self):
+        first = MoiraData.generate(triggers=20, subscriptions=5, seed=7)
+        second = MoiraData.generate(triggers=20, subscriptions=5, seed=7)
+
+        self.assertEqual(20, len(first.triggers))
+        self.assertEqual(5, len(first.subscriptions))
+        self.assertEqual(1, len(first.contacts))
+        self.assertEqual(first.triggers, second.triggers)
+        self.assertNotEqual(list(first.triggers), list(MoiraData.generate(triggers=20, seed=8).triggers))
+
+    def test_update_missing_trigger(self):
+        data = MoiraData()
+
+        with self.assertRaises(NotFound):
+            data.update_trigger('missing', {'name': 'name'})
+
+    def test_tag_used_by_triggers_is_not_deleted(self):
+        data = MoiraData()
+        data.add_trigger({'name': 'name', 'tags': ['used'], 'targets': ['metric']})
+        data.add_subscription({'tags': ['used', 'unused'], 'contacts': []})
+
+        self.assertFalse(data.delete_tag('used'))
+        self.assertTrue(data.delete_tag('unused'))
+        self.assertEqual(['used'], data.tags())
+
+
+class FakeMoiraServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = MoiraData.generate(triggers=30, subscriptions=5, notifications=3)
+        self.server = FakeMoiraServer(self.data).start()
+        self.moira = Moira(self.server.url)
+
+    def tearDown(self):
+        self.moira.close()
+        self.server.stop()
+
+    def test_triggers(self):
+        triggers = self.moira.trigger.fetch_all()
+        self.assertEqual(30, len(triggers))
+        self.assertTrue(self.moira.trigger.is_exist(triggers[0]))
+
+        trigger = self.moira.trigger.create('new trigger', ['new'], ['new.metric'])
+        trigger.save()
+        self.assertIn(trigger.id, self.data.triggers)
+        trigger.warn_value = 5
+        trigger.update()
+        self.assertEqual(5, self.data.triggers[trigger.id]['warn_value'])
+        self.server.reset_counters()
+        trigger.warn_value = 6
+        trigger.update(upsert=True)
+        self.assertEqual(6, self.data.triggers[trigger.id]['warn_value'])
+        self.assertEqual(1, self.server.total_requests)
+        self.assertEqual(trigger.id, self.moira.trigger.fetch_by_id(trigger.id).id)
+
+        self.assertTrue(self.moira.trigger.delete(trigger.id))
+        self.assertIsNone(self.moira.trigger.fetch_by_id(trigger.id))
+
+    def test_fetch_many(self):
+        trigger_ids = list(self.data.triggers)[:10]
+
+        triggers = self.moira.trigger.fetch_many(trigger_ids + ['missing'], concurrency=4)
+
+        self.assertEqual(trigger_ids, [trigger.id for trigger in triggers.values() if trigger])
+        self.assertIsNone(triggers['missing'])
+        self.assertEqual(11, self.server.requests[('GET', 'trigger/{id}')])
+        self.assertEqual(11, self.server.total_requests)
+
+    def test_bulk_save_and_delete(self):
+        existing = list(self.data.triggers.values())
+        unchanged = self.moira.trigger.create(**existing[0])
+        updated = self.moira.trigger.create(**dict(existing[1], id=None, desc='changed'))
+        created = [self.moira.trigger.create('bulk {}'.format(i), ['bulk'], ['bulk.metric']) for i in range(5)]
+
+        report = self.moira.trigger.bulk_save([unchanged, updated] + created + created, concurrency=4)
+
+        self.assertEqual([unchanged], report.unchanged)
+        self.assertEqual([updated], report.updated)
+        self.assertEqual(created, report.created)
+        self.assertEqual([], report.failed)
+        self.assertEqual(created, report.skipped)
+        self.assertEqual('changed', self.data.triggers[existing[1]['id']]['desc'])
+        self.assertEqual(35, len(self.data.triggers))
+        self.assertEqual(1 + 1 + 5, self.server.total_requests)
+
+        report = self.moira.trigger.bulk_delete([trigger.id for trigger in created], concurrency=4)
+
+        self.assertEqual(5, len(report.deleted))
+        self.assertEqual(30, len(self.data.triggers))
+
+    def test_bulk_save_trigger_edited_after_indexed_save(self):
+        self.moira.trigger.build_index()
+        trigger = self.moira.trigger.create('indexed', ['indexed'], ['indexed.metric'], warn_value=1)
+        trigger.save()
+        trigger.warn_value = 5
+
+        report = self.moira.trigger.bulk_save([trigger])
+
+        self.assertEqual([trigger], report.updated)
+        self.assertEqual(5, self.data.triggers[trigger.id]['warn_value'])
+
+    def test_counters(self):
+        self.moira.trigger.fetch_all()
+        trigger_id = next(iter(self.data.triggers))
+        self.moira.trigger.get_state(trigger_id)
+        self.moira.trigger.get_state(trigger_id)
+
+        self.assertEqual(1, self.server.requests[('GET', 'trigger')])
+        self.assertEqual(2, self.server.requests[('GET', 'trigger/{id}/state')])
+        self.assertEqual(3, self.server.total_requests)
+        self.assertEqual(1, self.server.peak_in_flight)
+
+        self.server.reset_counters()
+        self.assertEqual(0, self.server.total_requests)
+
+    def test_other_resources(self):
+        self.assertEqual(5, len(self.moira.subscription.fetch_all()))
+        self.assertEqual(1, len(self.moira.contact.fetch_all()))
+        self.assertEqual(3, len(self.moira.notification.fetch_all()))
+        self.assertEqual(self.data.tags(), self.moira.tag.fetch_all())
+        self.assertEqual(30, len(self.moira.pattern.fetch_all()))
+        self.assertEqual('OK', self.moira.health.get_notifier_state())
+        self.assertEqual('moira', self.moira.user.get_username())
+
+    def test_unknown_path(self):
+        with Client(self.server.url) as client:
+            with self.assertRaises(MoiraApiError) as e:
+                client.get('unknown')
+
+        self.assertIn(b'unknown path', e.exception.body)
+        self.assertEqual(404, e.exception.status_code)
+        self.assertEqual(1, self.server.errors[('GET', 'unknown')])
+
+    def test_fail_next(self):
+        self.server.fail_next(2, status=502, pattern='trigger')
+
+        with Client(self.server.url) as client:
+            with self.assertRaises(MoiraApiError) as e:
+                client.get('trigger')
+            self.assertIn(b'injected', e.exception.body)
+            client.get('trigger/{}/state'.format(next(iter(self.data.triggers))))
+            with self.assertRaises(MoiraApiError):
+                client.get('trigger')
+            self.assertEqual(30, len(client.get('trigger')['list']))
+
+        self.assertEqual(2, self.server.errors[('GET', 'trigger')])
+
+    def test_injected_errors_are_retried(self):
+        self.server.fail_next(2)
+
+        with Client(self.server.url, retry=RetryPolicy(total=2, backoff_factor=0)) as client:
+            self.assertEqual(30, len(client.get('trigger')['list']))
+
+        self.assertEqual(3, self.server.requests[('GET', 'trigger')])
+
+    def test_error_rate(self):
+        self.server.error_rate = 1.0
+
+        with Client(self.server.url) as client:
+            with self.assertRaises(MoiraApiError):
+                client.get('trigger')
+
+        self.assertEqual(1, self.server.errors[('GET', 'trigger')])
+
+    def test_latency(self):
+        self.server.latency = 0.05
+
+        start = time.monotonic()
+        self.moira.trigger.fetch_all()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_etag_revalidation(self):
+        with Client(self.server.url, revalidation_cache=RevalidationCache()) as client:
+            first = client.get('trigger')
+            self.assertEqual(first, client.get('trigger'))
+            self.data.add_trigger({'name': 'new trigger', 'targets': ['metric']})
+            self.assertEqual(31, len(client.get('trigger')['list']))
+
+    def test_compressed_request_body(self):
+        with Client(self.server.url, compression=GzipCompression(threshold=0)) as client:
+            response = client.put('trigger', json={'name': 'compressed', 'targets': ['metric']})
+
+        self.assertEqual('compressed', self.data.triggers[response['id']]['name'])
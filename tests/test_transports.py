@@ -0,0 +1,207 @@
+import io
+import unittest
+try:
+    from unittest.mock import patch
+except ImportError:
+    from mock import patch
+
+import requests
+import urllib3
+from urllib3.exceptions import NewConnectionError
+from urllib3.exceptions import ProtocolError
+from urllib3.exceptions import ReadTimeoutError
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from moira_client.client import Client
+from moira_client.client import MoiraApiError
+from moira_client.retry import RetryPolicy
+from moira_client.transports import Transport
+from moira_client.transports import TransportConnectionError
+from moira_client.transports import TransportError
+from moira_client.transports import TransportTimeout
+from moira_client.transports import get_transport
+from moira_client.transports.requests import RequestsTransport
+from moira_client.transports.urllib3 import Urllib3Transport
+
+TEST_API_URL = 'http://test/api/url'
+
+
+def make_urllib3_response(status, body=b'{}', preload_content=True):
+    return urllib3.HTTPResponse(body=io.BytesIO(body), status=status, preload_content=preload_content)
+
+
+class GetTransportTest(unittest.TestCase):
+
+    def test_names(self):
+        self.assertIsInstance(get_transport('requests', 1, 2), RequestsTransport)
+        transport = get_transport('urllib3', 1, 2, idle_timeout=3)
+        self.assertIsInstance(transport, Urllib3Transport)
+        self.assertEqual((1, 2, 3), (transport.pool_connections, transport.pool_maxsize, transport.idle_timeout))
+
+    def test_object_is_used_as_is(self):
+        transport = Urllib3Transport(1, 1)
+        self.assertIs(transport, get_transport(transport, 10, 10))
+        self.assertIs(transport, Client(TEST_API_URL, transport=transport).transport)
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            get_transport('curl', 1, 1)
+
+    def test_http2_requires_httpx(self):
+        with self.assertRaises(ValueError):
+            get_transport('urllib3', 1, 1, http2=True)
+
+    def test_transport_is_abstract(self):
+        with self.assertRaises(NotImplementedError):
+            Transport(1, 1).request('GET', TEST_API_URL)
+
+
+class RequestsTransportTest(unittest.TestCase):
+
+    def test_errors_are_still_requests_exceptions(self):
+        cases = [
+            (requests.exceptions.ConnectionError('refused'), TransportConnectionError),
+            (requests.exceptions.ReadTimeout('timeout'), TransportTimeout),
+            (requests.exceptions.InvalidURL('url'), TransportError),
+        ]
+        client = Client(TEST_API_URL)
+        for error, expected in cases:
+            with self.subTest(error=error), patch.object(requests.Session, 'request', side_effect=error):
+                with self.assertRaises(expected) as ctx:
+                    client.get('trigger')
+                self.assertIsInstance(ctx.exception, type(error))
+
+
+class Urllib3TransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(TEST_API_URL, login='login', auth_user='user', auth_pass='pass', transport='urllib3')
+
+    def test_get(self):
+        with patch.object(urllib3.PoolManager, 'urlopen',
+                          return_value=make_urllib3_response(200, b'{"list": []}')) as mock_urlopen:
+            result = self.client.get('trigger', params={'p': 0, 'skip': None})
+
+        self.assertEqual({'list': []}, result)
+        args, kwargs = mock_urlopen.call_args
+        self.assertEqual(('GET', TEST_API_URL + '/trigger?p=0'), args)
+        self.assertEqual('login', kwargs['headers']['X-Webauth-User'])
+        self.assertEqual('gzip, deflate', kwargs['headers']['Accept-Encoding'])
+        self.assertEqual('Basic dXNlcjpwYXNz', kwargs['headers']['authorization'])
+        self.assertIsNone(kwargs['body'])
+        self.assertFalse(kwargs['retries'])
+        self.assertEqual(12, self.client.transfer_stats.received_wire_bytes)
+
+    def test_put_sends_body(self):
+        with patch.object(urllib3.PoolManager, 'urlopen', return_value=make_urllib3_response(200)) as mock_urlopen:
+            self.client.put('trigger/1', json={'name': 'trigger'}, timeout=5)
+
+        self.assertEqual(b'{"name":"trigger"}', mock_urlopen.call_args[1]['body'])
+        self.assertEqual(5, mock_urlopen.call_args[1]['timeout'])
+
+    def test_api_error(self):
+        with patch.object(urllib3.PoolManager, 'urlopen', return_value=make_urllib3_response(500, b'error')):
+            with self.assertRaises(MoiraApiError) as ctx:
+                self.client.get('trigger')
+
+        self.assertEqual(b'error', ctx.exception.body)
+
+    def test_errors_are_translated(self):
+        cases = [
+            (NewConnectionError(None, 'refused'), TransportConnectionError),
+            (ProtocolError('Connection aborted.'), TransportConnectionError),
+            (ReadTimeoutError(None, TEST_API_URL, 'timeout'), TransportTimeout),
+            (urllib3.exceptions.LocationParseError('url'), TransportError),
+        ]
+        for error, expected in cases:
+            with self.subTest(error=error), patch.object(urllib3.PoolManager, 'urlopen', side_effect=error):
+                with self.assertRaises(expected):
+                    self.client.get('trigger')
+
+    def test_retry(self):
+        client = Client(TEST_API_URL, transport='urllib3', retry=RetryPolicy(total=1))
+        responses = [ProtocolError('Connection aborted.'), make_urllib3_response(200)]
+
+        with patch.object(urllib3.PoolManager, 'urlopen', side_effect=responses) as mock_urlopen, \
+                patch('moira_client.client.time.sleep'):
+            client.get('trigger')
+
+        self.assertEqual(2, mock_urlopen.call_count)
+
+    def test_iter_list(self):
+        body = b'{"list": [{"id": "1"}, {"id": "2"}]}'
+
+        with patch.object(urllib3.PoolManager, 'urlopen',
+                          return_value=make_urllib3_response(200, body, preload_content=False)) as mock_urlopen:
+            result = list(self.client.iter_list('trigger', chunk_size=5))
+
+        self.assertEqual([{'id': '1'}, {'id': '2'}], result)
+        self.assertFalse(mock_urlopen.call_args[1]['preload_content'])
+        self.assertEqual(len(body), self.client.transfer_stats.received_wire_bytes)
+
+    def test_unread_stream_drops_connection(self):
+        response = make_urllib3_response(200, b'{"list": [1, 2]}', preload_content=False)
+
+        with patch.object(urllib3.PoolManager, 'urlopen', return_value=response), \
+                patch.object(response, 'close') as mock_close:
+            items = self.client.iter_list('trigger')
+            self.assertEqual(1, next(items))
+            items.close()
+
+        self.assertTrue(mock_close.called)
+
+    def test_idle_timeout_clears_pools(self):
+        client = Client(TEST_API_URL, transport='urllib3', idle_timeout=1)
+        client.transport._last_used -= 10
+
+        with patch.object(urllib3.PoolManager, 'urlopen', return_value=make_urllib3_response(200)), \
+                patch.object(urllib3.PoolManager, 'clear') as mock_clear:
+            client.get('trigger')
+
+        self.assertTrue(mock_clear.called)
+
+
+@unittest.skipIf(httpx is None, 'httpx is not installed')
+class HttpxTransportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client(TEST_API_URL, login='login', transport='httpx')
+
+    def tearDown(self):
+        self.client.close()
+
+    def _response(self, status_code, content, stream=False):
+        request = httpx.Request('GET', TEST_API_URL)
+        if stream:
+            return httpx.Response(status_code, stream=httpx.ByteStream(content), request=request)
+        return httpx.Response(status_code, content=content, request=request)
+
+    def test_put_sends_content(self):
+        with patch.object(httpx.Client, 'request', return_value=self._response(200, b'{}')) as mock_request:
+            self.client.put('trigger/1', json={'name': 'trigger'})
+
+        self.assertEqual(b'{"name":"trigger"}', mock_request.call_args[1]['content'])
+        self.assertNotIn('data', mock_request.call_args[1])
+
+    def test_errors_are_translated(self):
+        with patch.object(httpx.Client, 'request', side_effect=httpx.ConnectError('refused')):
+            with self.assertRaises(TransportConnectionError):
+                self.client.get('trigger')
+
+    def test_iter_list(self):
+        response = self._response(200, b'{"list": [1, 2]}', stream=True)
+
+        with patch.object(httpx.Client, 'send', return_value=response) as mock_send:
+            self.assertEqual([1, 2], list(self.client.iter_list('trigger', chunk_size=4)))
+
+        self.assertTrue(mock_send.call_args[1]['stream'])
+        self.assertTrue(response.is_closed)
+
+    def test_close_keeps_transport_usable(self):
+        self.client.close()
+
+        with patch.object(httpx.Client, 'request', return_value=self._response(200, b'{}')):
+            self.assertEqual({}, self.client.get('trigger'))